@@ -0,0 +1,283 @@
+"""
+Implementation of the minimum-state rational function approximation (Karpel).
+
+The generalised aerodynamic forces sampled at reduced frequencies k are
+approximated as
+
+    Q(ik) = A0 + A1 ik + A2 (ik)^2 + D (ik I - R)^-1 E ik,  R = -diag(poles)
+
+with a number of lag states (len(poles)) chosen by the user and
+independent of the number of modes, instead of num_poles x num_modes in
+Roger's approximation. The structural (Qhh) and gust (Qhj) GAFs share
+D and the poles, so E has the columns of both. For given poles and D
+the problem is linear in A1, A2 and E (A0 = Q(0) is exact), which are
+found by least squares; the poles (as logarithms) and D are then
+optimised with jaxopt on the resulting error (variable projection).
+
+References
+----------
+.. [1] M. Karpel. Design for active flutter suppression and gust alleviation
+       using state-space aeroelastic modeling. Journal of Aircraft, 19(3), 1982.
+.. [2] S. H. Tiffany, W. M. Adams. Nonlinear programming extensions to rational
+       function approximation methods for unsteady aerodynamic forces.
+       NASA TP-2776, 1988.
+
+"""
+
+import pathlib
+
+import jax
+import jax.numpy as jnp
+import jaxopt
+
+jax.config.update("jax_enable_x64", True)
+
+
+class OptimiseKarpel:
+    """Minimum-state approximation of the structural and gust GAFs
+
+    Parameters
+    ----------
+    redfreqs_ : jax.Array
+        Reduced frequencies, the first one 0
+    sampling_aeromatrices_ : jax.Array
+        Structural GAFs at redfreqs_ (NkxNmxNm)
+    num_lags_ : int
+        Number of aerodynamic lag states
+    sampling_gustmatrices_ : jax.Array
+        Gust GAFs at redfreqs_ (NkxNmxNb), optional
+    poles_ : jax.Array
+        Initial poles, spaced geometrically over redfreqs_ if None
+
+    """
+
+    def __init__(self, redfreqs_, sampling_aeromatrices_, num_lags_,
+                 sampling_gustmatrices_=None, poles_=None):
+
+        self.matrices = None
+        self.lags_D = None
+        self.lags_E = None
+        self.error = None
+        self.redfreqs = jnp.asarray(redfreqs_)
+        self.sampling_aeromatrices = jnp.asarray(sampling_aeromatrices_)
+        self.sampling_gustmatrices = sampling_gustmatrices_
+        self.num_lags = num_lags_
+        self.poles = poles_
+        self.maxiter = 500
+        self.tol = 1e-9
+        self.ridge = 1e-12
+
+    @property
+    def Qk(self):
+        """Structural and gust GAFs side by side (NkxNmx(Nm+Nb))"""
+
+        if self.sampling_gustmatrices is None:
+            return self.sampling_aeromatrices
+        return jnp.concatenate(
+            [self.sampling_aeromatrices, jnp.asarray(self.sampling_gustmatrices)], axis=2
+        )
+
+    def set_optsettings(self, maxiter=500, tol=1e-9, ridge=1e-12):
+        self.maxiter = maxiter
+        self.tol = tol
+        self.ridge = ridge
+
+    def run(self, show_info=False):
+
+        self.matrices, self.lags_D, self.lags_E, self.poles, self.error = optimise(
+            self.Qk, self.redfreqs, self.num_lags, self.poles,
+            self.maxiter, self.tol, self.ridge)
+        if show_info:
+            print(f"Err: {self.error}")
+            print(f"Poles: {self.poles}")
+
+    def eval_array(self, k):
+
+        return Q_MS(k, self.matrices, self.lags_D, self.lags_E, self.poles)
+
+    def save(self, path):
+        """Saves the matrices with the names of the Daero inputs
+
+        A (3xNmxNm), D (3xNmxNb), poles, lags_D (NmxNl), lags_E (NlxNm)
+        and lags_Egust (NlxNb).
+        """
+
+        path = pathlib.Path(path)
+        num_modes = self.sampling_aeromatrices.shape[2]
+        jnp.save(path / "A.npy", self.matrices[:, :, :num_modes])
+        jnp.save(path / "poles.npy", self.poles)
+        jnp.save(path / "lags_D.npy", self.lags_D)
+        jnp.save(path / "lags_E.npy", self.lags_E[:, :num_modes])
+        if self.sampling_gustmatrices is not None:
+            jnp.save(path / "D.npy", self.matrices[:, :, num_modes:])
+            jnp.save(path / "lags_Egust.npy", self.lags_E[:, num_modes:])
+
+
+@jax.jit
+def lag_filters(k_array, poles):
+    """ik / (ik + p) of each lag state (NkxNl)"""
+
+    ik = 1j * k_array[:, None]
+    return ik / (ik + poles[None, :])
+
+
+def stackQk_realimag(Qk):
+    """
+    Stacks the real and imaginary parts of each frequency as rows
+    [Re(k0), Im(k0), Re(k1), ...] with Nm rows each
+    """
+
+    return jnp.stack([Qk.real, Qk.imag], axis=1).reshape((-1, Qk.shape[2]))
+
+
+@jax.jit
+def fit_linear(poles, lags_D, Qk, redfreqs, ridge=1e-12):
+    """
+    A0 = Q(0), A1, A2 and E for the given poles and D by least squares
+
+    The normal equations are assembled from their blocks, the ones of
+    A1 and A2 being multiples of the identity, so the cost grows with
+    Nk x Nm x Nl x Nc rather than with the dense (2 Nk Nm) x (2Nm + Nl)
+    least-squares matrix.
+
+    Returns
+    -------
+    matrices : jax.Array
+        A0, A1, A2 (3xNmxNc)
+    lags_E : jax.Array
+        (NlxNc)
+    residual : jax.Array
+        Least-squares residual, rows stacked as in stackQk_realimag
+
+    """
+
+    num_modes = Qk.shape[1]
+    A0 = Qk[0].real
+    k = redfreqs[1:]
+    S = lag_filters(k, poles)
+    Qr = Qk[1:].real - A0
+    Qi = Qk[1:].imag
+    eye = jnp.eye(num_modes)
+    zeros = jnp.zeros_like(eye)
+    # unknowns stacked as [A1; A2; E]
+    K13 = lags_D * (k @ S.imag)
+    K23 = -lags_D * (k**2 @ S.real)
+    K33 = (lags_D.T @ lags_D) * (S.real.T @ S.real + S.imag.T @ S.imag)
+    MtM = jnp.block(
+        [
+            [jnp.sum(k**2) * eye, zeros, K13],
+            [zeros, jnp.sum(k**4) * eye, K23],
+            [K13.T, K23.T, K33],
+        ]
+    )
+    MtB = jnp.vstack(
+        [
+            jnp.tensordot(k, Qi, axes=1),
+            jnp.tensordot(-(k**2), Qr, axes=1),
+            jnp.einsum("ml,kl,kmc->lc", lags_D, S.real, Qr)
+            + jnp.einsum("ml,kl,kmc->lc", lags_D, S.imag, Qi),
+        ]
+    )
+    X = jnp.linalg.solve(
+        MtM + ridge * jnp.trace(MtM) / len(MtM) * jnp.eye(len(MtM)), MtB
+    )
+    A1 = X[:num_modes]
+    A2 = X[num_modes : 2 * num_modes]
+    lags_E = X[2 * num_modes :]
+    residual_real = (
+        -(k**2)[:, None, None] * A2
+        + jnp.einsum("ml,kl,lc->kmc", lags_D, S.real, lags_E)
+        - Qr
+    )
+    residual_imag = (
+        k[:, None, None] * A1
+        + jnp.einsum("ml,kl,lc->kmc", lags_D, S.imag, lags_E)
+        - Qi
+    )
+    residual = jnp.stack([residual_real, residual_imag], axis=1)
+    return jnp.stack([A0, A1, A2]), lags_E, residual.reshape((-1, Qk.shape[2]))
+
+
+@jax.jit
+def Q_MSki(ki, matrices, lags_D, lags_E, poles):
+    """
+    Evaluates the approximation for k=ki
+    """
+
+    S = lag_filters(jnp.array([ki]), poles)[0]
+    return (
+        matrices[0]
+        + matrices[1] * 1j * ki
+        - matrices[2] * ki**2
+        + (lags_D * S) @ lags_E
+    )
+
+
+Q_MS = jax.jit(jax.vmap(Q_MSki, in_axes=(0, None, None, None, None)))
+
+
+def err_ki(ki, aero_matrix, matrices, lags_D, lags_E, poles, order=None):
+    """
+    Error at a single point between the input aerodynamic matrix and the
+    approximation
+    """
+
+    Qki = Q_MSki(ki, matrices, lags_D, lags_E, poles)
+    err = jnp.linalg.norm(aero_matrix - Qki, order) / jnp.linalg.norm(aero_matrix, order)
+    return err
+
+
+err_k = jax.vmap(err_ki, in_axes=(0, 0, None, None, None, None, None))
+
+
+def initial_lags(Qk, redfreqs, num_lags, poles=None, ridge=1e-12):
+    """
+    Poles spaced geometrically over the reduced frequencies and D from
+    the principal directions of what A1 and A2 cannot fit
+    """
+
+    if poles is None:
+        kmin = redfreqs[1] if redfreqs[1] > 0 else redfreqs[2]
+        poles = jnp.geomspace(kmin, redfreqs[-1], num_lags)
+    num_modes = Qk.shape[1]
+    *_, residual = fit_linear(
+        poles[:0], jnp.zeros((num_modes, 0)), Qk, redfreqs, ridge)
+    # rows of each frequency and real/imaginary part as extra columns
+    residual = residual.reshape((-1, num_modes, Qk.shape[2]))
+    residual = jnp.concatenate(list(residual), axis=1)
+    U, _, _ = jnp.linalg.svd(residual, full_matrices=False)
+    return jnp.asarray(poles), U[:, :num_lags]
+
+
+def optimise(Qk, redfreqs, num_lags, poles=None, maxiter=500, tol=1e-9,
+             ridge=1e-12):
+    """
+    Poles and D minimising the least-squares error, with the columns
+    (structural and gust) weighted by their norm
+
+    Returns
+    -------
+    tuple
+        matrices (3xNmxNc), lags_D (NmxNl), lags_E (NlxNc), poles and
+        the average relative error over the frequencies
+
+    """
+
+    Qk = jnp.asarray(Qk)
+    redfreqs = jnp.asarray(redfreqs)
+    poles, lags_D = initial_lags(Qk, redfreqs, num_lags, poles, ridge)
+    B = stackQk_realimag(Qk[1:] - Qk[0].real)
+    weights = 1.0 / jnp.maximum(jnp.linalg.norm(B, axis=0), jnp.finfo(B.dtype).tiny)
+
+    def loss(params):
+        *_, residual = fit_linear(
+            jnp.exp(params["log_poles"]), params["lags_D"], Qk, redfreqs, ridge)
+        return jnp.sum((residual * weights) ** 2) / Qk.shape[2]
+
+    solver = jaxopt.LBFGS(fun=loss, maxiter=maxiter, tol=tol)
+    params, _ = solver.run(dict(log_poles=jnp.log(poles), lags_D=lags_D))
+    poles = jnp.exp(params["log_poles"])
+    lags_D = params["lags_D"]
+    matrices, lags_E, _ = fit_linear(poles, lags_D, Qk, redfreqs, ridge)
+    error = jnp.average(err_k(redfreqs, Qk, matrices, lags_D, lags_E, poles, None))
+    return matrices, lags_D, lags_E, poles, error
@@ -10,12 +10,11 @@ References
 
 import jax.numpy as jnp
 import jax
+import jaxopt
 import pyNastran.op4.op4 as OP4
-import jax
 import itertools
-import plotly.express as px
-import plotly.graph_objects as go
 import pathlib
+from functools import partial
 
 jax.config.update("jax_enable_x64", True)
 
@@ -75,13 +74,18 @@ class OptimisePoles:
     def __init__(self, redfreqs_, sampling_aeromatrices_,
                  num_poles_, poles_step_, poles_range_, rfa_method_=1):
 
-        self.poles_grid = None
+        self._poles_grid = None
         self.roger_matrices = None
         self.poles = None
         self.error = None
         self.error_name = None
         self.rfa_method = None
         self.norm_order = None
+        self.method = None
+        self.chunk_size = None
+        self.num_starts = None
+        self.maxiter = None
+        self.tol = None
 
         self.redfreqs = redfreqs_
         self.sampling_aeromatrices = sampling_aeromatrices_
@@ -89,8 +93,16 @@ class OptimisePoles:
         self.poles_step = poles_step_
         self.poles_range = poles_range_
         # self.rfa_method = rfa_method_
-        self._build_polesgrid()
         self.set_errsettings(rfa_method=rfa_method_)
+        self.set_optsettings()
+
+    @property
+    def poles_grid(self):
+        """Full grid of the brute force, only built when accessed"""
+
+        if self._poles_grid is None:
+            self._build_polesgrid()
+        return self._poles_grid
         
     def get_model(self, label='m1'):
 
@@ -102,9 +114,37 @@ class OptimisePoles:
         self.rfa_method = rfa_method
         self.norm_order = norm_order
         
+    def set_optsettings(self, method="brute", chunk_size=None, num_starts=8,
+                        maxiter=200, tol=1e-8):
+        """
+        method is brute (on the poles grid, in chunks of chunk_size
+        combinations if given so memory stays bounded) or lbfgs
+        (gradient-based on the log of the poles from num_starts
+        initial guesses in poles_range).
+        """
+
+        self.method = method
+        self.chunk_size = chunk_size
+        self.num_starts = num_starts
+        self.maxiter = maxiter
+        self.tol = tol
+
     def run(self, show_info=False):
 
-        if self.rfa_method == 1:
+        if self.method == "lbfgs":
+            poles0 = initial_poles(self.num_poles, self.poles_range, self.num_starts)
+            self.roger_matrices, self.poles, self.error = optimise_lbfgs(
+                poles0, self.redfreqs, self.sampling_aeromatrices,
+                error_name=self.error_name, norm_order=self.norm_order,
+                rfa_method=self.rfa_method, maxiter=self.maxiter, tol=self.tol)
+        elif self.chunk_size is not None:
+            poles_chunks = iterate_polesgrid(self.num_poles, self.poles_step,
+                                             self.poles_range, self.chunk_size)
+            self.roger_matrices, self.poles, self.error = optimise_chunked(
+                poles_chunks, self.redfreqs, self.sampling_aeromatrices,
+                error_name=self.error_name, norm_order=self.norm_order,
+                rfa_method=self.rfa_method)
+        elif self.rfa_method == 1:
             self.roger_matrices, self.poles, self.error = optimise_brute1(
                 self.poles_grid, self.redfreqs, self.sampling_aeromatrices, error_name=self.error_name,
                 norm_order=self.norm_order)
@@ -125,7 +165,7 @@ class OptimisePoles:
         
     def _build_polesgrid(self):
         
-        self.poles_grid = build_polesgrid(self.num_poles, self.poles_step, self.poles_range)
+        self._poles_grid = build_polesgrid(self.num_poles, self.poles_step, self.poles_range)
 
             
 class PlotGAFs:
@@ -312,6 +352,32 @@ def build_polesgrid(num_poles, poles_step, poles_range):
                        poles_step)
     poles_grid = jnp.array(list(itertools.combinations(poles, num_poles)))
     return poles_grid
+
+def iterate_polesgrid(num_poles, poles_step, poles_range, chunk_size):
+    """
+    Same grid as build_polesgrid in arrays of chunk_size combinations,
+    generated lazily
+    """
+
+    poles = jnp.arange(poles_range[0],
+                       poles_range[1] + poles_step,
+                       poles_step).tolist()
+    combinations = itertools.combinations(poles, num_poles)
+    while chunk := list(itertools.islice(combinations, chunk_size)):
+        yield jnp.array(chunk)
+
+def initial_poles(num_poles, poles_range, num_starts, seed=0):
+    """
+    Starting poles of the gradient-based optimisation, the first ones
+    equally spaced in poles_range and the rest random (log-uniform)
+    """
+
+    spaced = jnp.linspace(poles_range[0], poles_range[1], num_poles + 2)[1:-1]
+    random = jnp.exp(jax.random.uniform(jax.random.PRNGKey(seed),
+                                        (num_starts - 1, num_poles),
+                                        minval=jnp.log(poles_range[0]),
+                                        maxval=jnp.log(poles_range[1])))
+    return jnp.vstack([spaced, jnp.sort(random, axis=1)])
     
 def optimise_brute1(poles_grid, redfreqs, sampling_aeromatrices, error_name="average",
                    norm_order=2
@@ -343,8 +409,80 @@ def optimise_brute2(poles_grid, redfreqs, sampling_aeromatrices, error_name="ave
     min_index = jnp.argmin(verror)
     return roger_matrices[min_index], poles_grid[min_index], verror[min_index]
 
+_build_gafs = {1: build_gafs, 2: build_gafs2}
+
+@partial(jax.jit, static_argnames=["error_name", "norm_order", "rfa_method"])
+def err_polesgrid(poles_grid, redfreqs, sampling_aeromatrices, error_name="average",
+                  norm_order=None, rfa_method=1):
+    """
+    Error of each row of poles_grid, without keeping the Roger matrices
+    """
+
+    def kernel(poles):
+        roger_matrices = _build_gafs[rfa_method](poles, sampling_aeromatrices, redfreqs)
+        return err_poles(roger_matrices, poles, error_name, redfreqs,
+                         sampling_aeromatrices, norm_order)
+
+    return jax.vmap(kernel)(poles_grid)
+
+def optimise_chunked(poles_chunks, redfreqs, sampling_aeromatrices, error_name="average",
+                     norm_order=None, rfa_method=1):
+    """
+    Brute force over the chunks of the poles grid keeping the running
+    best, so only one chunk is in memory. The last chunk is padded to
+    the size of the first one to avoid recompiling.
+    """
+
+    best_poles = None
+    best_error = jnp.inf
+    chunk_size = None
+    for poles_grid in poles_chunks:
+        num_rows = len(poles_grid)
+        if chunk_size is None:
+            chunk_size = num_rows
+        elif num_rows < chunk_size:
+            padding = jnp.repeat(poles_grid[-1:], chunk_size - num_rows, axis=0)
+            poles_grid = jnp.vstack([poles_grid, padding])
+        verror = err_polesgrid(poles_grid, redfreqs, sampling_aeromatrices,
+                               error_name, norm_order, rfa_method)
+        min_index = int(jnp.argmin(verror))
+        if verror[min_index] < best_error:
+            best_error = verror[min_index]
+            best_poles = poles_grid[min_index]
+    roger_matrices = _build_gafs[rfa_method](best_poles, sampling_aeromatrices, redfreqs)
+    return roger_matrices, best_poles, best_error
+
+def optimise_lbfgs(poles0, redfreqs, sampling_aeromatrices, error_name="average",
+                   norm_order=None, rfa_method=1, maxiter=200, tol=1e-8):
+    """
+    Gradient-based optimisation of the log of the poles with jaxopt LBFGS
+    from each row of poles0 (multi-start), returning the best one
+    """
+
+    # A0 is exact with rfa_method 1, so the k0 error is left out of the
+    # loss (same minimum) as the norm has no derivative at 0
+    k0 = 1 if rfa_method == 1 else 0
+
+    def loss(log_poles):
+        poles = jnp.exp(log_poles)
+        roger_matrices = _build_gafs[rfa_method](poles, sampling_aeromatrices, redfreqs)
+        return err_poles(roger_matrices, poles, error_name, redfreqs[k0:],
+                         sampling_aeromatrices[k0:], norm_order)
+
+    solver = jaxopt.LBFGS(fun=loss, maxiter=maxiter, tol=tol)
+    log_poles, state = jax.jit(jax.vmap(solver.run))(jnp.log(poles0))
+    verror = jax.vmap(loss)(log_poles)
+    min_index = jnp.nanargmin(verror)
+    poles = jnp.sort(jnp.exp(log_poles[min_index]))
+    roger_matrices = _build_gafs[rfa_method](poles, sampling_aeromatrices, redfreqs)
+    error = err_poles(roger_matrices, poles, error_name, redfreqs,
+                      sampling_aeromatrices, norm_order)
+    return roger_matrices, poles, error
+
 def plot_gafs(irow, jcolumn, Qdlm, Qroger):
 
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     
     fig.add_trace(
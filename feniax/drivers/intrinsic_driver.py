@@ -1,7 +1,7 @@
 from feniax.drivers.driver import Driver
 
 import feniax.simulations
-from feniax.preprocessor import solution, configuration
+from feniax.preprocessor import solution, configuration, fem_cache
 import feniax.intrinsic.modes as modes
 import feniax.intrinsic.couplings as couplings
 import feniax.systems
@@ -51,14 +51,17 @@ class IntrinsicDriver(Driver, cls_name="intrinsic"):
         # TODO: condensation methods of K and M should be included
         if not self._config.driver.ad_on:
             if self._config.driver.compute_fem:
-                self._compute_modalshapes()
-                self._compute_modalcouplings()
+                if not self._load_femcache():
+                    self._compute_modalshapes()
+                    self._compute_modalcouplings()
+                    self._save_femcache()
                 if self._config.driver.save_fem:
                     self.sol.save_container("Modes")
                     self.sol.save_container("Couplings")
             else:
                 self._load_modalshapes()
                 self._load_modalcouplings()
+            self._compress_couplings()
 
     def run_case(self):
         if self.num_systems == 0:
@@ -107,6 +110,7 @@ class IntrinsicDriver(Driver, cls_name="intrinsic"):
         eig_funcs = dict(
             scipy=modes.compute_eigs_scipy,
             jax_custom=modes.compute_eigs,
+            sparse=modes.compute_eigs_sparse,
             inputs=modes.compute_eigs_load,
             input_memory=modes.compute_eigs_pass,
         )
@@ -121,6 +125,7 @@ class IntrinsicDriver(Driver, cls_name="intrinsic"):
             eig_names=self._config.fem.eig_names,
             eigenvals=self._config.fem.eigenvals,
             eigenvecs=self._config.fem.eigenvecs,
+            sigma=self._config.fem.eig_sigma,
         )
         print(f"***** Computing eigen problem from {eig_type} *****")
         return eigenvals, eigenvecs
@@ -139,8 +144,8 @@ class IntrinsicDriver(Driver, cls_name="intrinsic"):
         else:
             modal_analysis = modes.shapes(
                 self._config.fem.X.T,
-                self._config.fem.Ka,
-                self._config.fem.Ma,
+                modes.to_bcoo(self._config.fem.Ka),
+                modes.to_bcoo(self._config.fem.Ma),
                 eigenvals,
                 eigenvecs,
                 self._config,
@@ -154,6 +159,26 @@ class IntrinsicDriver(Driver, cls_name="intrinsic"):
 
         # elif self._config.numlib == "numpy":
         #    import feniax.intrinsic.couplings_np as couplings
+        if self._config.driver.couplings_extend is not None:
+            couplings0 = solution.load_container(
+                self._config.driver.couplings_extend, self.sol.sol_container.Couplings
+            )
+            print(f"***** Extending couplings from {len(couplings0.alpha1)} modes *****")
+            couplings.check_extension(
+                couplings0.gamma1,
+                self.sol.data.modes.phi1,
+                self.sol.data.modes.psi1,
+                tolerance=self._config.jax_np.allclose,
+            )
+            self.sol.extend_couplings(
+                couplings0, block_size=self._config.fem.couplings_blocksize
+            )
+            modes.assert_alphas(
+                self.sol.data.couplings.alpha1,
+                self.sol.data.couplings.alpha2,
+                tolerance=self._config.jax_np.allclose,
+            )
+            return
         alpha1, alpha2 = modes.check_alphas(
             self.sol.data.modes.phi1,
             self.sol.data.modes.psi1,
@@ -162,16 +187,51 @@ class IntrinsicDriver(Driver, cls_name="intrinsic"):
             self.sol.data.modes.X_xdelta,
             tolerance=self._config.jax_np.allclose,
         )
-        gamma1 = couplings.f_gamma1(self.sol.data.modes.phi1, self.sol.data.modes.psi1)
+        gamma1 = couplings.f_gamma1(
+            self.sol.data.modes.phi1,
+            self.sol.data.modes.psi1,
+            block_size=self._config.fem.couplings_blocksize,
+        )
         gamma2 = couplings.f_gamma2(
             self.sol.data.modes.phi1ml,
             self.sol.data.modes.phi2l,
             self.sol.data.modes.psi2l,
             self.sol.data.modes.X_xdelta,
+            block_size=self._config.fem.couplings_blocksize,
         )
 
         self.sol.add_container("Couplings", alpha1, alpha2, gamma1, gamma2)
 
+    def _compress_couplings(self):
+        if self._config.fem.gamma_compression is not None:
+            print(f"***** Compressing couplings ({self._config.fem.gamma_compression}) *****")
+            for gi in ("gamma1", "gamma2"):
+                setattr(
+                    self.sol.data.couplings,
+                    f"{gi}c",
+                    couplings.compress(
+                        getattr(self.sol.data.couplings, gi),
+                        self._config.fem.gamma_compression,
+                        self._config.fem.gamma_tolerance,
+                    ),
+                )
+
+    def _load_femcache(self) -> bool:
+        if self._config.driver.fem_cache is None:
+            return False
+        self._femcache = fem_cache.FemCache(
+            self._config.driver.fem_cache, self._config.driver.fem_cache_maxsize
+        )
+        self._femcache_key = fem_cache.hash_fem(self._config.fem)
+        loaded = self._femcache.load(self._femcache_key, self.sol)
+        if loaded:
+            print(f"***** Loading Modes and Couplings from cache {self._femcache_key[:12]} *****")
+        return loaded
+
+    def _save_femcache(self):
+        if self._config.driver.fem_cache is not None:
+            self._femcache.save(self._femcache_key, self.sol)
+
     def _load_modalshapes(self):
         self.sol.load_container("Modes")
 
@@ -1,6 +1,9 @@
 import pathlib
 from abc import ABC, abstractmethod
+from typing import NamedTuple
+import jax
 import jax.numpy as jnp
+import feniax.intrinsic.xloads as xloads
 import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
 import feniax.preprocessor.solution as solution
 from feniax.intrinsic.utils import Registry
@@ -19,6 +22,138 @@ class ModalAero(ABC):
     def save_sol(): ...
 
 
+class RogerDatabase(NamedTuple):
+    """Roger matrices of a grid of Mach numbers, stacked along the first axis
+
+    Attributes
+    ----------
+    mach : jax.Array
+        Increasing Mach numbers of the grid (NM), at least two
+    A : jax.Array
+        Structural matrices, NMx(3+Np)xNmxNm
+    D : jax.Array
+        Gust matrices, NMx(3+Np)xNmxNb (None if not given)
+    poles : jax.Array
+        Poles of the approximation, the same for all the grid as the lag
+        matrices of different poles cannot be interpolated
+
+    """
+
+    mach: jnp.ndarray
+    A: jnp.ndarray
+    D: jnp.ndarray
+    poles: jnp.ndarray
+
+
+class RogerHat(NamedTuple):
+    """Roger matrices scaled to a flow condition"""
+
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray  # NpxNmxNm
+    D0hat: jnp.ndarray = None
+    D1hat: jnp.ndarray = None
+    D2hat: jnp.ndarray = None
+    D3hat: jnp.ndarray = None  # NpxNmxNb
+
+
+@jax.jit
+def interpolate_mach(mach, mach_grid, tables: tuple) -> tuple:
+    """Linear interpolation at mach of tables stacked over mach_grid
+
+    Mach numbers outside the grid are clamped to its ends.
+    """
+
+    return xloads.interpolate_tables(mach, mach_grid, tables)
+
+
+@jax.jit
+def interpolate_database(mach, database: RogerDatabase):
+    """A and D of the database at mach"""
+
+    if database.D is None:
+        (A,) = interpolate_mach(mach, database.mach, (database.A,))
+        return A, None
+    return interpolate_mach(mach, database.mach, (database.A, database.D))
+
+
+@jax.jit
+def scale_roger(A, D, c_ref, rho_inf, u_inf) -> RogerHat:
+    """Roger matrices A (and D) scaled to the flow condition
+
+    Same scaling as AeroRoger._scale, traceable so the condition can
+    be a vmapped or sharded input.
+    """
+
+    q_inf = 0.5 * rho_inf * u_inf**2
+    coeff1 = c_ref * rho_inf * u_inf / 4
+    coeff2 = c_ref**2 * rho_inf / 8
+    A2hat = coeff2 * A[2]
+    A2hatinv = jnp.linalg.inv(jnp.eye(len(A2hat)) - A2hat)
+    hat = RogerHat(q_inf * A[0], coeff1 * A[1], A2hat, A2hatinv, q_inf * A[3:])
+    if D is None:
+        return hat
+    return hat._replace(
+        D0hat=q_inf * D[0], D1hat=coeff1 * D[1], D2hat=coeff2 * D[2], D3hat=q_inf * D[3:]
+    )
+
+
+@jax.jit
+def roger_condition(database: RogerDatabase, mach, rho_inf, u_inf, c_ref) -> RogerHat:
+    """Scaled Roger matrices of the database at a flight condition"""
+
+    A, D = interpolate_database(mach, database)
+    return scale_roger(A, D, c_ref, rho_inf, u_inf)
+
+
+class AeroDatabase:
+    """Parametric Roger model over a grid of Mach numbers
+
+    condition scales the matrices to a flight condition (mach, rho_inf,
+    u_inf), which can be traced, and condition_grid evaluates many
+    conditions in one compiled call.
+
+    Parameters
+    ----------
+    database : RogerDatabase
+        Stacked matrices and grid
+    c_ref : float
+        Reference chord
+
+    """
+
+    def __init__(self, database: RogerDatabase, c_ref: float):
+        self.database = database
+        self.c_ref = c_ref
+
+    @classmethod
+    def from_settings(cls, settings: intrinsicmodal.Daero):
+        database = RogerDatabase(
+            mach=settings.mach_grid, A=settings.A, D=settings.D, poles=settings.poles
+        )
+        return cls(database, settings.c_ref)
+
+    def interpolate(self, mach):
+        """A and D at mach"""
+
+        return interpolate_database(mach, self.database)
+
+    def condition(self, mach, rho_inf, u_inf) -> RogerHat:
+        """Scaled matrices at the flight condition"""
+
+        return roger_condition(self.database, mach, rho_inf, u_inf, self.c_ref)
+
+    def condition_grid(self, mach, rho_inf, u_inf) -> RogerHat:
+        """Scaled matrices of arrays of conditions, stacked along the first axis"""
+
+        return jax.vmap(roger_condition, in_axes=(None, 0, 0, 0, None))(
+            self.database, jnp.asarray(mach), jnp.asarray(rho_inf), jnp.asarray(u_inf),
+            self.c_ref
+        )
+
+
 @Registry.register("AeroRoger")
 class AeroRoger(ModalAero):
     def __init__(self, system: intrinsicmodal.Dsystem, sol: solution.IntrinsicSolution):
@@ -62,6 +197,12 @@ class AeroRoger(ModalAero):
 
     def _build_matrices(self):
         self.container = dict()
+        A, D = self.settings.A, self.settings.D
+        if self.settings.mach_grid is not None:
+            # matrices of the Mach number of the system from the database
+            A, D = AeroDatabase.from_settings(self.settings).interpolate(
+                self.settings.mach
+            )
         if self.settings.poles is not None:
             self.container.update(poles=self.settings.poles)
         # GAFs structure
@@ -71,14 +212,14 @@ class AeroRoger(ModalAero):
                 self.container.update(A0=A0)
             else:
                 ...  # build rfa
-        elif self.settings.A is not None:
-            self._get_matrix(self.settings.A, "A")
+        elif A is not None:
+            self._get_matrix(A, "A")
         # GAFs gust
         if self.settings.Qk_gust is not None:
             # build rfa
             ...
-        elif self.settings.D is not None:
-            self._get_matrix(self.settings.D, "D")
+        elif D is not None:
+            self._get_matrix(D, "D")
         # GAFs controls
         if self.settings.Qk_controls is not None:
             if len(self.settings.Qk_controls[0]) == 1:  # steady
@@ -114,3 +255,44 @@ class AeroRoger(ModalAero):
         if "A2hat" in self.container.keys():
             A2hat = jnp.eye(len(self.container["A2hat"])) - self.container["A2hat"]
             self.container["A2hatinv"] = jnp.linalg.inv(A2hat)
+
+
+@Registry.register("AeroKarpel")
+class AeroKarpel(AeroRoger):
+    """Minimum-state approximation, with the lag states shared by all modes
+
+    A and D hold the quasi-steady terms only (3xNmxNm, 3xNmxNb) and the
+    lag terms are lags_D (NmxNl), lags_E (NlxNm) and lags_Egust (NlxNb).
+    With mach_grid all of them are stacked over the grid and interpolated
+    at the Mach number of the system, entry by entry as in the Roger
+    database, so the fits at the grid points should share the lag roots.
+    """
+
+    def save_sol(self):
+        self.sol.add_container(
+            "ModalAeroKarpel", label="_" + self.sys.name, **self.container
+        )
+
+    def _build_matrices(self):
+        super()._build_matrices()
+        names = ("A", "D", "lags_D", "lags_E", "lags_Egust")
+        matrices = {k: getattr(self.settings, k) for k in names}
+        matrices = {k: v for k, v in matrices.items() if v is not None}
+        if self.settings.mach_grid is not None:
+            interpolated = interpolate_mach(
+                self.settings.mach, self.settings.mach_grid, tuple(matrices.values())
+            )
+            matrices = dict(zip(matrices.keys(), interpolated))
+        for k in ("A", "D"):
+            if k in matrices:
+                self.container.update({f"{k}{i}": matrices[k][i] for i in range(3)})
+        self.container.update(
+            {k: v for k, v in matrices.items() if k.startswith("lags")}
+        )
+
+    def _scale(self):
+        super()._scale()
+        self.container["lags_Dhat"] = self.q_inf * self.container["lags_D"]
+        if "lags_Egust" in self.container.keys():
+            # gust lags in the Roger layout (1xNlxNb) for the gust tables and kernel
+            self.container["D3hat"] = self.container["lags_Egust"][None]
@@ -1,9 +1,27 @@
+import functools
+from typing import NamedTuple
+
 import jax.numpy as jnp
+import feniax.intrinsic.xloads as xloads
 import feniax.preprocessor.solution as solution
 import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
 
 # TODO: build automatically using metafunctions
 
+def _gamma1(sol):
+    """gamma1 in the RHS, compressed if built in the pre-simulation"""
+    if sol.data.couplings.gamma1c is not None:
+        return sol.data.couplings.gamma1c
+    return sol.data.couplings.gamma1
+
+
+def _gamma2(sol):
+    """gamma2 in the RHS, compressed if built in the pre-simulation"""
+    if sol.data.couplings.gamma2c is not None:
+        return sol.data.couplings.gamma2c
+    return sol.data.couplings.gamma2
+
+
 def _args_diffrax(input1):
     return input1
 
@@ -20,7 +38,20 @@ def _args_runge_kutta(input1):
     return input1
 
 
+def _args_exponential(input1):
+    return input1
+
+
+def _args_imex(input1):
+    return input1
+
+
+def _args_newton(input1):
+    return input1
+
+
 def catter2library(fun: callable):
+    @functools.wraps(fun)
     def wrapper(*args, **kwargs):
         args_ = fun(*args, **kwargs)
         solver_library = getattr(args[1], "solver_library")
@@ -30,6 +61,28 @@ def catter2library(fun: callable):
     return wrapper
 
 
+# each arg_<label> returns its arguments as an Args_<label> named tuple.
+# Names of the external loads among them; only their forces (or the
+# amplitude of an analytic gust) are scaled in batched runs
+LOAD_ARGS = ("force_follower", "force_dead", "force_gravity", "F1g", "Flg")
+
+
+class Args_10G1(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_gravity: jnp.ndarray
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
 @catter2library
 def arg_10G1(
     sol: solution.IntrinsicSolution,
@@ -42,7 +95,7 @@ def arg_10G1(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
     force_gravity = pointforces.force_gravity
@@ -52,23 +105,32 @@ def arg_10G1(
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        x,
-        force_gravity,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_10G1(
+        eta_0=eta_0,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_gravity=force_gravity,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_10g11(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1: jnp.ndarray
+    x: jnp.ndarray
+    force_follower: jnp.ndarray | xloads.PointLoads
+
+
 @catter2library
 def arg_10g11(
     sol: solution.IntrinsicSolution,
@@ -79,14 +141,38 @@ def arg_10g11(
 ):
     pointforces = getattr(sol.data, f"pointforces_{system.name}")
     eta_0 = kwargs["eta_0"]
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     phi1 = sol.data.modes.phi1l
     omega = sol.data.modes.omega
     # x = system.xloads.x
     # force_follower = system.xloads.force_follower    
     x = pointforces.x
-    force_follower = pointforces.force_follower
-    return (eta_0, gamma2, omega, phi1, x, force_follower)
+    force_follower = xloads.point_loads(pointforces.force_follower,
+                                        pointforces.follower_index, phi1)
+    return Args_10g11(
+        eta_0=eta_0,
+        gamma2=gamma2,
+        omega=omega,
+        phi1=phi1,
+        x=x,
+        force_follower=force_follower,
+    )
+
+
+class Args_10g121(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_dead: jnp.ndarray | xloads.PointLoads
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
 
 
 @catter2library
@@ -101,33 +187,51 @@ def arg_10g121(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
-    force_dead = pointforces.force_dead
+    force_dead = xloads.point_loads(pointforces.force_dead,
+                                    pointforces.dead_index, phi1l)
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
     num_nodes = fem.num_nodes
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        x,
-        force_dead,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_10g121(
+        eta_0=eta_0,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_dead=force_dead,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_10G121(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_dead: jnp.ndarray | xloads.PointLoads
+    force_gravity: jnp.ndarray
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
 @catter2library
 def arg_10G121(
     sol: solution.IntrinsicSolution,
@@ -140,10 +244,11 @@ def arg_10G121(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
-    force_dead = pointforces.force_dead
+    force_dead = xloads.point_loads(pointforces.force_dead,
+                                    pointforces.dead_index, phi1l)
     force_gravity = pointforces.force_gravity
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
@@ -151,24 +256,34 @@ def arg_10G121(
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        x,
-        force_dead,
-        force_gravity,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_10G121(
+        eta_0=eta_0,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_dead=force_dead,
+        force_gravity=force_gravity,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_10g15(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    x: jnp.ndarray
+    qalpha: jnp.ndarray
+    A0hat: jnp.ndarray
+    C0hat: jnp.ndarray
+
+
 @catter2library
 def arg_10g15(
     sol: solution.IntrinsicSolution,
@@ -179,11 +294,41 @@ def arg_10g15(
 ):
     eta_0 = kwargs["eta_0"]
     x = sys.xloads.x
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     qalpha = sys.aero.qalpha
     aero = getattr(sol.data, f"modalaeroroger_{sys.name}")
-    return (eta_0, gamma2, omega, x, qalpha, aero.A0hat, aero.C0hat)
+    return Args_10g15(
+        eta_0=eta_0,
+        gamma2=gamma2,
+        omega=omega,
+        x=x,
+        qalpha=qalpha,
+        A0hat=aero.A0hat,
+        C0hat=aero.C0hat,
+    )
+
+
+class Args_11G6(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    A0hat: jnp.ndarray
+    B0hat: jnp.ndarray
+    elevator_index: jnp.ndarray
+    elevator_link: jnp.ndarray
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
 
 
 @catter2library
@@ -199,7 +344,7 @@ def arg_11G6(
     phi1 = sol.data.modes.phi1
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
     states = system.states
@@ -215,29 +360,50 @@ def arg_11G6(
     aero = getattr(sol.data, f"modalaeroroger_{system.name}")
     A0hat = aero.A0hat
     B0hat = aero.B0hat
-    return (
-        eta_0,
-        gamma2,
-        omega,
-        phi1,
-        phi1l,
-        psi2l,
-        x,
-        force_gravity,
-        states,
-        A0hat,
-        B0hat,
-        elevator_index,
-        elevator_link,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_11G6(
+        eta_0=eta_0,
+        gamma2=gamma2,
+        omega=omega,
+        phi1=phi1,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_gravity=force_gravity,
+        states=states,
+        A0hat=A0hat,
+        B0hat=B0hat,
+        elevator_index=elevator_index,
+        elevator_link=elevator_link,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_11G6l(NamedTuple):
+    eta_0: jnp.ndarray
+    omega: jnp.ndarray
+    phi1: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    A0hat: jnp.ndarray
+    B0hat: jnp.ndarray
+    elevator_index: jnp.ndarray
+    elevator_link: jnp.ndarray
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
 @catter2library
 def arg_11G6l(
     sol: solution.IntrinsicSolution,
@@ -251,7 +417,7 @@ def arg_11G6l(
     phi1 = sol.data.modes.phi1
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    # gamma2 = sol.data.couplings.gamma2
+    # gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
     states = system.states
@@ -267,39 +433,64 @@ def arg_11G6l(
     aero = getattr(sol.data, f"modalaeroroger_{system.name}")
     A0hat = aero.A0hat
     B0hat = aero.B0hat
-    return (
-        eta_0,
-        omega,
-        phi1,
-        phi1l,
-        psi2l,
-        x,
-        force_gravity,
-        states,
-        A0hat,
-        B0hat,
-        elevator_index,
-        elevator_link,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_11G6l(
+        eta_0=eta_0,
+        omega=omega,
+        phi1=phi1,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_gravity=force_gravity,
+        states=states,
+        A0hat=A0hat,
+        B0hat=B0hat,
+        elevator_index=elevator_index,
+        elevator_link=elevator_link,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
 #########################################################
+class Args_20g1(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    states: dict
+
+
 @catter2library
 def arg_20g1(
     sol: solution.IntrinsicSolution, system: intrinsicmodal.Dsystem, *args, **kwargs
 ):
     eta_0 = kwargs["eta_0"]
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     states = system.states
-    return eta_0, gamma1, gamma2, omega, states
+    return Args_20g1(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        states=states,
+    )
+
+
+class Args_20g11(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1: jnp.ndarray
+    x: jnp.ndarray
+    force_follower: jnp.ndarray | xloads.PointLoads
+    states: dict
 
 
 @catter2library
@@ -309,13 +500,41 @@ def arg_20g11(
     pointforces = getattr(sol.data, f"pointforces_{system.name}")
     eta_0 = kwargs["eta_0"]
     phi1 = sol.data.modes.phi1l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
-    force_follower = pointforces.force_follower
+    force_follower = xloads.point_loads(pointforces.force_follower,
+                                        pointforces.follower_index, phi1)
     states = system.states
-    return (eta_0, gamma1, gamma2, omega, phi1, x, force_follower, states)
+    return Args_20g11(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1=phi1,
+        x=x,
+        force_follower=force_follower,
+        states=states,
+    )
+
+
+class Args_20g121(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_dead: jnp.ndarray | xloads.PointLoads
+    states: dict
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
 
 
 @catter2library
@@ -330,48 +549,76 @@ def arg_20g121(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
     states = system.states
-    force_dead = pointforces.force_dead
+    force_dead = xloads.point_loads(pointforces.force_dead,
+                                    pointforces.dead_index, phi1l)
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
     num_nodes = fem.num_nodes
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        x,
-        force_dead,
-        states,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_20g121(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_dead=force_dead,
+        states=states,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
+class Args_20g2(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    states: dict
+
+
 @catter2library
 def arg_20g2(
     sol: solution.IntrinsicSolution, system: intrinsicmodal.Dsystem, *args, **kwargs
 ):
     
     eta_0 = kwargs["eta_0"]
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     phi1l = sol.data.modes.phi1l    
     states = system.states
-    return (eta_0, gamma1, gamma2, omega, phi1l, states)
+    return Args_20g2(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        states=states,
+    )
+
+class Args_20g22(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1: jnp.ndarray
+    x: jnp.ndarray
+    force_follower: jnp.ndarray | xloads.PointLoads
+    states: dict
+
 
 @catter2library
 def arg_20g22(
@@ -380,13 +627,40 @@ def arg_20g22(
     pointforces = getattr(sol.data, f"pointforces_{system.name}")
     eta_0 = kwargs["eta_0"]
     phi1 = sol.data.modes.phi1l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
-    force_follower = pointforces.force_follower
+    force_follower = xloads.point_loads(pointforces.force_follower,
+                                        pointforces.follower_index, phi1)
     states = system.states
-    return (eta_0, gamma1, gamma2, omega, phi1, x, force_follower, states)
+    return Args_20g22(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1=phi1,
+        x=x,
+        force_follower=force_follower,
+        states=states,
+    )
+
+
+class Args_20G2(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
 
 
 @catter2library
@@ -401,8 +675,8 @@ def arg_20G2(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     # x = pointforces.x
     states = system.states
@@ -413,24 +687,42 @@ def arg_20G2(
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        force_gravity,
-        states,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_20G2(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        force_gravity=force_gravity,
+        states=states,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_20g242(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    x: jnp.ndarray
+    force_dead: jnp.ndarray | xloads.PointLoads
+    states: dict
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
 @catter2library
 def arg_20g242(
     sol: solution.IntrinsicSolution,
@@ -443,37 +735,58 @@ def arg_20g242(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     x = pointforces.x
     states = system.states
-    force_dead = pointforces.force_dead
+    force_dead = xloads.point_loads(pointforces.force_dead,
+                                    pointforces.dead_index, phi1l)
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
     num_nodes = fem.num_nodes
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        x,
-        force_dead,
-        states,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_20g242(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        x=x,
+        force_dead=force_dead,
+        states=states,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_20g21(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    states: dict
+    poles: jnp.ndarray
+    num_modes: int
+    num_poles: int
+    x: jnp.ndarray
+    c_ref: float
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+
+
 @catter2library
 def arg_20g21(
     sol: solution.IntrinsicSolution,
@@ -483,8 +796,8 @@ def arg_20g21(
     **kwargs,
 ):
     eta_0 = kwargs["eta_0"]
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     states = sys.states
     u_inf = sys.aero.u_inf
@@ -495,27 +808,111 @@ def arg_20g21(
     num_poles = sys.aero.num_poles
     F1g = gust.Qhj_wsum  # NmxNt
     Flg = gust.Qhjl_wdot  # NpxNmxNt (NumPoles_NumModes_NumTime)
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        states,
-        aero.poles,        
-        num_modes,
-        num_poles,
-        gust.x,
-        c_ref,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        F1g,
-        Flg,
+    return Args_20g21(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        states=states,
+        poles=aero.poles,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        x=gust.x,
+        c_ref=c_ref,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        F1g=F1g,
+        Flg=Flg,
     )
 
 
+class Args_20g189(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    states: dict
+    poles: jnp.ndarray
+    x: jnp.ndarray
+    c_ref: float
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    lags_Dhat: jnp.ndarray
+    lags_E: jnp.ndarray
+    u_inf: float
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+
+
+@catter2library
+def arg_20g189(
+    sol: solution.IntrinsicSolution,
+    sys: intrinsicmodal.Dsystem,
+    fem: intrinsicmodal.Dfem,
+    *args,
+    **kwargs,
+):
+    eta_0 = kwargs["eta_0"]
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
+    omega = sol.data.modes.omega
+    states = sys.states
+    u_inf = sys.aero.u_inf
+    c_ref = sys.aero.c_ref
+    aero = getattr(sol.data, f"modalaerokarpel_{sys.name}")
+    gust = getattr(sol.data, f"gustroger_{sys.name}")
+    F1g = gust.Qhj_wsum  # NmxNt
+    Flg = gust.Qhjl_wdot  # 1xNlxNt (minimum-state lags)
+    return Args_20g189(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        states=states,
+        poles=aero.poles,
+        x=gust.x,
+        c_ref=c_ref,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        lags_Dhat=aero.lags_Dhat,
+        lags_E=aero.lags_E,
+        u_inf=u_inf,
+        F1g=F1g,
+        Flg=Flg,
+    )
+
+
+class Args_20G78(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    num_modes: int
+    num_poles: int
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
 @catter2library
 def arg_20G78(
     sol: solution.IntrinsicSolution,
@@ -528,8 +925,8 @@ def arg_20G78(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     num_modes = fem.num_modes
     states = system.states
@@ -545,33 +942,52 @@ def arg_20G78(
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        num_modes,
-        num_poles,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        c_ref,
-        aero.poles,
-        force_gravity,
-        states,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_20G78(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        force_gravity=force_gravity,
+        states=states,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_20G78l(NamedTuple):
+    eta_0: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    num_modes: int
+    num_poles: int
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    C0ab: jnp.ndarray
+
+
 @catter2library
 def arg_20G78l(
     sol: solution.IntrinsicSolution,
@@ -595,26 +1011,44 @@ def arg_20G78l(
     states = system.states
     C0ab = sol.data.modes.C0ab
 
-    return (
-        eta_0,
-        omega,
-        phi1l,
-        psi2l,
-        num_modes,
-        num_poles,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        c_ref,
-        aero.poles,
-        force_gravity,
-        states,
-        C0ab,
+    return Args_20G78l(
+        eta_0=eta_0,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        force_gravity=force_gravity,
+        states=states,
+        C0ab=C0ab,
     )
 
 
+class Args_20g21l(NamedTuple):
+    eta_0: jnp.ndarray
+    omega: jnp.ndarray
+    states: dict
+    num_modes: int
+    num_poles: int
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    x: jnp.ndarray
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+
+
 @catter2library
 def arg_20g21l(
     sol: solution.IntrinsicSolution,
@@ -634,25 +1068,45 @@ def arg_20g21l(
     num_poles = sys.aero.num_poles
     F1g = gust.Qhj_wsum  # NmxNt
     Flg = gust.Qhjl_wdot  # NpxNmxNt (NumPoles_NumModes_NumTime)
-    return (
-        eta_0,
-        omega,
-        states,
-        num_modes,
-        num_poles,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        c_ref,
-        aero.poles,
-        gust.x,
-        F1g,
-        Flg,
+    return Args_20g21l(
+        eta_0=eta_0,
+        omega=omega,
+        states=states,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        x=gust.x,
+        F1g=F1g,
+        Flg=Flg,
     )
 
 
+class Args_20g273(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    states: dict
+    num_modes: int
+    num_poles: int
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    x: jnp.ndarray
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+
+
 @catter2library
 def arg_20g273(
     sol: solution.IntrinsicSolution,
@@ -662,8 +1116,8 @@ def arg_20g273(
     **kwargs,
 ):
     eta_0 = kwargs["eta_0"]
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     states = sys.states
     u_inf = sys.aero.u_inf
@@ -674,26 +1128,47 @@ def arg_20g273(
     num_poles = sys.aero.num_poles
     F1g = gust.Qhj_wsum  # NmxNt
     Flg = gust.Qhjl_wdot  # NpxNmxNt (NumPoles_NumModes_NumTime)
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        states,
-        num_modes,
-        num_poles,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        c_ref,
-        aero.poles,
-        gust.x,
-        F1g,
-        Flg,
+    return Args_20g273(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        states=states,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        x=gust.x,
+        F1g=F1g,
+        Flg=Flg,
     )
 
+class Args_20g546(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    states: dict
+    poles: jnp.ndarray
+    num_modes: int
+    num_poles: int
+    x: jnp.ndarray
+    c_ref: float
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+
+
 @catter2library
 def arg_20g546(
     sol: solution.IntrinsicSolution,
@@ -704,8 +1179,8 @@ def arg_20g546(
 ):
 
     eta_0 = kwargs["eta_0"]
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     phi1l = sol.data.modes.phi1l
     states = sys.states
@@ -717,28 +1192,57 @@ def arg_20g546(
     num_poles = sys.aero.num_poles
     F1g = gust.Qhj_wsum  # NmxNt
     Flg = gust.Qhjl_wdot  # NpxNmxNt (NumPoles_NumModes_NumTime)
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        phi1l,
-        states,
-        aero.poles,        
-        num_modes,
-        num_poles,
-        gust.x,
-        c_ref,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        F1g,
-        Flg,
+    return Args_20g546(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        states=states,
+        poles=aero.poles,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        x=gust.x,
+        c_ref=c_ref,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        F1g=F1g,
+        Flg=Flg,
     )
     
 
+class Args_20G546(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    num_modes: int
+    num_poles: int
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    xgust: jnp.ndarray
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
 @catter2library
 def arg_20G546(
     sol: solution.IntrinsicSolution,
@@ -751,8 +1255,8 @@ def arg_20G546(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     num_modes = fem.num_modes
     states = system.states
@@ -772,36 +1276,58 @@ def arg_20G546(
     component_nodes = fem.component_nodes_int
     component_names = fem.component_names_int
     component_father = fem.component_father_int
-    return (
-        eta_0,
-        gamma1,
-        gamma2,
-        omega,
-        phi1l,
-        psi2l,
-        num_modes,
-        num_poles,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        c_ref,
-        aero.poles,
-        xgust,
-        F1g,
-        Flg,
-        force_gravity,
-        states,
-        X_xdelta,
-        C0ab,
-        component_names,
-        num_nodes,
-        component_nodes,
-        component_father,
+    return Args_20G546(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        xgust=xgust,
+        F1g=F1g,
+        Flg=Flg,
+        force_gravity=force_gravity,
+        states=states,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
+class Args_20G546l(NamedTuple):
+    eta_0: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    num_modes: int
+    num_poles: int
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    A3hat: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    xgust: jnp.ndarray
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    C0ab: jnp.ndarray
+
+
 @catter2library
 def arg_20G546l(
     sol: solution.IntrinsicSolution,
@@ -814,8 +1340,8 @@ def arg_20G546l(
     eta_0 = kwargs["eta_0"]
     phi1l = sol.data.modes.phi1l
     psi2l = sol.data.modes.psi2l
-    gamma1 = sol.data.couplings.gamma1
-    gamma2 = sol.data.couplings.gamma2
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
     omega = sol.data.modes.omega
     num_modes = fem.num_modes
     states = system.states
@@ -832,26 +1358,113 @@ def arg_20G546l(
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
 
-    return (
-        eta_0,
-        omega,
-        phi1l,
-        psi2l,
-        num_modes,
-        num_poles,
-        aero.A0hat,
-        aero.A1hat,
-        aero.A2hatinv,
-        aero.A3hat,
-        u_inf,
-        c_ref,
-        aero.poles,
-        xgust,
-        F1g,
-        Flg,
-        force_gravity,
-        states,
-        C0ab,
+    return Args_20G546l(
+        eta_0=eta_0,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        num_modes=num_modes,
+        num_poles=num_poles,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        A3hat=aero.A3hat,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        xgust=xgust,
+        F1g=F1g,
+        Flg=Flg,
+        force_gravity=force_gravity,
+        states=states,
+        C0ab=C0ab,
+    )
+
+
+class Args_20G4914(NamedTuple):
+    eta_0: jnp.ndarray
+    gamma1: jnp.ndarray
+    gamma2: jnp.ndarray
+    omega: jnp.ndarray
+    phi1l: jnp.ndarray
+    psi2l: jnp.ndarray
+    A0hat: jnp.ndarray
+    A1hat: jnp.ndarray
+    A2hatinv: jnp.ndarray
+    lags_Dhat: jnp.ndarray
+    lags_E: jnp.ndarray
+    u_inf: float
+    c_ref: float
+    poles: jnp.ndarray
+    xgust: jnp.ndarray
+    F1g: jnp.ndarray | xloads.GustKernel
+    Flg: jnp.ndarray
+    force_gravity: jnp.ndarray
+    states: dict
+    X_xdelta: jnp.ndarray
+    C0ab: jnp.ndarray
+    component_names: tuple
+    num_nodes: int
+    component_nodes: tuple
+    component_father: tuple
+
+
+@catter2library
+def arg_20G4914(
+    sol: solution.IntrinsicSolution,
+    system: intrinsicmodal.Dsystem,
+    fem: intrinsicmodal.Dfem,
+    *args,
+    **kwargs,
+):
+    pointforces = getattr(sol.data, f"pointforces_{system.name}")
+    eta_0 = kwargs["eta_0"]
+    phi1l = sol.data.modes.phi1l
+    psi2l = sol.data.modes.psi2l
+    gamma1 = _gamma1(sol)
+    gamma2 = _gamma2(sol)
+    omega = sol.data.modes.omega
+    states = system.states
+    u_inf = system.aero.u_inf
+    c_ref = system.aero.c_ref
+    aero = getattr(sol.data, f"modalaerokarpel_{system.name}")
+    gust = getattr(sol.data, f"gustroger_{system.name}")
+    F1g = gust.Qhj_wsum  # NmxNt
+    Flg = gust.Qhjl_wdot  # 1xNlxNt (minimum-state lags)
+    xgust = gust.x
+    force_gravity = pointforces.force_gravity
+    X_xdelta = sol.data.modes.X_xdelta
+    C0ab = sol.data.modes.C0ab
+    num_nodes = fem.num_nodes
+    component_nodes = fem.component_nodes_int
+    component_names = fem.component_names_int
+    component_father = fem.component_father_int
+    return Args_20G4914(
+        eta_0=eta_0,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        omega=omega,
+        phi1l=phi1l,
+        psi2l=psi2l,
+        A0hat=aero.A0hat,
+        A1hat=aero.A1hat,
+        A2hatinv=aero.A2hatinv,
+        lags_Dhat=aero.lags_Dhat,
+        lags_E=aero.lags_E,
+        u_inf=u_inf,
+        c_ref=c_ref,
+        poles=aero.poles,
+        xgust=xgust,
+        F1g=F1g,
+        Flg=Flg,
+        force_gravity=force_gravity,
+        states=states,
+        X_xdelta=X_xdelta,
+        C0ab=C0ab,
+        component_names=component_names,
+        num_nodes=num_nodes,
+        component_nodes=component_nodes,
+        component_father=component_father,
     )
 
 
@@ -1,6 +1,7 @@
 import jax.numpy as jnp
 import feniax.preprocessor.solution as solution
 import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
+from feniax.intrinsic.args import _gamma1, _gamma2
 
 def arg_10g11(
     sol: solution.IntrinsicSolution,
@@ -11,7 +12,7 @@ def arg_10g11(
 ):
     pointforces = getattr(sol.data, f"pointforces_{system.name}")
     eta_0 = kwargs["eta_0"]
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     phi1l = sol.data.modes.phi1l
     phi2l = sol.data.modes.phi2l
     psi2l = sol.data.modes.psi2l
@@ -33,7 +34,7 @@ def arg_10g15(
 ):
     
     eta_0 = kwargs["eta_0"]
-    gamma2 = sol.data.couplings.gamma2
+    gamma2 = _gamma2(sol)
     phi1l = sol.data.modes.phi1l
     phi2l = sol.data.modes.phi2l
     psi2l = sol.data.modes.psi2l
@@ -43,7 +44,7 @@ def arg_10g15(
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
     qalpha = system.aero.qalpha
-    A0 = system.aero.A[0]
+    A0 = system.aero.A[..., 0, :, :]  # also stacked over mach_grid
     C0 = system.aero.Q0_rigid
     
     return (phi2l, psi2l, X_xdelta, C0ab, A0, C0, (eta_0, gamma2, omega, x, qalpha))
@@ -65,8 +66,8 @@ def arg_20g21(
     omega = sol.data.modes.omega
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
-    gamma1 = sol.data.couplings.gamma1    
-    gamma2 = sol.data.couplings.gamma2    
+    gamma1 = _gamma1(sol)    
+    gamma2 = _gamma2(sol)    
     states = system.states
     c_ref = system.aero.c_ref
     num_modes = fem.num_modes
@@ -107,8 +108,8 @@ def arg_20g546(
     omega = sol.data.modes.omega
     X_xdelta = sol.data.modes.X_xdelta
     C0ab = sol.data.modes.C0ab
-    gamma1 = sol.data.couplings.gamma1    
-    gamma2 = sol.data.couplings.gamma2    
+    gamma1 = _gamma1(sol)    
+    gamma2 = _gamma2(sol)    
     states = system.states
     c_ref = system.aero.c_ref
     num_modes = fem.num_modes
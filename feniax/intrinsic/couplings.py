@@ -1,40 +1,120 @@
+from functools import partial
+from typing import NamedTuple
+
 import jax
 import jax.numpy as jnp
+import numpy as np
 import feniax.intrinsic.functions as functions
 
 # TODO: add quadratic approx.
 
 
-@jax.jit
-def f_gamma1(phi1: jnp.array, psi1: jnp.array) -> jnp.array:
-    """Gamma1 tensor calculation.
+def _map_blocks(f, x, block_size):
+    """Applies f sequentially over blocks of the first axis of x
 
     Parameters
     ----------
-    phi1 : jnp.array
-        Velocity modal shapes (Nmx6xNn)
-    psi1 : jnp.array
-        Momentum modal shapes (Nmx6xNn)
+    f : Callable
+        Function of a (block_size x ...) slice of x returning an array
+        with the block in axis 1
+    x : jnp.array
+        Array to be split along axis 0 (zero-padded to a multiple of
+        block_size)
+    block_size : int
+        Number of entries in each block
+
     Returns
     -------
     jnp.array
-        Gamma1 tensor (NmxNmxNm)
+        Concatenation of f over the blocks along axis 1
 
     """
+
+    num = x.shape[0]
+    num_blocks = -(-num // block_size)
+    x = jnp.pad(x, [(0, num_blocks * block_size - num)] + [(0, 0)] * (x.ndim - 1))
+    x = x.reshape((num_blocks, block_size) + x.shape[1:])
+    fx = jax.lax.map(f, x)  # num_blocks x Nm x block_size x ...
+    fx = jnp.moveaxis(fx, 0, 1)
+    fx = fx.reshape((fx.shape[0], num_blocks * block_size) + fx.shape[3:])
+    return fx[:, :num]
+
+
+def _gamma1(phi1i, phi1j, psi1k, block_size=None):
+    """gamma1[i, j, k] for the modes in each of the inputs"""
+
     f1 = jax.vmap(
         lambda u, v: jnp.tensordot(functions.L1(u), v, axes=(1, 1)),
         in_axes=(1, 2),
         out_axes=2,
     )  # iterate nodes
     f2 = jax.vmap(f1, in_axes=(0, None), out_axes=0)  # modes in 1st tensor
-    L1 = f2(phi1, psi1)  # Nmx6xNmxNm
-    gamma1 = jnp.einsum("isn,jskn->ijk", phi1, L1)
+    if block_size is None or block_size >= len(phi1j):
+        L1 = f2(phi1j, psi1k)  # Nmx6xNmxNn
+        gamma1 = jnp.einsum("isn,jskn->ijk", phi1i, L1)
+    else:
+        gamma1 = _map_blocks(
+            lambda phi1b: jnp.einsum("isn,jskn->ijk", phi1i, f2(phi1b, psi1k)),
+            phi1j,
+            block_size,
+        )
     return gamma1
 
 
-@jax.jit
+def _gamma2(phi1mi, phi2j, psi2k, delta_s, block_size=None):
+    """gamma2[i, j, k] for the modes in each of the inputs (nodes 1: only)"""
+
+    f1 = jax.vmap(
+        lambda u, v: jnp.tensordot(functions.L2(u), v, axes=(1, 1)),
+        in_axes=(1, 2),
+        out_axes=2,
+    )  # iterate nodes
+    f2 = jax.vmap(f1, in_axes=(0, None), out_axes=0)  # modes in 1st tensor
+    if block_size is None or block_size >= len(phi2j):
+        L2 = f2(phi2j, psi2k)  # Nmx6xNmxNn
+        gamma2 = jnp.einsum("isn,jskn,n->ijk", phi1mi, L2, delta_s)
+    else:
+        gamma2 = _map_blocks(
+            lambda phi2b: jnp.einsum(
+                "isn,jskn,n->ijk", phi1mi, f2(phi2b, psi2k), delta_s
+            ),
+            phi2j,
+            block_size,
+        )
+    return gamma2
+
+
+@partial(jax.jit, static_argnames=["block_size"])
+def f_gamma1(phi1: jnp.array, psi1: jnp.array, block_size: int = None) -> jnp.array:
+    """Gamma1 tensor calculation.
+
+    Parameters
+    ----------
+    phi1 : jnp.array
+        Velocity modal shapes (Nmx6xNn)
+    psi1 : jnp.array
+        Momentum modal shapes (Nmx6xNn)
+    block_size : int
+        Number of modes (second index of gamma1) computed at once; the
+        peak memory goes with block_size x 6 x Nm x Nn. None for all
+        modes in one go
+    Returns
+    -------
+    jnp.array
+        Gamma1 tensor (NmxNmxNm)
+
+    """
+    gamma1 = _gamma1(phi1, phi1, psi1, block_size)
+    return gamma1
+
+
+@partial(jax.jit, static_argnames=["block_size"])
 def f_gamma2(
-    phi1m: jnp.array, phi2: jnp.array, psi2: jnp.array, delta_s: jnp.array
+    phi1m: jnp.array,
+    phi2: jnp.array,
+    psi2: jnp.array,
+    delta_s: jnp.array,
+    block_size: int = None,
 ) -> jnp.array:
     """Gamma1 tensor calculation.
 
@@ -48,6 +128,10 @@ def f_gamma2(
         Strain modal shapes (Nmx6xNn)
     delta_s : jnp.array
         1D differential path increments (Nn)
+    block_size : int
+        Number of modes (second index of gamma2) computed at once; the
+        peak memory goes with block_size x 6 x Nm x Nn. None for all
+        modes in one go
     
     Returns
     -------
@@ -60,14 +144,7 @@ def f_gamma2(
     phi2i = phi2[:, :, 1:]
     psi2i = psi2[:, :, 1:]
     delta_si = delta_s[1:]
-    f1 = jax.vmap(
-        lambda u, v: jnp.tensordot(functions.L2(u), v, axes=(1, 1)),
-        in_axes=(1, 2),
-        out_axes=2,
-    )  # iterate nodes
-    f2 = jax.vmap(f1, in_axes=(0, None), out_axes=0)  # modes in 1st tensor
-    L2 = f2(phi2i, psi2i)  # Nmx6xNmxNm
-    gamma2 = jnp.einsum("isn,jskn,n->ijk", phi1mi, L2, delta_si)
+    gamma2 = _gamma2(phi1mi, phi2i, psi2i, delta_si, block_size)
     # L2 = f2(phi2, psi2) # Nmx6xNmxNm
     # gamma2 = jnp.einsum('isn,jskn,n->ijk', phi1m, L2, delta_s)
     return gamma2
@@ -119,3 +196,239 @@ def f_alpha2(phi2: jnp.array, psi2: jnp.array, delta_s: jnp.array) -> jnp.array:
     delta_si = delta_s[1:]
     alpha2 = jnp.einsum("isn,jsn,n->ij", phi2i, psi2i, delta_si)
     return alpha2
+
+
+def _extend2(alpha0, f, Ai, Aj):
+    num0 = len(alpha0)
+    alpha = jnp.zeros((len(Ai), len(Aj)), dtype=alpha0.dtype)
+    alpha = alpha.at[:num0, :num0].set(alpha0)
+    alpha = alpha.at[:, num0:].set(f(Ai, Aj[num0:]))
+    alpha = alpha.at[num0:, :num0].set(f(Ai[num0:], Aj[:num0]))
+    return alpha
+
+
+def _extend3(gamma0, f, Ai, Aj, Ak):
+    num0 = len(gamma0)
+    gamma = jnp.zeros((len(Ai), len(Aj), len(Ak)), dtype=gamma0.dtype)
+    gamma = gamma.at[:num0, :num0, :num0].set(gamma0)
+    gamma = gamma.at[:, :, num0:].set(f(Ai, Aj, Ak[num0:]))
+    gamma = gamma.at[:, num0:, :num0].set(f(Ai, Aj[num0:], Ak[:num0]))
+    gamma = gamma.at[num0:, :num0, :num0].set(f(Ai[num0:], Aj[:num0], Ak[:num0]))
+    return gamma
+
+
+@partial(jax.jit, static_argnames=["block_size"])
+def extend_couplings(
+    alpha1: jnp.array,
+    alpha2: jnp.array,
+    gamma1: jnp.array,
+    gamma2: jnp.array,
+    phi1: jnp.array,
+    psi1: jnp.array,
+    phi1m: jnp.array,
+    phi2: jnp.array,
+    psi2: jnp.array,
+    delta_s: jnp.array,
+    block_size: int = None,
+) -> tuple[jnp.array, jnp.array, jnp.array, jnp.array]:
+    """Extends the couplings computed with Nm0 modes to Nm1 > Nm0 modes
+
+    Only the entries with at least one index in Nm0: are computed, the
+    leading Nm0 blocks are taken from the inputs. The modal shapes must
+    come from the same eigen-solution (same scaling and signs) such that
+    their first Nm0 modes are those used for the input couplings, see
+    check_extension.
+
+    Parameters
+    ----------
+    alpha1 : jnp.array
+        Alpha1 at Nm0 modes (Nm0xNm0)
+    alpha2 : jnp.array
+        Alpha2 at Nm0 modes (Nm0xNm0)
+    gamma1 : jnp.array
+        Gamma1 at Nm0 modes (Nm0xNm0xNm0)
+    gamma2 : jnp.array
+        Gamma2 at Nm0 modes (Nm0xNm0xNm0)
+    phi1 : jnp.array
+        Velocity modal shapes (Nm1x6xNn)
+    psi1 : jnp.array
+        Momentum modal shapes (Nm1x6xNn)
+    phi1m : jnp.array
+        Velocity modal shapes at mid-points (Nm1x6xNn)
+    phi2 : jnp.array
+        Internal force modal shapes (Nm1x6xNn)
+    psi2 : jnp.array
+        Strain modal shapes (Nm1x6xNn)
+    delta_s : jnp.array
+        1D differential path increments (Nn)
+    block_size : int
+        Block size in the gamma computations, see f_gamma1
+
+    Returns
+    -------
+    tuple[jnp.array, jnp.array, jnp.array, jnp.array]
+        alpha1, alpha2, gamma1, gamma2 at Nm1 modes
+
+    """
+
+    phi1mi = phi1m[:, :, 1:]
+    phi2i = phi2[:, :, 1:]
+    psi2i = psi2[:, :, 1:]
+    delta_si = delta_s[1:]
+    alpha1 = _extend2(
+        alpha1, lambda u, v: jnp.einsum("isn,jsn->ij", u, v), phi1, psi1
+    )
+    alpha2 = _extend2(
+        alpha2,
+        lambda u, v: jnp.einsum("isn,jsn,n->ij", u, v, delta_si),
+        phi2i,
+        psi2i,
+    )
+    gamma1 = _extend3(
+        gamma1, partial(_gamma1, block_size=block_size), phi1, phi1, psi1
+    )
+    gamma2 = _extend3(
+        gamma2,
+        lambda u, v, w: _gamma2(u, v, w, delta_si, block_size),
+        phi1mi,
+        phi2i,
+        psi2i,
+    )
+    return alpha1, alpha2, gamma1, gamma2
+
+
+def check_extension(
+    gamma1: jnp.array, phi1: jnp.array, psi1: jnp.array, tolerance: dict
+):
+    """Checks gamma1 at Nm0 modes was computed with the leading modes of phi1
+
+    The slice gamma1[:, :, 0] is recomputed from the current modal
+    shapes, which catches a different FE model, normalisation or sign of
+    the modes (alpha1 is not changed by a sign flip).
+
+    Parameters
+    ----------
+    gamma1 : jnp.array
+        Gamma1 at Nm0 modes (Nm0xNm0xNm0)
+    phi1 : jnp.array
+        Velocity modal shapes (Nm1x6xNn)
+    psi1 : jnp.array
+        Momentum modal shapes (Nm1x6xNn)
+    tolerance : dict
+        rtol and atol, the latter relative to the largest entry of the slice
+
+    Raises
+    ------
+    ValueError
+        If the recomputed slice does not match the input one
+
+    """
+
+    num_modes0 = len(gamma1)
+    if num_modes0 > len(phi1):
+        raise ValueError(
+            f"Couplings at {num_modes0} modes cannot be extended to {len(phi1)}"
+        )
+    gamma1_k0 = _gamma1(phi1[:num_modes0], phi1[:num_modes0], psi1[:1])[:, :, 0]
+    atol = tolerance["atol"] * jnp.abs(gamma1_k0).max()
+    if not jnp.allclose(gamma1[:, :, 0], gamma1_k0, rtol=tolerance["rtol"], atol=atol):
+        raise ValueError(
+            "Couplings to extend do not match the leading modes (different FE "
+            "model, normalisation or eigenvector signs), compute them from scratch"
+        )
+
+
+class GammaSparse(NamedTuple):
+    """Gamma tensor in coordinate (COO) format
+
+    Only entries above the compression tolerance are kept, gamma[i[l],
+    j[l], k[l]] = values[l].
+    """
+
+    i: jnp.ndarray
+    j: jnp.ndarray
+    k: jnp.ndarray
+    values: jnp.ndarray
+
+
+class GammaTucker(NamedTuple):
+    """Gamma tensor as a truncated Tucker decomposition
+
+    gamma[i, j, k] = core[a, b, c] U1[i, a] U2[j, b] U3[k, c]
+    """
+
+    core: jnp.ndarray
+    U1: jnp.ndarray
+    U2: jnp.ndarray
+    U3: jnp.ndarray
+
+
+def compress_sparse(gamma: jnp.array, tolerance: float) -> GammaSparse:
+    """Drops the entries of gamma smaller than tolerance*max(abs(gamma))
+
+    Parameters
+    ----------
+    gamma : jnp.array
+        Gamma tensor (NmxNmxNm)
+    tolerance : float
+        Relative threshold
+
+    Returns
+    -------
+    GammaSparse
+
+    """
+
+    gamma = np.asarray(gamma)
+    i, j, k = np.nonzero(np.abs(gamma) > tolerance * np.abs(gamma).max())
+    return GammaSparse(
+        jnp.array(i), jnp.array(j), jnp.array(k), jnp.array(gamma[i, j, k])
+    )
+
+
+def compress_tucker(gamma: jnp.array, tolerance: float) -> GammaTucker:
+    """Truncated higher-order SVD of gamma
+
+    Singular values of each unfolding smaller than tolerance times the
+    largest one are dropped.
+
+    Parameters
+    ----------
+    gamma : jnp.array
+        Gamma tensor (NmxNmxNm)
+    tolerance : float
+        Relative threshold on the singular values
+
+    Returns
+    -------
+    GammaTucker
+
+    """
+
+    gamma = np.asarray(gamma)
+    factors = []
+    for axis in range(3):
+        unfolding = np.moveaxis(gamma, axis, 0).reshape(gamma.shape[axis], -1)
+        U, S, _ = np.linalg.svd(unfolding, full_matrices=False)
+        rank = max(1, int(np.sum(S > tolerance * S[0])))
+        factors.append(U[:, :rank])
+    core = np.einsum("ijk,ia,jb,kc->abc", gamma, *factors)
+    return GammaTucker(jnp.array(core), *[jnp.array(Ui) for Ui in factors])
+
+
+def compress(gamma: jnp.array, method: str, tolerance: float):
+    """Compressed representation of gamma to be used in the RHS contractions
+
+    Parameters
+    ----------
+    gamma : jnp.array
+        Gamma tensor (NmxNmxNm)
+    method : str
+        "sparse" or "tucker"
+    tolerance : float
+        Relative tolerance of the compression
+
+    """
+
+    compressors = dict(sparse=compress_sparse, tucker=compress_tucker)
+    return compressors[method](gamma, tolerance)
@@ -2,6 +2,7 @@ import jax.numpy as jnp
 import jax
 import feniax.intrinsic.postprocess as postprocess
 import feniax.intrinsic.functions as functions
+from feniax.intrinsic.couplings import GammaSparse, GammaTucker
 from functools import partial
 
 
@@ -11,8 +12,9 @@ def contraction_gamma1(gamma1: jnp.ndarray, q1: jnp.ndarray) -> jnp.ndarray:
 
     Parameters
     ----------
-    gamma1 : jnp.ndarray
-        3rd order tensor (NmxNmxNm) with velocity modal couplings
+    gamma1 : jnp.ndarray | GammaSparse | GammaTucker
+        3rd order tensor (NmxNmxNm) with velocity modal couplings, dense
+        or compressed (see couplings.compress)
     q1 : jnp.ndarray
         velocity modal coordinate
 
@@ -21,13 +23,13 @@ def contraction_gamma1(gamma1: jnp.ndarray, q1: jnp.ndarray) -> jnp.ndarray:
     jnp.ndarray
         Gamma1xq1xq1 (Nmx1)
     """
-    res = jnp.einsum("ijk,jk->i", gamma1, jnp.tensordot(q1, q1, axes=0))
+    res = _contraction_ijk(gamma1, q1, q1)
     return res
 
 
 @jax.jit
 def contraction_gamma2(gamma2: jnp.ndarray, q2: jnp.ndarray) -> jnp.ndarray:
-    res = jnp.einsum("ijk,jk->i", gamma2, jnp.tensordot(q2, q2, axes=0))
+    res = _contraction_ijk(gamma2, q2, q2)
     return res
 
 
@@ -35,10 +37,87 @@ def contraction_gamma2(gamma2: jnp.ndarray, q2: jnp.ndarray) -> jnp.ndarray:
 def contraction_gamma3(
     gamma2: jnp.ndarray, q1: jnp.ndarray, q2: jnp.ndarray
 ) -> jnp.ndarray:
-    res = jnp.einsum("jik,jk->i", gamma2, jnp.tensordot(q1, q2, axes=0))
+    if isinstance(gamma2, GammaSparse):
+        res = jax.ops.segment_sum(
+            gamma2.values * q1[gamma2.i] * q2[gamma2.k],
+            gamma2.j,
+            num_segments=len(q1),
+        )
+    elif isinstance(gamma2, GammaTucker):
+        res = gamma2.U2 @ jnp.einsum(
+            "abc,a,c->b", gamma2.core, gamma2.U1.T @ q1, gamma2.U3.T @ q2
+        )
+    else:
+        res = jnp.einsum("jik,jk->i", gamma2, jnp.tensordot(q1, q2, axes=0))
     return res
 
 
+def _contraction_ijk(gamma, qj, qk):
+    """gamma_ijk qj_j qk_k for the dense and compressed gammas"""
+
+    if isinstance(gamma, GammaSparse):
+        res = jax.ops.segment_sum(
+            gamma.values * qj[gamma.j] * qk[gamma.k],
+            gamma.i,
+            num_segments=len(qj),
+        )
+    elif isinstance(gamma, GammaTucker):
+        res = gamma.U1 @ jnp.einsum(
+            "abc,b,c->a", gamma.core, gamma.U2.T @ qj, gamma.U3.T @ qk
+        )
+    else:
+        res = jnp.einsum("ijk,jk->i", gamma, jnp.tensordot(qj, qk, axes=0))
+    return res
+
+
+def jac_contraction(gamma, q: jnp.ndarray) -> jnp.ndarray:
+    """Jacobian of gamma_ijk q_j q_k, (gamma_ijk + gamma_ikj) q_k (NmxNm)"""
+
+    if isinstance(gamma, GammaSparse):
+        vq_k = gamma.values * q[gamma.k]
+        vq_j = gamma.values * q[gamma.j]
+        res = jnp.zeros((len(q), len(q)), dtype=q.dtype)
+        res = res.at[gamma.i, gamma.j].add(vq_k).at[gamma.i, gamma.k].add(vq_j)
+    elif isinstance(gamma, GammaTucker):
+        res = gamma.U1 @ (
+            jnp.einsum("abc,c->ab", gamma.core, gamma.U3.T @ q) @ gamma.U2.T
+            + jnp.einsum("abc,b->ac", gamma.core, gamma.U2.T @ q) @ gamma.U3.T
+        )
+    else:
+        res = jnp.einsum("ijk,k->ij", gamma, q) + jnp.einsum("ikj,k->ij", gamma, q)
+    return res
+
+
+def jac_contraction_gamma3(gamma2, q1: jnp.ndarray, q2: jnp.ndarray):
+    """Jacobians of contraction_gamma3 with respect to q1 and q2 (NmxNm)"""
+
+    if isinstance(gamma2, GammaSparse):
+        zeros = jnp.zeros((len(q1), len(q1)), dtype=q1.dtype)
+        dq1 = zeros.at[gamma2.j, gamma2.i].add(gamma2.values * q2[gamma2.k])
+        dq2 = zeros.at[gamma2.j, gamma2.k].add(gamma2.values * q1[gamma2.i])
+    elif isinstance(gamma2, GammaTucker):
+        dq1 = gamma2.U2 @ (
+            jnp.einsum("abc,c->ba", gamma2.core, gamma2.U3.T @ q2) @ gamma2.U1.T
+        )
+        dq2 = gamma2.U2 @ (
+            jnp.einsum("abc,a->bc", gamma2.core, gamma2.U1.T @ q1) @ gamma2.U3.T
+        )
+    else:
+        dq1 = jnp.einsum("jik,k->ij", gamma2, q2)
+        dq2 = jnp.einsum("jik,j->ik", gamma2, q1)
+    return dq1, dq2
+
+
+@jax.jit
+def jac_f_12(omega, gamma1, gamma2, q1, q2):
+    """Jacobian of f_12 with respect to (q1, q2), 2Nmx2Nm"""
+
+    dF2_dq1, dF2_dq2 = jac_contraction_gamma3(gamma2, q1, q2)
+    dF1 = jnp.hstack([-jac_contraction(gamma1, q1), jnp.diag(omega) - jac_contraction(gamma2, q2)])
+    dF2 = jnp.hstack([dF2_dq1 - jnp.diag(omega), dF2_dq2])
+    return jnp.vstack([dF1, dF2])
+
+
 @jax.jit
 def f_12(omega, gamma1, gamma2, q1, q2):
     F1 = omega * q2 - contraction_gamma1(gamma1, q1) - contraction_gamma2(gamma2, q2)
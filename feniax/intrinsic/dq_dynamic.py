@@ -21,6 +21,26 @@ def dq_20g1(t, q, *args):
     return F
 
 
+def _jac_12(omega, gamma1, gamma2, q, states):
+    """Jacobian of f_12 with the columns in the order of the states"""
+
+    q1 = q[states["q1"]]
+    q2 = q[states["q2"]]
+    J12 = common.jac_f_12(omega, gamma1, gamma2, q1, q2)
+    num_modes = len(q1)
+    J = jnp.zeros((2 * num_modes, len(q)), dtype=q.dtype)
+    J = J.at[:, jnp.array(states["q1"])].set(J12[:, :num_modes])
+    J = J.at[:, jnp.array(states["q2"])].set(J12[:, num_modes:])
+    return J
+
+
+def jac_20g1(t, q, *args):
+    """Jacobian of dq_20g1."""
+
+    eta_0, gamma1, gamma2, omega, states = args[0]
+    return _jac_12(omega, gamma1, gamma2, q, states)
+
+
 # @jax.jit
 def dq_20g11(t, q, *args):
     """Clamped structural dynamic follower point forces."""
@@ -37,6 +57,13 @@ def dq_20g11(t, q, *args):
     return F
 
 
+def jac_20g11(t, q, *args):
+    """Jacobian of dq_20g11, follower forces do not depend on q."""
+
+    (eta_0, gamma1, gamma2, omega, phi1, x, force_follower, states) = args[0]
+    return _jac_12(omega, gamma1, gamma2, q, states)
+
+
 def dq_20g121(t, q, *args):
     """Clamped structural dynamic dead point forces."""
 
@@ -239,7 +266,7 @@ def dq_20g21(t, q, *args):
     # jax.debug.breakpoint()
     # ql_tensor = ql.reshape((num_modes, num_poles))
     eta_s = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
-    eta_gust = xloads.eta_rogergust(t, xgust, F1gust)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
     # jax.debug.breakpoint()
     F1, F2 = common.f_12(omega, gamma1, gamma2, q1, q2)
     F1 += eta_s + eta_gust
@@ -258,13 +285,132 @@ def dq_20g21(t, q, *args):
     #                                 c_ref, poles,
     #                                 num_modes, num_poles)  # NlxNm
     # Fl = Fl1 + Fl2
-    Flgust = xloads.lags_rogergust(t, xgust, Flgust)  # NlxNm
     # jax.debug.breakpoint()
     Fl += Flgust
     # Fl = Fl_tensor.reshape(num_modes * num_poles
     return jnp.hstack([F1, F2, Fl])
 
 
+def jac_20g21(t, q, *args):
+    """Jacobian of dq_20g21, the gust terms do not depend on q."""
+
+    (
+        eta_0,
+        gamma1,
+        gamma2,
+        omega,
+        states,
+        poles,
+        _,  # num_modes and num_poles, taken from the shapes below so they
+        _,  # stay static when the args are traced
+        xgust,
+        c_ref,
+        A0hat,
+        A1hat,
+        A2hatinv,
+        A3hat,
+        u_inf,
+        F1gust,
+        Flgust,
+    ) = args[0]
+
+    J = _jac_12(omega, gamma1, gamma2, q, states)
+    num_modes = len(omega)
+    num_lags = len(states["ql"])
+    num_poles = num_lags // num_modes
+    q1_index = jnp.array(states["q1"])
+    q2_index = jnp.array(states["q2"])
+    ql_index = jnp.array(states["ql"])
+    # aerodynamic stiffness (q0 = -q2 / omega), damping and lags
+    J1 = J[:num_modes]
+    J1 = J1.at[:, q1_index].add(A1hat)
+    J1 = J1.at[:, q2_index].add(-A0hat / omega)
+    J1 = J1.at[:, ql_index].add(jnp.tile(jnp.eye(num_modes), num_poles))
+    J1 = A2hatinv @ J1
+    Jl = jnp.zeros((num_lags, len(q)), dtype=q.dtype)
+    Jl = Jl.at[:, q1_index].set(jnp.vstack(A3hat))
+    Jl = Jl.at[:, ql_index].set(
+        jnp.kron(jnp.diag(-2 * u_inf / c_ref * poles), jnp.eye(num_modes))
+    )
+    return jnp.vstack([J1, J[num_modes:], Jl])
+
+
+def dq_20g189(t, q, *args):
+    """Gust response with minimum-state aerodynamics."""
+
+    (
+        eta_0,
+        gamma1,
+        gamma2,
+        omega,
+        states,
+        poles,
+        xgust,
+        c_ref,
+        A0hat,
+        A1hat,
+        A2hatinv,
+        lags_Dhat,
+        lags_E,
+        u_inf,
+        F1gust,
+        Flgust,
+    ) = args[0]
+
+    q1 = q[states["q1"]]
+    q2 = q[states["q2"]]
+    q0 = -q2 / omega
+    ql = q[states["ql"]]
+    eta_s = xloads.eta_karpelstruct(q0, q1, ql, A0hat, A1hat, lags_Dhat)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
+    F1, F2 = common.f_12(omega, gamma1, gamma2, q1, q2)
+    F1 += eta_s + eta_gust
+    F1 += eta_0
+    F1 = A2hatinv @ F1  # Nm
+    Fl = xloads.lags_karpelstructure(lags_E, q1, ql, u_inf, c_ref, poles)  # Nl
+    Fl += Flgust
+    return jnp.hstack([F1, F2, Fl])
+
+
+def jac_20g189(t, q, *args):
+    """Jacobian of dq_20g189, the gust terms do not depend on q."""
+
+    (
+        eta_0,
+        gamma1,
+        gamma2,
+        omega,
+        states,
+        poles,
+        xgust,
+        c_ref,
+        A0hat,
+        A1hat,
+        A2hatinv,
+        lags_Dhat,
+        lags_E,
+        u_inf,
+        F1gust,
+        Flgust,
+    ) = args[0]
+
+    J = _jac_12(omega, gamma1, gamma2, q, states)
+    num_modes = len(omega)
+    num_lags = len(states["ql"])
+    q1_index = jnp.array(states["q1"])
+    q2_index = jnp.array(states["q2"])
+    ql_index = jnp.array(states["ql"])
+    J1 = J[:num_modes]
+    J1 = J1.at[:, q1_index].add(A1hat)
+    J1 = J1.at[:, q2_index].add(-A0hat / omega)
+    J1 = J1.at[:, ql_index].add(lags_Dhat)
+    J1 = A2hatinv @ J1
+    Jl = jnp.zeros((num_lags, len(q)), dtype=q.dtype)
+    Jl = Jl.at[:, q1_index].set(lags_E)
+    Jl = Jl.at[:, ql_index].set(jnp.diag(-2 * u_inf / c_ref * poles))
+    return jnp.vstack([J1, J[num_modes:], Jl])
+
+
 def dq_20g21l(t, q, *args):
     """Gust response."""
 
@@ -293,7 +439,7 @@ def dq_20g21l(t, q, *args):
     # jax.debug.breakpoint()
     # ql_tensor = ql.reshape((num_modes, num_poles))
     eta_s = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
-    eta_gust = xloads.eta_rogergust(t, xgust, F1gust)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
     # jax.debug.breakpoint()
     F1, F2 = common.f_12l(omega, q1, q2)
     F1 += eta_s + eta_gust
@@ -312,7 +458,6 @@ def dq_20g21l(t, q, *args):
     #                                 c_ref, poles,
     #                                 num_modes, num_poles)  # NlxNm
     # Fl = Fl1 + Fl2
-    Flgust = xloads.lags_rogergust(t, xgust, Flgust)  # NlxNm
     # jax.debug.breakpoint()
     Fl += Flgust
     # Fl = Fl_tensor.reshape(num_modes * num_poles
@@ -349,7 +494,7 @@ def dq_20g273(t, q, *args):
     q0 = q[states["q0"]]
     # ql_tensor = ql.reshape((num_modes, num_poles))
     eta_s = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
-    eta_gust = xloads.eta_rogergust(t, xgust, F1gust)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
     F1, F2 = common.f_12(omega, gamma1, gamma2, q1, q2)
     F1 += eta_s + eta_gust
     F1 += eta_0
@@ -357,7 +502,6 @@ def dq_20g273(t, q, *args):
     Fl = xloads.lags_rogerstructure(
         A3hat, q1, ql, u_inf, c_ref, poles, num_modes, num_poles
     )  # NlxNm
-    Flgust = xloads.lags_rogergust(t, xgust, Flgust)  # NlxNm
     Fl += Flgust
     F0 = q1
     # Fl = Fl_tensor.reshape(num_modes * num_poles
@@ -415,7 +559,7 @@ def dq_20g546(t, q, *args):
     
     # ql_tensor = ql.reshape((num_modes, num_poles))
     eta_s = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
-    eta_gust = xloads.eta_rogergust(t, xgust, F1gust)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
     F1, F2 = common.f_12(omega, gamma1, gamma2, q1, q2)
     F1 += eta_s + eta_gust
     F1 += eta_0
@@ -423,7 +567,6 @@ def dq_20g546(t, q, *args):
     Fl = xloads.lags_rogerstructure(
         A3hat, q1, ql, u_inf, c_ref, poles, num_modes, num_poles
     )  # NlxNm
-    Flgust = xloads.lags_rogergust(t, xgust, Flgust)  # NlxNm
     Fl += Flgust
     Fr = common.f_quaternion(phi1l, q1, qr)
     F0 = q1
@@ -669,7 +812,7 @@ def dq_20G546(t, q, *args):
     # no interpolation of gravity in dynamic case
     eta_gravity = xloads.eta_pointdead_const(phi1l, force_gravity[-1], Rab)
     eta_aero = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
-    eta_gust = xloads.eta_rogergust(t, xgust, F1gust)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
     F1, F2 = common.f_12(omega, gamma1, gamma2, q1, q2)
     F1 += eta_aero + eta_gravity + eta_gust
     F1 += eta_0
@@ -677,7 +820,6 @@ def dq_20G546(t, q, *args):
     # jax.debug.print("eta_aero: {eta_aero}", eta_aero=(eta_gust))
     # jax.debug.breakpoint()
     F1 = A2hatinv @ F1  # Nm
-    Flgust = xloads.lags_rogergust(t, xgust, Flgust)
     Fl = xloads.lags_rogerstructure(
         A3hat, q1, ql, u_inf, c_ref, poles, num_modes, num_poles
     )  # NlxNm
@@ -729,7 +871,7 @@ def dq_20G546l(t, q, *args):
     # no interpolation of gravity in dynamic case
     eta_gravity = xloads.eta_pointdead_const(phi1l, force_gravity[-1], C0ab)
     eta_aero = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
-    eta_gust = xloads.eta_rogergust(t, xgust, F1gust)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
     F1, F2 = common.f_12l(omega, q1, q2)
     F1 += eta_aero + eta_gravity + eta_gust
     F1 += eta_0
@@ -737,7 +879,6 @@ def dq_20G546l(t, q, *args):
     # jax.debug.print("eta_aero: {eta_aero}", eta_aero=(eta_gust))
     # jax.debug.breakpoint()
     F1 = A2hatinv @ F1  # Nm
-    Flgust = xloads.lags_rogergust(t, xgust, Flgust)
     Fl = xloads.lags_rogerstructure(
         A3hat, q1, ql, u_inf, c_ref, poles, num_modes, num_poles
     )  # NlxNm
@@ -748,6 +889,72 @@ def dq_20G546l(t, q, *args):
     return F
 
 
+def dq_20G4914(t, q, *args):
+    """Free flight with gravity forces and rigid body DoF, and gust
+    (minimum-state aerodynamics)"""
+
+    (
+        eta_0,
+        gamma1,
+        gamma2,
+        omega,
+        phi1l,
+        psi2l,
+        A0hat,
+        A1hat,
+        A2hatinv,
+        lags_Dhat,
+        lags_E,
+        u_inf,
+        c_ref,
+        poles,
+        xgust,
+        F1gust,
+        Flgust,
+        force_gravity,
+        states,
+        X_xdelta,
+        C0ab,
+        component_names,
+        num_nodes,
+        component_nodes,
+        component_father,
+    ) = args[0]
+
+    q1 = q[states["q1"]]
+    q2 = q[states["q2"]]
+    ql = q[states["ql"]]
+    q0 = q[states["q0"]]
+    qr = q[states["qr"]]
+
+    Rab = common.computeRab_node0(
+        psi2l,
+        q2,
+        qr,
+        X_xdelta,
+        C0ab,
+        component_names,
+        num_nodes,
+        component_nodes,
+        component_father,
+    )
+
+    # no interpolation of gravity in dynamic case
+    eta_gravity = xloads.eta_pointdead_const(phi1l, force_gravity[-1], Rab)
+    eta_aero = xloads.eta_karpelstruct(q0, q1, ql, A0hat, A1hat, lags_Dhat)
+    eta_gust, Flgust = xloads.rogergust(t, xgust, F1gust, Flgust)
+    F1, F2 = common.f_12(omega, gamma1, gamma2, q1, q2)
+    F1 += eta_aero + eta_gravity + eta_gust
+    F1 += eta_0
+    F1 = A2hatinv @ F1  # Nm
+    Fl = xloads.lags_karpelstructure(lags_E, q1, ql, u_inf, c_ref, poles)  # Nl
+    Fl += Flgust
+    Fr = common.f_quaternion(phi1l, q1, qr)
+    F0 = q1
+    F = jnp.hstack([F1, F2, Fl, F0, Fr])
+    return F
+
+
 # @jax.jit
 # @partial(jax.jit, static_argnames=['q'])
 # def dq_20g273(t, q, *args):
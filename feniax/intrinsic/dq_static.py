@@ -1,3 +1,4 @@
+import jax
 import jax.numpy as jnp
 import feniax.intrinsic.xloads as xloads
 import feniax.intrinsic.postprocess as postprocess
@@ -40,6 +41,45 @@ def dq_10G1(q, *args):
     return F
 
 
+def jac_10G1(q, *args):
+    """Jacobian of dq_10G1, the gravity term by forward AD."""
+
+    (
+        eta_0,
+        gamma2,
+        omega,
+        phi1l,
+        psi2l,
+        x,
+        force_gravity,
+        X_xdelta,
+        C0ab,
+        component_names,
+        num_nodes,
+        component_nodes,
+        component_father,
+        t,
+    ) = args[0]
+
+    def eta_gravity(q):
+        X3t = postprocess.compute_strains_t(psi2l, q)
+        Rab = postprocess.integrate_strainsCab(
+            jnp.eye(3),
+            X3t,
+            X_xdelta,
+            C0ab,
+            component_names,
+            num_nodes,
+            component_nodes,
+            component_father,
+        )
+        return xloads.eta_pointdead(t, phi1l, x, force_gravity, Rab)
+
+    J = jnp.diag(omega) - common.jac_contraction(gamma2, q)
+    J += jax.jacfwd(eta_gravity)(q)
+    return J
+
+
 def dq_10g11(q, *args):
     """Structural static with follower point forces."""
 
@@ -56,6 +96,14 @@ def dq_10g11(q, *args):
     return F
 
 
+def jac_10g11(q, *args):
+    """Jacobian of dq_10g11, follower forces do not depend on q."""
+
+    (eta_0, gamma2, omega, phi1, x, force_follower, t) = args[0]
+    J = jnp.diag(omega) - common.jac_contraction(gamma2, q)
+    return J
+
+
 def dq_10g121(q, *args):
     """Structural static with dead point forces."""
 
@@ -133,7 +181,11 @@ def dq_10G121(q, *args):
             component_father,
         )
         F = omega * q2 - common.contraction_gamma2(gamma2, q2)
-        F += xloads.eta_pointdead(t, phi1l, x, force_dead + force_gravity, Rab)
+        if isinstance(force_dead, xloads.PointLoads):
+            F += xloads.eta_pointdead(t, phi1l, x, force_dead, Rab)
+            F += xloads.eta_pointdead(t, phi1l, x, force_gravity, Rab)
+        else:
+            F += xloads.eta_pointdead(t, phi1l, x, force_dead + force_gravity, Rab)
         F += eta_0
         return F
 
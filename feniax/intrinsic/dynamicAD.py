@@ -4,6 +4,7 @@ from functools import partial
 import feniax.systems.sollibs as sollibs
 import feniax.intrinsic.ad_common as adcommon
 import feniax.intrinsic.gust as igust
+import feniax.intrinsic.aero as aero
 import feniax.intrinsic.couplings as couplings
 import feniax.intrinsic.dq_dynamic as dq_dynamic
 import feniax.systems.intrinsic_system as isys
@@ -47,8 +48,12 @@ def main_20g11_1(
         C06ab,
     ) = adcommon._compute_modes(X, Ka, Ma, reduced_eigenvals, reduced_eigenvecs, config)
 
-    gamma1 = couplings.f_gamma1(phi1, psi1)
-    gamma2 = couplings.f_gamma2(phi1ml, phi2l, psi2l, X_xdelta)
+    gamma1 = couplings.f_gamma1(
+        phi1, psi1, block_size=config.fem.couplings_blocksize
+    )
+    gamma2 = couplings.f_gamma2(
+        phi1ml, phi2l, psi2l, X_xdelta, block_size=config.fem.couplings_blocksize
+    )
     config.system.xloads.build_point_follower(config.fem.num_nodes, C06ab)
     x_forceinterpol = config.system.xloads.x
     y_forceinterpol = alpha * config.system.xloads.force_follower
@@ -79,6 +84,7 @@ def main_20g11_1(
         tn=config.system.tn,
         dt=config.system.dt,
         t=config.system.t,
+        adjoint=config.system.ad,
     )
     q = states_puller(sol)
 
@@ -151,8 +157,12 @@ def main_20g11_3(
         C06ab,
     ) = adcommon._compute_modes(X, Ka, Ma, reduced_eigenvals, reduced_eigenvecs, config)
 
-    gamma1 = couplings.f_gamma1(phi1, psi1)
-    gamma2 = couplings.f_gamma2(phi1ml, phi2l, psi2l, X_xdelta)
+    gamma1 = couplings.f_gamma1(
+        phi1, psi1, block_size=config.fem.couplings_blocksize
+    )
+    gamma2 = couplings.f_gamma2(
+        phi1ml, phi2l, psi2l, X_xdelta, block_size=config.fem.couplings_blocksize
+    )
     config.system.xloads.build_point_follower(config.fem.num_nodes, C06ab)
     x_forceinterpol = config.system.xloads.x
     y_forceinterpol = config.system.xloads.force_follower
@@ -183,6 +193,7 @@ def main_20g11_3(
         tn=config.system.tn,
         dt=config.system.dt,
         t=config.system.t,
+        adjoint=config.system.ad,
     )
     q = states_puller(sol)
 
@@ -260,39 +271,25 @@ def main_20g21_2(
         C06ab,
     ) = adcommon._compute_modes(X, Ka, Ma, reduced_eigenvals, reduced_eigenvecs, config)
     #################
-    gamma1 = couplings.f_gamma1(phi1, psi1)
-    gamma2 = couplings.f_gamma2(phi1ml, phi2l, psi2l, X_xdelta)
+    gamma1 = couplings.f_gamma1(
+        phi1, psi1, block_size=config.fem.couplings_blocksize
+    )
+    gamma2 = couplings.f_gamma2(
+        phi1ml, phi2l, psi2l, X_xdelta, block_size=config.fem.couplings_blocksize
+    )
 
     #################
-    A0 = config.system.aero.A[0]
-    A1 = config.system.aero.A[1]
-    A2 = config.system.aero.A[2]
-    A3 = config.system.aero.A[3:]
-    D0 = config.system.aero.D[0]
-    D1 = config.system.aero.D[1]
-    D2 = config.system.aero.D[2]
-    D3 = config.system.aero.D[3:]
     # u_inf = config.system.aero.u_inf
     # rho_inf = config.system.aero.rho_inf
-    q_inf = 0.5 * rho_inf * u_inf**2  # config.system.aero.q_inf
     c_ref = config.system.aero.c_ref
-    A0hat = q_inf * A0
-    A1hat = c_ref * rho_inf * u_inf / 4 * A1
-    A2hat = c_ref**2 * rho_inf / 8 * A2
-    A3hat = q_inf * A3
-    A2hatinv = jnp.linalg.inv(jnp.eye(len(A2hat)) - A2hat)
-    D0hat = q_inf * D0
-    D1hat = c_ref * rho_inf * u_inf / 4 * D1
-    D2hat = c_ref**2 * rho_inf / 8 * D2
-    D3hat = q_inf * D3
+    A0hat, A1hat, A2hat, A2hatinv, A3hat, D0hat, D1hat, D2hat, D3hat = aero.scale_roger(
+        config.system.aero.A, config.system.aero.D, c_ref, rho_inf, u_inf
+    )
     # gust_intensity = config.system.aero.gust.intensity
     # gust_length = config.system.aero.gust.length
-    gust_shift = config.system.aero.gust.shift
     gust_step = config.system.aero.gust.step
-    dihedral = config.system.aero.gust.panels_dihedral
     time = config.system.t
     collocation_points = config.system.aero.gust.collocation_points
-    gust_totaltime = config.system.aero.gust.totaltime
     xgust = config.system.aero.gust.x
     time = config.system.aero.gust.time
     ntime = config.system.aero.gust.ntime
@@ -317,26 +314,15 @@ def main_20g21_2(
     #     jnp.max(collocation_points[:,0])
     # )
     npanels = len(collocation_points)
-    fshape_span = igust._get_spanshape(config.system.aero.gust.shape)
-    gust, gust_dot, gust_ddot = igust._downwashRogerMc(
+    Q_wsum, Ql_wdot = igust.gust_forces(
+        config.system.aero.gust,
         u_inf,
         gust_length,
         gust_intensity,
-        gust_shift,
-        collocation_points,
-        dihedral,  # normals,
-        time,
-        gust_totaltime,
-        fshape_span,
-    )
-    Q_w, Q_wdot, Q_wddot, Q_wsum, Ql_wdot = igust._getGAFs(
-        D0hat,  # NbxNm
+        D0hat,
         D1hat,
         D2hat,
         D3hat,
-        gust,
-        gust_dot,
-        gust_ddot,
     )
     poles = config.system.aero.poles
     num_poles = config.system.aero.num_poles
@@ -379,6 +365,7 @@ def main_20g21_2(
         tn=config.system.tn,
         dt=config.system.dt,
         t=config.system.t,
+        adjoint=config.system.ad,
     )
     q = states_puller(sol)
 
@@ -464,36 +451,21 @@ def main_20g21_3(
         C06ab,
     ) = adcommon._compute_modes(X, Ka, Ma, reduced_eigenvals, reduced_eigenvecs, config)
     #################
-    gamma1 = couplings.f_gamma1(phi1, psi1)
-    gamma2 = couplings.f_gamma2(phi1ml, phi2l, psi2l, X_xdelta)
+    gamma1 = couplings.f_gamma1(
+        phi1, psi1, block_size=config.fem.couplings_blocksize
+    )
+    gamma2 = couplings.f_gamma2(
+        phi1ml, phi2l, psi2l, X_xdelta, block_size=config.fem.couplings_blocksize
+    )
 
     #################
-    A0 = config.system.aero.A[0]
-    A1 = config.system.aero.A[1]
-    A2 = config.system.aero.A[2]
-    A3 = config.system.aero.A[3:]
-    D0 = config.system.aero.D[0]
-    D1 = config.system.aero.D[1]
-    D2 = config.system.aero.D[2]
-    D3 = config.system.aero.D[3:]
     # u_inf = config.system.aero.u_inf
     # rho_inf = config.system.aero.rho_inf
-    q_inf = 0.5 * rho_inf * u_inf**2  # config.system.aero.q_inf
     c_ref = config.system.aero.c_ref
-    A0hat = q_inf * A0
-    A1hat = c_ref * rho_inf * u_inf / 4 * A1
-    A2hat = c_ref**2 * rho_inf / 8 * A2
-    A3hat = q_inf * A3
-    A2hatinv = jnp.linalg.inv(jnp.eye(len(A2hat)) - A2hat)
-    D0hat = q_inf * D0
-    D1hat = c_ref * rho_inf * u_inf / 4 * D1
-    D2hat = c_ref**2 * rho_inf / 8 * D2
-    D3hat = q_inf * D3
-    gust_shift = config.system.aero.gust.shift
-    dihedral = config.system.aero.gust.panels_dihedral
+    A0hat, A1hat, A2hat, A2hatinv, A3hat, D0hat, D1hat, D2hat, D3hat = aero.scale_roger(
+        config.system.aero.A, config.system.aero.D, c_ref, rho_inf, u_inf
+    )
     time = config.system.t
-    collocation_points = config.system.aero.gust.collocation_points
-    gust_totaltime = config.system.aero.gust.totaltime
     time = config.system.aero.gust.time
     # gust_totaltime, xgust, time, ntime, npanels = igust._get_gustRogerMc(
     #     gust_intensity,
@@ -515,26 +487,15 @@ def main_20g21_3(
     #     jnp.min(collocation_points[:,0]),
     #     jnp.max(collocation_points[:,0])
     # )
-    fshape_span = igust._get_spanshape(config.system.aero.gust.shape)
-    gust, gust_dot, gust_ddot = igust._downwashRogerMc(
+    Q_wsum, Ql_wdot = igust.gust_forces(
+        config.system.aero.gust,
         u_inf,
         gust_length,
         gust_intensity,
-        gust_shift,
-        collocation_points,
-        dihedral,  # normals,
-        time,
-        gust_totaltime,
-        fshape_span,
-    )
-    Q_w, Q_wdot, Q_wddot, Q_wsum, Ql_wdot = igust._getGAFs(
-        D0hat,  # NbxNm
+        D0hat,
         D1hat,
         D2hat,
         D3hat,
-        gust,
-        gust_dot,
-        gust_ddot,
     )
     poles = config.system.aero.poles
     num_poles = config.system.aero.num_poles
@@ -577,6 +538,7 @@ def main_20g21_3(
         tn=config.system.tn,
         dt=config.system.dt,
         t=config.system.t,
+        adjoint=config.system.ad,
     )
     q = states_puller(sol)
 
@@ -1,7 +1,7 @@
-import jax.numpy as jnp
 import jax
 from functools import partial
 import feniax.intrinsic.xloads as xloads
+import feniax.intrinsic.aero as aero
 import feniax.intrinsic.postprocess as postprocess
 import feniax.intrinsic.dq_common as common
 import feniax.systems.intrinsic_system as isys
@@ -26,15 +26,10 @@ def main_20g21_3(
     states = _dqargs[4]
     q1_index = states["q1"]
     q2_index = states["q2"]
-    collocation_points = config.system.aero.gust.collocation_points
     #xcollocation_points = collocation_points[:, 0]
     #xcollocation_min = min(xcollocation_points)
     #xcollocation_max = max(xcollocation_points)
-    gust_shift = config.system.aero.gust.shift
-    dihedral = config.system.aero.gust.panels_dihedral
-    fshape_span = igust._get_spanshape(config.system.aero.gust.shape)        
     # gust_totaltime = config.system.aero.gust.totaltime
-    time_gust = config.system.aero.gust.time
     # @jax.jit
     def _main_20g21_3(inp):
 
@@ -42,18 +37,14 @@ def main_20g21_3(
         u_inf = inp[1]
         gust_length = inp[2]
         gust_intensity = inp[3]
-        q_inf = 0.5 * rho_inf * u_inf**2
-        gust_totaltime = gust_length / u_inf
-        
-        A0hat = q_inf * A[0]
-        A1hat = c_ref * rho_inf * u_inf / 4 * A[1]
-        A2hat = c_ref**2 * rho_inf / 8 * A[2]
-        A3hat = q_inf * A[3:]
-        A2hatinv = jnp.linalg.inv(jnp.eye(len(A2hat)) - A2hat)
-        D0hat = q_inf * D[0]
-        D1hat = c_ref * rho_inf * u_inf / 4 * D[1]
-        D2hat = c_ref**2 * rho_inf / 8 * D[2]
-        D3hat = q_inf * D[3:]
+        A_i, D_i = A, D
+        if config.system.aero.mach_grid is not None:
+            A_i, D_i = aero.interpolate_mach(
+                inp[4], config.system.aero.mach_grid, (A, D)
+            )
+        A0hat, A1hat, A2hat, A2hatinv, A3hat, D0hat, D1hat, D2hat, D3hat = (
+            aero.scale_roger(A_i, D_i, c_ref, rho_inf, u_inf)
+        )
 
         # gust_totaltime, xgust, time_gust, ntime = intrinsicmodal.gust_discretisation(
         #     gust_intensity,
@@ -68,25 +59,15 @@ def main_20g21_3(
         # )
         
         #gust_totaltime = config.system.aero.gust.totaltime
-        gust, gust_dot, gust_ddot = igust._downwashRogerMc(
+        Q_wsum, Ql_wdot = igust.gust_forces(
+            config.system.aero.gust,
             u_inf,
             gust_length,
             gust_intensity,
-            gust_shift,
-            collocation_points,
-            dihedral,  # normals,
-            time_gust,
-            gust_totaltime,
-            fshape_span,
-        )
-        Q_w, Q_wdot, Q_wddot, Q_wsum, Ql_wdot = igust._getGAFs(
-            D0hat,  # NbxNm
+            D0hat,
             D1hat,
             D2hat,
             D3hat,
-            gust,
-            gust_dot,
-            gust_ddot,
         )
 
         # (
@@ -169,12 +150,7 @@ def main_20g546_3(
     # q1_index = states["q1"]
     # q2_index = states["q2"]
     
-    collocation_points = config.system.aero.gust.collocation_points
-    gust_shift = config.system.aero.gust.shift
-    dihedral = config.system.aero.gust.panels_dihedral
-    fshape_span = igust._get_spanshape(config.system.aero.gust.shape)        
     # gust_totaltime = config.system.aero.gust.totaltime
-    time_gust = config.system.aero.gust.time
     # @jax.jit
     def _main_20g546_3(inp):
 
@@ -182,38 +158,24 @@ def main_20g546_3(
         u_inf = inp[1]
         gust_length = inp[2]
         gust_intensity = inp[3]
-        q_inf = 0.5 * rho_inf * u_inf**2
-        gust_totaltime = gust_length / u_inf
-        
-        A0hat = q_inf * A[0]
-        A1hat = c_ref * rho_inf * u_inf / 4 * A[1]
-        A2hat = c_ref**2 * rho_inf / 8 * A[2]
-        A3hat = q_inf * A[3:]
-        A2hatinv = jnp.linalg.inv(jnp.eye(len(A2hat)) - A2hat)
-        D0hat = q_inf * D[0]
-        D1hat = c_ref * rho_inf * u_inf / 4 * D[1]
-        D2hat = c_ref**2 * rho_inf / 8 * D[2]
-        D3hat = q_inf * D[3:]
+        A_i, D_i = A, D
+        if config.system.aero.mach_grid is not None:
+            A_i, D_i = aero.interpolate_mach(
+                inp[4], config.system.aero.mach_grid, (A, D)
+            )
+        A0hat, A1hat, A2hat, A2hatinv, A3hat, D0hat, D1hat, D2hat, D3hat = (
+            aero.scale_roger(A_i, D_i, c_ref, rho_inf, u_inf)
+        )
 
-        gust, gust_dot, gust_ddot = igust._downwashRogerMc(
+        Q_wsum, Ql_wdot = igust.gust_forces(
+            config.system.aero.gust,
             u_inf,
             gust_length,
             gust_intensity,
-            gust_shift,
-            collocation_points,
-            dihedral,  # normals,
-            time_gust,
-            gust_totaltime,
-            fshape_span,
-        )
-        Q_w, Q_wdot, Q_wddot, Q_wsum, Ql_wdot = igust._getGAFs(
-            D0hat,  # NbxNm
+            D0hat,
             D1hat,
             D2hat,
             D3hat,
-            gust,
-            gust_dot,
-            gust_ddot,
         )
 
         args_inp = (c_ref,
@@ -575,7 +575,31 @@ def compute_Mfe_order(
     return jnp.array(M), jnp.array(M2)
 
 
+def _insert_sparse(A, positions):
+    """Inserts zero rows and columns in the scipy.sparse A
+
+    The positions are applied in order as those of jnp.insert, the
+    entries of A are only relabelled so nothing dense is built.
+    """
+    import scipy.sparse
+
+    index = np.arange(A.shape[0])
+    for pi in positions:
+        index = np.insert(index, pi, -1)
+    new_index = np.empty(A.shape[0], dtype=int)
+    new_index[index[index >= 0]] = np.flatnonzero(index >= 0)
+    A = A.tocoo()
+    return scipy.sparse.csr_array(
+        (A.data, (new_index[A.row], new_index[A.col])), shape=(len(index), len(index))
+    )
+
+
 def compute_Mconstrained(Ka, Ma, fe_order, clamped_nodes, clampedDoF):
+    if hasattr(Ka, "toarray"):  # scipy.sparse, kept sparse
+        positions = [
+            6 * fe_order[cni] + di for cni in clamped_nodes for di in clampedDoF[cni]
+        ]
+        return _insert_sparse(Ka, positions), _insert_sparse(Ma, positions)
     Ka2 = Ka.copy()
     Ma2 = Ma.copy()
     for cni in clamped_nodes:
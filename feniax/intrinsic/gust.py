@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 import jax.numpy as jnp
 import jax
+import numpy as np
+import feniax.intrinsic.xloads as xloads
 from feniax.intrinsic.utils import Registry
 import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
 import feniax.preprocessor.solution as solution
@@ -160,13 +162,130 @@ def _getGAFs(
     return Q_w, Q_wdot, Q_wddot, Q_wsum, Ql_wdot
 
 
+def num_panels_window(collocation_points, gust_length) -> int:
+    """Largest number of panels inside a gust of length gust_length at once"""
+
+    x = np.sort(np.asarray(collocation_points)[:, 0])
+    last = np.searchsorted(x, x + gust_length * (1 + 1e-9), side="right")
+    # one more for round-off of the delays in time
+    return min(len(x), int(np.max(last - np.arange(len(x)))) + 1)
+
+
+def kernelRogerMc(
+    u_inf,
+    gust_length,
+    gust_intensity,
+    gust_shift,
+    collocation_points,
+    normals,
+    fshape_span,
+    D0hat,
+    D1hat,
+    D2hat,
+    D3hat,
+    num_window=None,
+) -> xloads.GustKernel:
+    """1-cos gust to be evaluated in the RHS (see xloads.eta_gustkernel)
+
+    Holds the same quantities as _downwashRogerMc but no time
+    discretisation. num_window bounds the panels evaluated at each time
+    (num_panels_window), all of them if None (when the gust length is
+    traced).
+    """
+
+    order = jnp.argsort(collocation_points[:, 0])
+    points = collocation_points[order]
+    shape_span = jax.vmap(lambda y: fshape_span(y) * jnp.ones(()))(points[:, 1])
+    if num_window is None:
+        num_window = len(points)
+    return xloads.GustKernel(
+        delay=(points[:, 0] + gust_shift) / u_inf,
+        amplitude=shape_span * normals[order] * gust_intensity / (u_inf * 2),
+        coeff=2.0 * jnp.pi * u_inf / gust_length,
+        totaltime=gust_length / u_inf,
+        D0hat=D0hat[:, order],
+        D1hat=D1hat[:, order],
+        D2hat=D2hat[:, order],
+        D3hat=D3hat[:, :, order],
+        window=jnp.arange(num_window),
+    )
+
+
+def gust_forces(
+    settings: intrinsicmodal.DGustMc,
+    u_inf,
+    gust_length,
+    gust_intensity,
+    D0hat,
+    D1hat,
+    D2hat,
+    D3hat,
+    num_window=None,
+    full_output=False,
+):
+    """1-cos gust forcing of the Roger equations, (Q_wsum, Ql_wdot)
+
+    A kernel evaluated in the RHS (kernelRogerMc, Ql_wdot None) if
+    settings.analytic, else the GAFs of the downwash tabulated at
+    settings.time. With full_output the downwash and its GAFs, (w, wdot,
+    wddot, Q_w, Q_wdot, Q_wddot), are returned too, None for the
+    analytic gust.
+    """
+
+    fshape_span = _get_spanshape(settings.shape)
+    if settings.analytic:
+        Q_wsum = kernelRogerMc(
+            u_inf,
+            gust_length,
+            gust_intensity,
+            settings.shift,
+            settings.collocation_points,
+            settings.panels_dihedral,  # normals
+            fshape_span,
+            D0hat,
+            D1hat,
+            D2hat,
+            D3hat,
+            num_window,
+        )
+        Ql_wdot = None
+        tables = (None,) * 6
+    else:
+        gust, gust_dot, gust_ddot = _downwashRogerMc(
+            u_inf,
+            gust_length,
+            gust_intensity,
+            settings.shift,
+            settings.collocation_points,
+            settings.panels_dihedral,  # normals
+            settings.time,
+            gust_length / u_inf,
+            fshape_span,
+        )
+        Q_w, Q_wdot, Q_wddot, Q_wsum, Ql_wdot = _getGAFs(
+            D0hat,  # NbxNm
+            D1hat,
+            D2hat,
+            D3hat,
+            gust,
+            gust_dot,
+            gust_ddot,
+        )
+        tables = (gust, gust_dot, gust_ddot, Q_w, Q_wdot, Q_wddot)
+    if full_output:
+        return (Q_wsum, Ql_wdot), tables
+    return Q_wsum, Ql_wdot
+
+
 @Registry.register("GustRogerMc")
 class GustRogerMc(Gust):
     def __init__(
         self, settings: intrinsicmodal.Dsystem, sol: solution.IntrinsicSolution
     ):
         self.settings = settings
-        self.solaero = getattr(sol.data, f"modalaeroroger_{settings.name}")
+        self.solaero = getattr(
+            sol.data, f"modalaero{settings.aero.approx.lower()}_{settings.name}"
+        )
         self.gust = None
         self.gust_dot = None
         self.gust_ddot = None
@@ -267,20 +386,26 @@ class GustRogerMc(Gust):
         """
         NpxNt panel downwash in time
         """
-        self.gust, self.gust_dot, self.gust_ddot = _downwashRogerMc(
+        (self.Q_wsum, self.Ql_wdot), (
+            self.gust,
+            self.gust_dot,
+            self.gust_ddot,
+            self.Q_w,
+            self.Q_wdot,
+            self.Q_wddot,
+        ) = gust_forces(
+            self.settings.aero.gust,
             self.u_inf,
             self.gust_length,
             self.gust_intensity,
-            self.gust_shift,
-            self.collocation_points,
-            self.normals,
-            self.time,
-            self.gust_totaltime,
-            self.fshape_span,
+            self.solaero.D0hat,
+            self.solaero.D1hat,
+            self.solaero.D2hat,
+            self.solaero.D3hat,
+            num_panels_window(self.collocation_points, self.gust_length),
+            full_output=True,
         )
 
-        self._define_eta()
-
     def calculate_normals(self):
         if self.dihedral is not None:
             self.normals = self.dihedral
@@ -314,3 +439,11 @@ class GustRogerMc(Gust):
             self.gust_dot,
             self.gust_ddot,
         )
+
+
+@Registry.register("GustKarpelMc")
+class GustKarpelMc(GustRogerMc):
+    """
+    1-cos gust on the minimum-state lags, D3hat being the 1xNlxNb gust
+    lag matrix so Qhjl_wdot holds the Nl lag forcing
+    """
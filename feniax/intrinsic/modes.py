@@ -5,7 +5,10 @@ import jax
 import jax.numpy as jnp
 import numpy as np
 import scipy
+import scipy.sparse
+import scipy.sparse.linalg
 from jax import jit
+from jax.experimental import sparse as jsparse
 
 import feniax.intrinsic.couplings as couplings
 from feniax.intrinsic.functions import compute_C0ab, coordinate_transform, tilde
@@ -166,6 +169,56 @@ def compute_eigs_scipy(
     return reduced_eigenvals, reduced_eigenvecs
 
 
+def compute_eigs_sparse(
+    Ka: jnp.ndarray | scipy.sparse.sparray,
+    Ma: jnp.ndarray | scipy.sparse.sparray,
+    num_modes: int,
+    *args,
+    sigma: float = -1.0,
+    **kwargs,
+) -> (jnp.ndarray, jnp.ndarray):
+    """Lowest eigen-pairs from shift-invert Lanczos.
+
+    Only the ``num_modes`` eigenvalues closest to ``sigma`` are computed,
+    which for a negative shift are the lowest ones. The negative shift
+    keeps Ka - sigma*Ma positive definite when rigid-body modes are present.
+
+    Parameters
+    ----------
+    Ka : jnp.ndarray | scipy.sparse.sparray
+        Condensed stiffness matrix (dense, scipy.sparse or banded as
+        scipy.sparse.dia_array)
+    Ma : jnp.ndarray | scipy.sparse.sparray
+        Condensed mass matrix
+    num_modes : int
+        Number of modes
+    sigma : float
+        Shift in the spectral transformation
+
+    """
+
+    Ka = scipy.sparse.csc_array(Ka if scipy.sparse.issparse(Ka) else np.asarray(Ka))
+    Ma = scipy.sparse.csc_array(Ma if scipy.sparse.issparse(Ma) else np.asarray(Ma))
+    if num_modes >= Ka.shape[0]:
+        # Lanczos needs num_modes < DoF, full spectrum from the dense solver
+        return compute_eigs_scipy(Ka.toarray(), Ma.toarray(), num_modes)
+    eigenvals, eigenvecs = scipy.sparse.linalg.eigsh(
+        Ka, k=num_modes, M=Ma, sigma=sigma, which="LM"
+    )
+    order = np.argsort(eigenvals)
+    reduced_eigenvals = jnp.array(eigenvals[order])
+    reduced_eigenvecs = jnp.array(eigenvecs[:, order])
+    return reduced_eigenvals, reduced_eigenvecs
+
+
+def to_bcoo(A):
+    """Converts scipy.sparse matrices into jax BCOO so they can be jitted."""
+
+    if scipy.sparse.issparse(A):
+        return jsparse.BCOO.from_scipy_sparse(A)
+    return A
+
+
 def compute_eigs_load(
     num_modes: int, path: pathlib.Path, eig_names: list[str], *args, **kwargs
 ) -> (jnp.ndarray, jnp.ndarray):
@@ -222,7 +275,10 @@ def shapes(
     # Define mode components in the initial local-frame
     phi1l = coordinate_transform(phi1, C06ab, precision)  # effectively doing C0ba*phi1
     phi1ml = coordinate_transform(phi1m, C06ab, precision)
-    _psi1 = jnp.matmul(Ma, eigenvecs, precision=precision)
+    if isinstance(Ma, jsparse.BCOO):
+        _psi1 = Ma @ eigenvecs
+    else:
+        _psi1 = jnp.matmul(Ma, eigenvecs, precision=precision)
     _psi1 = jnp.matmul(config.fem.Mfe_order, _psi1, precision=precision)
     psi1 = reshape_modes(_psi1, num_modes, num_nodes)
     psi1l = coordinate_transform(psi1, C06ab, precision=precision)
@@ -233,18 +289,18 @@ def shapes(
     _phi2 = reshape_modes(nodal_force, num_modes, num_nodes)  # (Nmx6xNn)
     #  Note: _phi2 are forces at the Nodes due to deformed shape, phi2 are internal forces
     #  as the sum of _phi2 along load-paths
-    X3 = coordinates_difftensor(X, config.fem.Xm, precision)  # (3xNnxNn)
-    X3tilde = -axis_tilde(X3)  # (6x6xNnxNn)
-    _moments_force = moment_force(_phi2, X3tilde, precision)  # (Nmx6xNnxNn)
-    moments_force = contraction(
-        _moments_force, config.fem.Mload_paths, precision
-    )  # (Nmx6xNn)
-    # Sum all forces in the load-path from the present node to the free-ends
-    # Each column in config.fem.Mload_paths represents the nodes to sum through
-    phi2 = jnp.tensordot(
-        _phi2, config.fem.Mload_paths, axes=(2, 0), precision=precision
-    )
-    phi2 += moments_force
+    if config.fem.phi2_recovery == "dense":
+        phi2 = internalforces_dense(
+            _phi2, X, config.fem.Xm, config.fem.Mload_paths, precision
+        )
+    else:
+        phi2 = internalforces_loadpaths(
+            _phi2,
+            X,
+            config.fem.Xm,
+            config.fem.component_nodes,
+            config.fem.component_chain,
+        )
     phi2l = coordinate_transform(phi2, C06ab, precision=precision)
     ematt_phi1 = ephi(config.const.EMAT, phi1ml, precision)
     phi1_diff = jnp.tensordot(phi1, config.fem.Mdiff, axes=(2, 0), precision=precision)
@@ -267,6 +323,133 @@ def shapes(
     )
 
 
+def internalforces_dense(
+    nodal_force: jnp.ndarray,
+    X: jnp.ndarray,
+    Xm: jnp.ndarray,
+    Mload_paths: jnp.ndarray,
+    precision,
+) -> jnp.ndarray:
+    """Internal forces from the nodal forces using the full load-path tensors
+
+    Builds the (Nmx6xNnxNn) moments of every nodal force about every
+    mid-point and contracts them with Mload_paths. Memory is O(Nm·Nn²),
+    kept as the reference implementation.
+
+    Parameters
+    ----------
+    nodal_force : jnp.ndarray
+        Forces at the nodes due to the deformed shape (Nmx6xNn)
+    X : jnp.ndarray
+        Grid coordinates (3xNn)
+    Xm : jnp.ndarray
+        Grid coordinates mid-points (3xNn)
+    Mload_paths : jnp.ndarray
+        Load paths matrix (NnxNn)
+
+    Returns
+    -------
+    jnp.ndarray
+        Internal forces (Nmx6xNn)
+
+    """
+
+    X3 = coordinates_difftensor(X, Xm, precision)  # (3xNnxNn)
+    X3tilde = -axis_tilde(X3)  # (6x6xNnxNn)
+    _moments_force = moment_force(nodal_force, X3tilde, precision)  # (Nmx6xNnxNn)
+    moments_force = contraction(_moments_force, Mload_paths, precision)  # (Nmx6xNn)
+    # Sum all forces in the load-path from the present node to the free-ends
+    # Each column in Mload_paths represents the nodes to sum through
+    internal_force = jnp.tensordot(
+        nodal_force, Mload_paths, axes=(2, 0), precision=precision
+    )
+    internal_force += moments_force
+    return internal_force
+
+
+def loadpaths_sum(
+    field: jnp.ndarray,
+    component_nodes: dict[str : list[int]],
+    component_chain: dict[str : list[str]],
+) -> jnp.ndarray:
+    """Sums a nodal field from the free-ends to each node
+
+    Equivalent to jnp.tensordot(field, Mload_paths, axes=(-1, 0)) but
+    traversing the tree instead: a reverse cumulative sum along each
+    component plus the totals of all the components down its chain.
+
+    Parameters
+    ----------
+    field : jnp.ndarray
+        Nodal field with the nodes in the last axis (...xNn)
+    component_nodes : dict[str:list[int]]
+        Node indexes of each component
+    component_chain : dict[str:list[str]]
+        Map between each component and all its children
+
+    Returns
+    -------
+    jnp.ndarray
+        Field accumulated along the load paths (...xNn)
+
+    """
+
+    tails = dict()
+    for ci, nodes_i in component_nodes.items():
+        field_i = field[..., jnp.array(nodes_i)]
+        tails[ci] = jnp.flip(jnp.cumsum(jnp.flip(field_i, -1), axis=-1), -1)
+    field_sum = jnp.zeros_like(field)
+    for ci, nodes_i in component_nodes.items():
+        tail_i = tails[ci]
+        for ck in set(component_chain[ci]):
+            tail_i += tails[ck][..., :1]
+        field_sum = field_sum.at[..., jnp.array(nodes_i)].set(tail_i)
+    # first node collects the full structure
+    field_sum = field_sum.at[..., 0].set(jnp.sum(field, axis=-1))
+    return field_sum
+
+
+def internalforces_loadpaths(
+    nodal_force: jnp.ndarray,
+    X: jnp.ndarray,
+    Xm: jnp.ndarray,
+    component_nodes: dict[str : list[int]],
+    component_chain: dict[str : list[str]],
+) -> jnp.ndarray:
+    """Internal forces from the nodal forces accumulated along the load paths
+
+    Same result as internalforces_dense with O(Nm·Nn) memory; the
+    moment at mid-point i is written as the sum of X_j x F_j minus
+    Xm_i x (sum of F_j), both sums taken along the load paths.
+
+    Parameters
+    ----------
+    nodal_force : jnp.ndarray
+        Forces at the nodes due to the deformed shape (Nmx6xNn)
+    X : jnp.ndarray
+        Grid coordinates (3xNn)
+    Xm : jnp.ndarray
+        Grid coordinates mid-points (3xNn)
+    component_nodes : dict[str:list[int]]
+        Node indexes of each component
+    component_chain : dict[str:list[str]]
+        Map between each component and all its children
+
+    Returns
+    -------
+    jnp.ndarray
+        Internal forces (Nmx6xNn)
+
+    """
+
+    force_sum = loadpaths_sum(nodal_force, component_nodes, component_chain)
+    Xforce = jnp.cross(X[None, ...], nodal_force[:, :3], axis=1)  # (Nmx3xNn)
+    Xforce_sum = loadpaths_sum(Xforce, component_nodes, component_chain)
+    moments_force = Xforce_sum - jnp.cross(Xm[None, ...], force_sum[:, :3], axis=1)
+    internal_force = force_sum.at[:, 3:].add(moments_force)
+    return internal_force
+
+
 def scale(
     phi1: jnp.ndarray,
     psi1: jnp.ndarray,
@@ -344,6 +527,11 @@ def scale(
 def check_alphas(phi1, psi1, phi2l, psi2l, X_xdelta, tolerance, *args, **kwargs):
     alpha1 = couplings.f_alpha1(phi1, psi1)
     alpha2 = couplings.f_alpha2(phi2l, psi2l, X_xdelta)
+    assert_alphas(alpha1, alpha2, tolerance)
+    return alpha1, alpha2
+
+
+def assert_alphas(alpha1, alpha2, tolerance):
     alpha2_diagonal = alpha2.diagonal()
     # filter for rigid-body modes
     alpha2d_filtered = jnp.where(jnp.abs(alpha2_diagonal) > 1e-4, alpha2_diagonal, 1.0)
@@ -356,7 +544,6 @@ def check_alphas(phi1, psi1, phi2l, psi2l, X_xdelta, tolerance, *args, **kwargs)
     assert jnp.allclose(
         alpha2_new, Inm, **tolerance
     ), f"Alpha2 not equal to Identity: Alpha2: {alpha2}"
-    return alpha1, alpha2
 
 
 @jit
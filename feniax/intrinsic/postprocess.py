@@ -47,8 +47,23 @@ def strains_ra(): ...
 
 @jax.jit
 def integrate_node0(X1, dt, ra_n0, Rab_n0):
+    """Position and rotation of the first node from its velocities
+
+    Parameters
+    ----------
+    X1 : jnp.ndarray
+        Velocities of the node at the saved times, (tn, 6)
+    dt : float | jnp.ndarray
+        Time step, constant or per interval between saved times (tn - 1)
+    ra_n0 : jnp.ndarray
+        Initial position
+    Rab_n0 : jnp.ndarray
+        Initial rotation matrix
+
+    """
+    dt = jnp.broadcast_to(jnp.asarray(dt, dtype=X1.dtype), (len(X1) - 1,))
     v_average = (X1[:-1, :3] + X1[1:, :3]) / 2
-    theta_average = (X1[:-1, 3:6] + X1[1:, 3:6]) / 2 * dt
+    theta_average = (X1[:-1, 3:6] + X1[1:, 3:6]) / 2 * dt[:, None]
     theta_norm = jnp.linalg.norm(theta_average, axis=1)
     theta = jnp.hstack(
         [theta_average, theta_norm.reshape((theta_norm.shape[0], 1)), v_average]
@@ -56,17 +71,18 @@ def integrate_node0(X1, dt, ra_n0, Rab_n0):
     init = jnp.vstack([Rab_n0, ra_n0])
 
     def integrate(carry, x):
-        thetai_average = x[:3]
-        thetai_norm = x[3]
-        vi_average = x[4:]
+        xi, dti = x
+        thetai_average = xi[:3]
+        thetai_norm = xi[3]
+        vi_average = xi[4:]
         Rab0 = carry[:3]
         ra0 = carry[3]
         Rab1 = Rab0 @ H0(thetai_norm, thetai_average)
-        ra1 = ra0 + Rab0 @ H1(thetai_norm, thetai_average, dt) @ vi_average
+        ra1 = ra0 + Rab0 @ H1(thetai_norm, thetai_average, dti) @ vi_average
         out = jnp.vstack([Rab1, ra1])
         return out, out
 
-    last_carry, y = jax.lax.scan(integrate, init, theta)
+    last_carry, y = jax.lax.scan(integrate, init, (theta, dt))
     Rab = jnp.vstack([Rab_n0.reshape((1, 3, 3)), y[:, :3]])
     ra = jnp.vstack([ra_n0, y[:, 3]])
     return Rab, ra
@@ -52,7 +52,9 @@ def main_10g11_1(
     ) = adcommon._compute_modes(X, Ka, Ma, reduced_eigenvals, reduced_eigenvecs, config)
 
     # gamma1 = couplings.f_gamma1(phi1, psi1)
-    gamma2 = couplings.f_gamma2(phi1ml, phi2l, psi2l, X_xdelta)
+    gamma2 = couplings.f_gamma2(
+        phi1ml, phi2l, psi2l, X_xdelta, block_size=config.fem.couplings_blocksize
+    )
     eta0 = jnp.zeros(config.fem.num_modes)
     config.system.xloads.build_point_follower(config.fem.num_nodes, C06ab)
     x_forceinterpol = config.system.xloads.x
@@ -130,7 +132,9 @@ def main_10g11_3(
     ) = adcommon._compute_modes(X, Ka, Ma, reduced_eigenvals, reduced_eigenvecs, config)
 
     # gamma1 = couplings.f_gamma1(phi1, psi1)
-    gamma2 = couplings.f_gamma2(phi1ml, phi2l, psi2l, X_xdelta)
+    gamma2 = couplings.f_gamma2(
+        phi1ml, phi2l, psi2l, X_xdelta, block_size=config.fem.couplings_blocksize
+    )
     eta0 = jnp.zeros(config.fem.num_modes)
     config.system.xloads.build_point_follower(config.fem.num_nodes, C06ab)
     x_forceinterpol = config.system.xloads.x
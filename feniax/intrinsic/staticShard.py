@@ -2,6 +2,7 @@ import jax.numpy as jnp
 import jax
 from functools import partial
 import feniax.intrinsic.xloads as xloads
+import feniax.intrinsic.aero as aero
 import feniax.intrinsic.postprocess as postprocess
 import feniax.intrinsic.dq_common as common
 import feniax.systems.intrinsic_system as isys
@@ -67,8 +68,14 @@ def main_10g15_2(
     def _main_10g15_2(inp):
 
         q_inf = 0.5 * inp[0] * inp[1]**2
-        A0hat = A0 * q_inf
-        C0hat = C0* q_inf
+        A0_i, C0_i = A0, C0
+        if config.system.aero.mach_grid is not None:
+            mach_grid = config.system.aero.mach_grid
+            (A0_i,) = aero.interpolate_mach(inp[3], mach_grid, (A0,))
+            if C0.ndim == 3:  # Q0_rigid also stacked over the Mach grid
+                (C0_i,) = aero.interpolate_mach(inp[3], mach_grid, (C0,))
+        A0hat = A0_i * q_inf
+        C0hat = C0_i * q_inf
         dq_args = _dqargs + (A0hat, C0hat)
         q = _solve(
             newton, dq_static.dq_10g15, t_loads, q0, dq_args, config.system.solver_settings
@@ -1,6 +1,8 @@
 import jax.numpy as jnp
 import jax
+import numpy as np
 from functools import partial
+from typing import NamedTuple
 import feniax.intrinsic.functions as functions
 import itertools
 import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
@@ -38,83 +40,177 @@ def redirect_to(another_function):
 #     return f_interpol
 
 
-@jax.jit
-def linear_interpolation(t, x, data_tensor):
+def interpolation_index(t, x):
+    """Segment of the grid x containing t and the weight of its upper end
+
+    The segment is first guessed assuming a uniform grid (O(1) index
+    arithmetic) and only if t falls outside of it the grid is searched
+    with searchsorted (O(log N)). Times outside the grid are clamped to
+    its ends. The weight is differentiable with respect to t.
+
+    Parameters
+    ----------
+    t : float
+        Interpolation time
+    x : jax.Array
+        Increasing interpolation grid, at least two points
+
+    Returns
+    -------
+    tuple
+        Index of the lower end of the segment and weight in [0, 1]
+
+    """
+
     len_x = x.shape[0]
-    xindex_upper = jnp.argwhere(
-        jax.lax.select(x >= t, jnp.ones(len_x), jnp.zeros(len_x)), size=1
-    )[0][0]  # jnp.where(x >= t)[0][0]
-    index_equal = jnp.sum(
-        jax.lax.select(x == t, jnp.ones(len_x), jnp.zeros(len_x)), dtype=int
+    dx = (x[-1] - x[0]) / (len_x - 1)
+    guess = jnp.clip(jnp.floor((t - x[0]) / dx).astype(int), 0, len_x - 2)
+    found = (
+        ((x[guess] <= t) & (t <= x[guess + 1])) | (t <= x[0]) | (t >= x[-1])
     )
-    xindex_lower = xindex_upper - 1 + index_equal  # jnp.where(x <= t)[0][-1]
-    x_upper = x[xindex_upper]
-    x_lower = x[xindex_lower]
-    weight_upper = jax.lax.select(
-        xindex_upper == xindex_lower, 0.5, (t - x_lower) / (x_upper - x_lower)
+    index = jax.lax.cond(
+        found,
+        lambda: guess,
+        lambda: jnp.clip(
+            jnp.searchsorted(x, t, side="right") - 1, 0, len_x - 2
+        ).astype(guess.dtype),
     )
-    weight_lower = jax.lax.select(
-        xindex_upper == xindex_lower, 0.5, (x_upper - t) / (x_upper - x_lower)
+    x_lower = x[index]
+    x_upper = x[index + 1]
+    dx_index = jnp.where(x_upper > x_lower, x_upper - x_lower, 1.0)
+    weight = (t - x_lower) / dx_index
+    # (no clip, which splits the derivative at the grid points)
+    weight = jnp.where(t < x[0], 0.0, jnp.where(t > x[-1], 1.0, weight))
+    return index, weight
+
+
+def interpolate(index, weight, data_tensor, axis: int = 0):
+    """Linear interpolation of data_tensor along axis at interpolation_index"""
+
+    f_lower = jax.lax.dynamic_index_in_dim(data_tensor, index, axis, keepdims=False)
+    f_upper = jax.lax.dynamic_index_in_dim(
+        data_tensor, index + 1, axis, keepdims=False
     )
+    return f_lower + weight * (f_upper - f_lower)
+
 
-    f_upper = data_tensor[xindex_upper]
-    f_lower = data_tensor[xindex_lower]
-    f_interpol = weight_upper * f_upper + weight_lower * f_lower
+@partial(jax.jit, static_argnames=["axes"])
+def interpolate_tables(t, x, data_tensors: tuple, axes: tuple = None) -> tuple:
+    """Interpolates at t several tables sharing the grid x
+
+    The segment of x is found once for all of them.
+
+    Parameters
+    ----------
+    t : float
+    x : jax.Array
+        Interpolation grid
+    data_tensors : tuple
+        Tables, each with len(x) entries along its axis in axes
+    axes : tuple
+        Interpolation axis of each table, 0 for all if None
+
+    """
+
+    if axes is None:
+        axes = (0,) * len(data_tensors)
+    index, weight = interpolation_index(t, x)
+    return tuple(
+        interpolate(index, weight, data_i, axis_i)
+        for data_i, axis_i in zip(data_tensors, axes)
+    )
+
+
+@jax.jit
+def linear_interpolation(t, x, data_tensor):
+    (f_interpol,) = interpolate_tables(t, x, (data_tensor,), axes=(0,))
     return f_interpol
 
 
 @jax.jit
 def linear_interpolation2(t, x, data_tensor):
-    len_x = x.shape[0]
-    xindex_upper = jnp.argwhere(
-        jax.lax.select(x >= t, jnp.ones(len_x), jnp.zeros(len_x)), size=1
-    )[0][0]  # jnp.where(x >= t)[0][0]
-    index_equal = jnp.sum(
-        jax.lax.select(x == t, jnp.ones(len_x), jnp.zeros(len_x)), dtype=int
-    )
-    xindex_lower = xindex_upper - 1 + index_equal  # jnp.where(x <= t)[0][-1]
-    x_upper = x[xindex_upper]
-    x_lower = x[xindex_lower]
-    weight_upper = jax.lax.select(
-        xindex_upper == xindex_lower, 0.5, (t - x_lower) / (x_upper - x_lower)
-    )
-    weight_lower = jax.lax.select(
-        xindex_upper == xindex_lower, 0.5, (x_upper - t) / (x_upper - x_lower)
-    )
-
-    f_upper = data_tensor[:, :, xindex_upper]
-    f_lower = data_tensor[:, :, xindex_lower]
-    f_interpol = weight_upper * f_upper + weight_lower * f_lower
+    (f_interpol,) = interpolate_tables(t, x, (data_tensor,), axes=(2,))
     return f_interpol
 
 
 @jax.jit
 def linear_interpolation3(t, x, data_tensor):
-    len_x = x.shape[0]
-    xindex_upper = jnp.argwhere(
-        jax.lax.select(x >= t, jnp.ones(len_x), jnp.zeros(len_x)), size=1
-    )[0][0]  # jnp.where(x >= t)[0][0]
-    index_equal = jnp.sum(
-        jax.lax.select(x == t, jnp.ones(len_x), jnp.zeros(len_x)), dtype=int
-    )
-    xindex_lower = xindex_upper - 1 + index_equal  # jnp.where(x <= t)[0][-1]
-    x_upper = x[xindex_upper]
-    x_lower = x[xindex_lower]
-    weight_upper = jax.lax.select(
-        xindex_upper == xindex_lower, 0.5, (t - x_lower) / (x_upper - x_lower)
-    )
-    weight_lower = jax.lax.select(
-        xindex_upper == xindex_lower, 0.5, (x_upper - t) / (x_upper - x_lower)
+    (f_interpol,) = interpolate_tables(t, x, (data_tensor,), axes=(1,))
+    return f_interpol
+
+
+class PointLoads(NamedTuple):
+    """Point forces kept only at the loaded nodes
+
+    Used in place of the dense (len(x)x6xnum_nodes) force tables by the
+    eta_point* functions, which then rotate and project the forces of
+    these nodes only.
+
+    Attributes
+    ----------
+    index : jax.Array
+        Loaded nodes (Nk)
+    phi1 : jax.Array
+        Modal projection at the loaded nodes, phi1l[:, :, index] (Nmx6xNk)
+    force : jax.Array
+        Forces at the loaded nodes (len(x)x6xNk)
+
+    """
+
+    index: jnp.ndarray
+    phi1: jnp.ndarray
+    force: jnp.ndarray
+
+
+def sparse_point_forces(x, points, interpolation, C06ab=None) -> tuple:
+    """Point forces at the loaded nodes only
+
+    As build_point_follower (C06ab given) or build_point_dead but without
+    the dense (len(x)x6xnum_nodes) table.
+
+    Parameters
+    ----------
+    x : jax.Array
+        Interpolation grid
+    points : list
+        [node, component] of each force
+    interpolation : list
+        Values of each force along x
+    C06ab : jax.Array
+        Follower forces rotated by it at the loaded nodes if given
+
+    Returns
+    -------
+    tuple
+        Loaded nodes (Nk) and their forces (len(x)x6xNk)
+
+    """
+
+    points = np.asarray(points)
+    index, nodes = np.unique(points[:, 0], return_inverse=True)
+    force = jnp.zeros((len(x), 6, len(index)))
+    force = force.at[:, points[:, 1], nodes.reshape(-1)].set(
+        jnp.asarray(interpolation).T
     )
+    if C06ab is not None:
+        force = functions.coordinate_transform(force, C06ab[:, :, index])
+    return jnp.array(index), force
 
-    f_upper = data_tensor[:, xindex_upper]
-    f_lower = data_tensor[:, xindex_lower]
-    f_interpol = weight_upper * f_upper + weight_lower * f_lower
-    return f_interpol
+
+def point_loads(force, index, phi1):
+    """PointLoads of the forces at the nodes in index, or the dense force
+    table if index is None"""
+
+    if index is None:
+        return force
+    return PointLoads(index=index, phi1=phi1[:, :, index], force=force)
 
 
 @jax.jit
 def eta_pointfollower(t, phi1, x, force_follower):
+    if isinstance(force_follower, PointLoads):
+        phi1 = force_follower.phi1
+        force_follower = force_follower.force
     f = linear_interpolation(t, x, force_follower)
     eta = jnp.tensordot(phi1, f, axes=([1, 2], [0, 1]))
     return eta
@@ -130,6 +226,10 @@ def eta_pointdead(t, phi1, x, force_dead, Rab):
         in_axes=(2, 1),
         out_axes=1,
     )
+    if isinstance(force_dead, PointLoads):
+        Rab = Rab[:, :, force_dead.index]
+        phi1 = force_dead.phi1
+        force_dead = force_dead.force
     f = linear_interpolation(t, x, force_dead)
     f_fd = f1(Rab, f)
     eta = jnp.tensordot(phi1, f_fd, axes=([1, 2], [0, 1]))
@@ -174,15 +274,12 @@ def eta_pointdead_const(phi1, f, Rab):
 
 # @partial(jax.jit, static_argnames=["num_modes", "num_poles"])
 def eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles):
+    """Roger aerodynamic forces, with the lag states ql as NpxNm"""
+
     eta0 = A0hat @ q0 + A1hat @ q1
     num_modes = len(q0)
-    num_poles = int(len(ql) / num_modes)
-    # lags = jnp.tensordot(A2hat, ql_tensor, axis=(1,0))
-    lags_sum = ql[:num_modes]
-    for pi in range(1, num_poles):
-        lags_sum += ql[pi * num_modes : (pi + 1) * num_modes]
+    lags_sum = jnp.sum(ql.reshape((-1, num_modes)), axis=0)
     eta = eta0 + lags_sum
-    # jax.debug.breakpoint()
     return eta
 
 
@@ -217,14 +314,32 @@ def eta_rogergust(t, xgust, F1gust):
 # @partial(jax.jit, static_argnames=["num_modes", "num_poles"])
 @jax.jit
 def lags_rogerstructure(A3hat, q1, ql, u_inf, c_ref, poles, num_modes, num_poles):
+    """Lag states dynamics, all the poles at once
+
+    ql is taken as NpxNm (pole major), A3hat is NpxNmxNm.
+    """
+
     num_modes = len(q1)
-    num_poles = int(len(ql) / num_modes)
-    ql_dot = jnp.zeros(num_modes * num_poles)
-    for pi in range(num_poles):
-        ql_dot = ql_dot.at[pi * num_modes : (pi + 1) * num_modes].set(
-            A3hat[pi] @ q1
-            - 2 * u_inf / c_ref * poles[pi] * ql[pi * num_modes : (pi + 1) * num_modes]
-        )
+    ql_tensor = ql.reshape((-1, num_modes))
+    ql_dot = jnp.einsum("pij,j->pi", A3hat, q1) - (
+        2 * u_inf / c_ref * jnp.asarray(poles)[:, None] * ql_tensor
+    )
+    return ql_dot.reshape(-1)
+
+
+@jax.jit
+def eta_karpelstruct(q0, q1, ql, A0hat, A1hat, lags_Dhat):
+    """Minimum-state aerodynamic forces, ql being the Nl lag states"""
+
+    eta = A0hat @ q0 + A1hat @ q1 + lags_Dhat @ ql
+    return eta
+
+
+@jax.jit
+def lags_karpelstructure(lags_E, q1, ql, u_inf, c_ref, poles):
+    """Minimum-state lag dynamics, ql' = E q1 - 2u/c diag(poles) ql"""
+
+    ql_dot = lags_E @ q1 - 2 * u_inf / c_ref * poles * ql
     return ql_dot
 
 
@@ -256,6 +371,88 @@ def lags_rogergust(t, xgust, Flgust):
     return Flgust
 
 
+class GustKernel(NamedTuple):
+    """1-cos gust evaluated at the current time instead of from tables
+
+    Built by gust.kernelRogerMc, with the panels sorted by the time the
+    gust reaches them so the ones inside the gust at t are contiguous.
+
+    Attributes
+    ----------
+    delay : jax.Array
+        Time the gust reaches each panel (Nb), increasing
+    amplitude : jax.Array
+        Panel downwash amplitude, shape_span * normal * intensity / (2 u_inf)
+    coeff : float
+        2 pi u_inf / gust length
+    totaltime : float
+        Time the gust takes to go past a panel
+    D0hat : jax.Array
+        Sorted as delay (NmxNb), and so D1hat and D2hat
+    D1hat : jax.Array
+    D2hat : jax.Array
+    D3hat : jax.Array
+        Lags gust matrices (NpxNmxNb)
+    window : jax.Array
+        arange of the largest number of panels inside the gust at once,
+        only its length is used
+
+    """
+
+    delay: jnp.ndarray
+    amplitude: jnp.ndarray
+    coeff: float
+    totaltime: float
+    D0hat: jnp.ndarray
+    D1hat: jnp.ndarray
+    D2hat: jnp.ndarray
+    D3hat: jnp.ndarray
+    window: jnp.ndarray
+
+
+def eta_gustkernel(t, kernel: GustKernel):
+    """Modal and lags gust forcing at t from the panels inside the gust
+
+    Only the window of panels that can be inside the gust is evaluated,
+    starting at the first one the gust has not left yet.
+    """
+
+    num_panels = kernel.delay.shape[0]
+    num_window = kernel.window.shape[0]
+    first = jnp.searchsorted(kernel.delay, t - kernel.totaltime, side="left")
+    start = jnp.clip(first, 0, num_panels - num_window)
+
+    def window(a, axis=0):
+        return jax.lax.dynamic_slice_in_dim(a, start, num_window, axis)
+
+    tau = t - window(kernel.delay)
+    inside = (tau >= 0.0) & (tau <= kernel.totaltime)
+    amplitude = jnp.where(inside, window(kernel.amplitude), 0.0)
+    phase = kernel.coeff * tau
+    w = amplitude * (1 - jnp.cos(phase))
+    wdot = amplitude * jnp.sin(phase) * kernel.coeff
+    wddot = amplitude * jnp.cos(phase) * kernel.coeff**2
+    eta = (
+        window(kernel.D0hat, 1) @ w
+        + window(kernel.D1hat, 1) @ wdot
+        + window(kernel.D2hat, 1) @ wddot
+    )
+    Flgust = jnp.tensordot(window(kernel.D3hat, 2), wdot, axes=(2, 0))  # NpxNm
+    return eta, Flgust.reshape(-1)
+
+
+@jax.jit
+def rogergust(t, xgust, F1gust, Flgust):
+    """Gust forcing of the modes and of the lags, eta_rogergust and
+    lags_rogergust sharing the interpolation segment, or from the
+    analytic gust if F1gust is a GustKernel"""
+
+    if isinstance(F1gust, GustKernel):
+        return eta_gustkernel(t, F1gust)
+    eta, Flgust_tensor = interpolate_tables(t, xgust, (F1gust, Flgust), axes=(1, 2))
+    return eta, jnp.hstack(Flgust_tensor)
+
+
 # def eta_rogergust(t, xgust, _wgust, _wgust_dot, _wgust_ddot,
 #                   D0hat, D1hat, D2hat):
 
@@ -328,21 +525,28 @@ def shard_point_dead(x, dead_points, dead_interpolation,  num_nodes):
 
     return shardforce_dead #Ns_Nx_6_Nn
 
-def build_gravity(x, gravity, gravity_vect, Ma, Mfe_order):
-    num_nodes = Mfe_order.shape[1] // 6
+def interpolate_gravity(x, mass_gravity, Mfe_order):
+    """Gravity forces (len_x, 6, Nn) ramped linearly along x from the
+    mass matrix times the gravity field, mass_gravity"""
+
     num_nodes_out = Mfe_order.shape[0] // 6
     if x is not None and len(x) > 1:
         len_x = len(x)
     else:
         len_x = 2
-    # force_gravity = jnp.zeros((2, 6, num_nodes))
-    gravity = gravity * gravity_vect
-    gravity_field = jnp.hstack([jnp.hstack([gravity, 0.0, 0.0, 0.0])] * num_nodes)
-    _force_gravity = jnp.matmul(Mfe_order, Ma @ gravity_field)
+    _force_gravity = jnp.matmul(Mfe_order, mass_gravity)
     gravity_interpol = jnp.vstack([xi * _force_gravity for xi in jnp.linspace(0, 1, len_x)]).T
     force_gravity = functions.reshape_field(
         gravity_interpol, len_x, num_nodes_out
     )  # Becomes  (len_x, 6, Nn)
+    return force_gravity
+
+def build_gravity(x, gravity, gravity_vect, Ma, Mfe_order):
+    num_nodes = Mfe_order.shape[1] // 6
+    # force_gravity = jnp.zeros((2, 6, num_nodes))
+    gravity = gravity * gravity_vect
+    gravity_field = jnp.hstack([jnp.hstack([gravity, 0.0, 0.0, 0.0])] * num_nodes)
+    force_gravity = interpolate_gravity(x, Ma @ gravity_field, Mfe_order)
     # num_forces = len(dead_interpolation)
     # for li in range(num_interpol_points):
     #     for fi in range(num_forces):
@@ -354,13 +558,19 @@ def build_gravity(x, gravity, gravity_vect, Ma, Mfe_order):
 
 def shard_gravity(x, gravity, gravity_vect, Ma, Mfe_order):
 
+    # the gravity field is linear in the gravity vector, so Ma, which may
+    # be a scipy.sparse array that cannot be traced, is applied outside
+    # the vmap to the fields of unit gravity in x, y and z: (6Nn, 3)
+    num_nodes = Mfe_order.shape[1] // 6
+    unit_fields = np.tile(np.vstack([np.eye(3), np.zeros((3, 3))]), (num_nodes, 1))
+    mass_unit = jnp.asarray(Ma @ unit_fields)
+
     def _mapgravity(points_gravity, points_gravity_vect):
 
-        force_gravity = build_gravity(x,
-                                      points_gravity,
-                                      points_gravity_vect,
-                                      Ma,
-                                      Mfe_order)
+        force_gravity = interpolate_gravity(x,
+                                            mass_unit @ (points_gravity *
+                                                         points_gravity_vect),
+                                            Mfe_order)
         return force_gravity
 
     vmapgravity = jax.vmap(_mapgravity, in_axes=(0, 0))
@@ -379,6 +589,8 @@ def shard_gust1(inputs: intrinsicmodal.DShard_gust1,
             prod_list.append(v)
         elif k == "aeromatrix":
             prod_list.append([0])
+        elif k == "mach" and default.mach is None:
+            prod_list.append([0.0])  # no Mach database
         else:
             d_k = default_dict[k]
             prod_list.append([d_k])
@@ -395,6 +607,8 @@ def shard_steadyalpha(inputs: intrinsicmodal.DShard_steadyalpha,
             prod_list.append(v)
         elif k == "aeromatrix":
             prod_list.append([0])
+        elif k == "mach" and default.mach is None:
+            prod_list.append([0.0])  # no Mach database
         else:
             d_k = default_dict[k]
             prod_list.append([d_k])
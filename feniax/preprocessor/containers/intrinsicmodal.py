@@ -137,6 +137,16 @@ class Ddriver(DataContainer):
         Save presimulation data
     ad_on : bool
         Algorithm differentiation ON
+    fem_cache : str | pathlib.Path
+        Shared folder where Modes and Couplings are cached under a hash of
+        the FE model, and reused when it is unchanged (None to disable)
+    fem_cache_maxsize : float
+        Maximum size of fem_cache in MB, least recently used entries are
+        evicted beyond it (None for no limit)
+    couplings_extend : str | pathlib.Path
+        Folder with a Couplings solution at fewer modes (same FE model and
+        eigen-solution); only the couplings of the additional modes are
+        computed
     """
 
     typeof: str = dfield("", default=True, options=["intrinsic"])
@@ -144,10 +154,19 @@ class Ddriver(DataContainer):
     compute_fem: bool = dfield("", default=True)
     save_fem: bool = dfield("", default=True)
     ad_on: bool = dfield("", default=False)
+    fem_cache: str | pathlib.Path = dfield("", default=None)
+    fem_cache_maxsize: float = dfield("", default=None)
+    couplings_extend: str | pathlib.Path = dfield("", default=None)
 
     def __post_init__(self):
         if self.sol_path is not None:
             object.__setattr__(self, "sol_path", pathlib.Path(self.sol_path))
+        if self.fem_cache is not None:
+            object.__setattr__(self, "fem_cache", pathlib.Path(self.fem_cache))
+        if self.couplings_extend is not None:
+            object.__setattr__(
+                self, "couplings_extend", pathlib.Path(self.couplings_extend)
+            )
         self._initialize_attributes()
 
 
@@ -166,17 +185,20 @@ class Dfem(DataContainer):
     Ma_name : str | pathlib.Path
         Condensed mass matrix name
     Ka : Array
-        Condensed stiffness matrix
+        Condensed stiffness matrix (dense or scipy.sparse, the latter loaded from .npz)
     Ma : Array
-        Condensed mass matrix 
+        Condensed mass matrix (dense or scipy.sparse, the latter loaded from .npz)
     Ka0s : Array
-        Condensed stiffness matrix augmented with 0s
+        Condensed stiffness matrix augmented with 0s (scipy.sparse if Ka is)
     Ma0s : Array
-        Condensed mass matrix augmented with 0s
+        Condensed mass matrix augmented with 0s (scipy.sparse if Ma is)
     num_modes : int
         Number of modes in the solution
     eig_type : str
-        Calculation of eigenvalues/vectors options=["scipy", "jax_custom", "inputs, input_memory"]
+        Calculation of eigenvalues/vectors options=["scipy", "jax_custom", "sparse", "inputs", "input_memory"]
+    eig_sigma : float
+        Shift for the shift-invert sparse eigen-solver (eig_type="sparse");
+        negative so that rigid-body modes are handled
     eigenvals : Array
         EigenValues
     eigenvecs : Array
@@ -185,6 +207,18 @@ class Dfem(DataContainer):
         Cut-off frequency such that eigenvalues smaller than this are set to 0
     eig_names : list
         name to load eigenvalues/vectors in `folder`
+    couplings_blocksize : int
+        Number of modes per block when computing the gamma couplings, so
+        that memory scales with it instead of Nm^4 (None for all at once)
+    gamma_compression : str
+        Compressed representation of the gamma couplings used in the
+        equations, thresholded sparse or truncated Tucker (None keeps
+        the dense tensors) options=["sparse", "tucker"]
+    gamma_tolerance : float
+        Relative tolerance of the gamma compression
+    phi2_recovery : str
+        Recovery of the internal force modes, accumulating along the load
+        paths (memory O(Nm·Nn)) or from the dense tensors (O(Nm·Nn²))
     grid : str | pathlib.Path | jax.Array | pandas.core.frame.DataFrame
         Grid file or array with Nodes Coordinates, node ID in the FEM, and associated component
     Cab_xtol : float
@@ -261,8 +295,9 @@ class Dfem(DataContainer):
     eig_type: str = dfield(
         "",
         default="scipy",
-        options=["scipy", "jax_custom", "inputs, input_memory"],
+        options=["scipy", "jax_custom", "sparse", "inputs", "input_memory"],
     )
+    eig_sigma: float = dfield("", default=-1.0)
     eigenvals: jnp.ndarray = dfield("", default=None, yaml_save=False)
     eigenvecs: jnp.ndarray = dfield("", default=None, yaml_save=False)
     eig_cutoff: float = dfield(
@@ -273,6 +308,10 @@ class Dfem(DataContainer):
         "",
         default=["eigenvals.npy", "eigenvecs.npy"],
     )
+    couplings_blocksize: int = dfield("", default=None)
+    gamma_compression: str = dfield("", default=None, options=["sparse", "tucker"])
+    gamma_tolerance: float = dfield("", default=1e-8)
+    phi2_recovery: str = dfield("", default="loadpaths", options=["loadpaths", "dense"])
     grid: str | pathlib.Path | jnp.ndarray | pd.DataFrame = dfield(
         "",
         default="structuralGrid",
@@ -351,8 +390,10 @@ class Dfem(DataContainer):
             else:
                 setobj("Ma_name", self.folder / Ma_name)
 
-        setobj("Ka", load_jnp(self.Ka_name))
-        setobj("Ma", load_jnp(self.Ma_name))
+        if self.Ka is None:
+            setobj("Ka", load_jnp(self.Ka_name))
+        if self.Ma is None:
+            setobj("Ma", load_jnp(self.Ma_name))
         if self.folder is None:
             setobj("grid", os.path.abspath(grid))
 
@@ -361,7 +402,7 @@ class Dfem(DataContainer):
                         
         if self.num_modes is None:
             # full set of modes in the solution
-            setobj("num_modes", len(self.Ka))
+            setobj("num_modes", self.Ka.shape[0])
         # if self.folder is None:
         #     df_grid, X, fe_order, component_vect, dof_vect = geometry.build_grid(
         #         self.grid,
@@ -529,6 +570,11 @@ class DGustMc(DGust):
          Collocation points coordinates
     shape : str
          Span-wise shape
+    fixed_discretisation : list
+         Gust length and flow velocity setting the time discretisation
+    analytic : bool
+         Evaluate the 1-cos gust at the current time in the RHS
+         instead of interpolating tables on time
     
     Attributes
     ----------
@@ -540,6 +586,9 @@ class DGustMc(DGust):
         Times at which gust quantities are interpolated (driven by step and u_inf) 
     ntime : int
         len(time)
+    jump_times : Array
+        Times at which the gust enters the first panel and leaves the
+        last one, where the loading is not smooth
 
     """
 
@@ -554,10 +603,12 @@ class DGustMc(DGust):
     collocation_points: str | jnp.ndarray = dfield("", default=None)
     shape: str = dfield("", default="const")
     fixed_discretisation: dict[str: float] = dfield("", default=None)
+    analytic: bool = dfield("", default=False)
     totaltime: float = dfield("", init=False)
     x: jnp.ndarray = dfield("", init=False)
     time: jnp.ndarray = dfield("", init=False)
     ntime: int = dfield("", init=False)
+    jump_times: jnp.ndarray = dfield("", init=False)
 
     def __post_init__(self):
         if isinstance(self.panels_dihedral, (str, pathlib.Path)):
@@ -606,6 +657,13 @@ class DGustMc(DGust):
         object.__setattr__(self, "x", xgust)
         object.__setattr__(self, "time", time)
         object.__setattr__(self, "ntime", ntime)
+        xmin = jnp.min(self.collocation_points[:, 0])
+        xmax = jnp.max(self.collocation_points[:, 0])
+        object.__setattr__(
+            self,
+            "jump_times",
+            (self.shift + jnp.hstack([xmin, xmax + self.length])) / self.u_inf,
+        )
         # del self.simulation_time
         self._initialize_attributes()
 
@@ -628,6 +686,13 @@ class Daero(DataContainer):
         Flow dynamic pressure
     c_ref : float
         Reference chord
+    mach : float
+        Flight Mach number, at which the matrices are interpolated when
+        given over mach_grid
+    mach_grid : Array
+        Mach numbers of the leading axis of A, D (and Q0_rigid in
+        static shards, and the lags matrices of Karpel), which are then
+        stacked over the grid; the poles are shared by all of them
     time : Array
         Simulation time array
     qalpha : Array
@@ -635,7 +700,7 @@ class Daero(DataContainer):
     elevator_index : Array
     elevator_link : Array
     approx : str
-        Aero approximation Options = Roger
+        Aero approximation Options = Roger, Karpel (minimum-state)
     Qk_struct : list
         Sample frequencies and corresponding AICs for the structure
     Qk_gust : list
@@ -650,6 +715,12 @@ class Daero(DataContainer):
          Poles array
     num_poles : int
          Number of poles
+    lags_D : str | jax.Array
+         Minimum-state lag matrix D (NmxNl) in the aerodynamic forces
+    lags_E : str | jax.Array
+         Minimum-state lag matrix E (NlxNm) of the structural velocities
+    lags_Egust : str | jax.Array
+         Minimum-state lag matrix E (NlxNb) of the gust downwash
     gust_profile : str
         Gust name options=["mc"]
     gust : dict | __main__.DGust
@@ -664,6 +735,8 @@ class Daero(DataContainer):
     rho_inf: float = dfield("", default=None)
     q_inf: float = dfield("", init=False)
     c_ref: float = dfield("", default=None)
+    mach: float = dfield("", default=None)
+    mach_grid: jnp.ndarray = dfield("", default=None)
     time: jnp.ndarray = dfield("", default=None, yaml_save=False)
     qalpha: jnp.ndarray = dfield("", default=None)
     qx: jnp.ndarray = dfield("", default=None)
@@ -686,6 +759,9 @@ class Daero(DataContainer):
     _controls: list[jnp.ndarray, jnp.ndarray] = dfield("", default=None)
     poles: str | jnp.ndarray = dfield("", default=None)
     num_poles: int = dfield("", default=None)
+    lags_D: str | jnp.ndarray = dfield("", default=None, yaml_save=False)
+    lags_E: str | jnp.ndarray = dfield("", default=None, yaml_save=False)
+    lags_Egust: str | jnp.ndarray = dfield("", default=None, yaml_save=False)
     gust_profile: str = dfield("", default="mc", options=["mc"])
     # gust_settings: dict = dfield("", default=None, yaml_save=False)
     gust: dict | DGust = dfield("Gust settings", default=None)
@@ -733,8 +809,21 @@ class Daero(DataContainer):
             object.__setattr__(self, "C", jnp.load(self.C))
         if isinstance(self.D, (str, pathlib.Path)):
             object.__setattr__(self, "D", jnp.load(self.D))
+        for lags_i in ["lags_D", "lags_E", "lags_Egust"]:
+            if isinstance(getattr(self, lags_i), (str, pathlib.Path)):
+                object.__setattr__(self, lags_i, jnp.load(getattr(self, lags_i)))
         if self.qalpha is not None and not isinstance(self.qalpha, jnp.ndarray):
             object.__setattr__(self, "qalpha", jnp.array(self.qalpha))
+        if self.mach_grid is not None:
+            object.__setattr__(self, "mach_grid", jnp.array(self.mach_grid))
+            assert self.mach is not None, "mach of the system needed with mach_grid"
+            assert self.A is None or len(self.A) == len(self.mach_grid), \
+                f"A not stacked over the {len(self.mach_grid)} Mach numbers of mach_grid"
+            if self.approx == "Karpel":
+                for lags_i in ["lags_D", "lags_E", "lags_Egust"]:
+                    lags = getattr(self, lags_i)
+                    assert lags is None or lags.ndim == 3, \
+                        f"{lags_i} not stacked over the Mach numbers of mach_grid"
 
         self._initialize_attributes()
 
@@ -759,6 +848,8 @@ class Dxloads(DataContainer):
     dead_interpolation : list
     gravity : float
     gravity_vect : Array
+    sparse : bool
+        Keep the follower and dead forces only at the loaded nodes
 
     Attributes
     ----------
@@ -808,6 +899,11 @@ class Dxloads(DataContainer):
 
     gravity: float = dfield("gravity force [m/s]", default=9.807)
     gravity_vect: jnp.ndarray = dfield("gravity vector", default=jnp.array([0, 0, -1]))
+    sparse: bool = dfield(
+        """Store the follower and dead forces, and their modal projection,
+        only at the nodes in follower_points and dead_points""",
+        default=False,
+    )
 
     # gravity_steps: int = dfield("steps in which gravity is applied in trim simulation",
     #                                    default=1) manage by t
@@ -932,9 +1028,32 @@ class DdiffraxOde(Dlibrary):
     ----------
     root_finder : dict
     stepsize_controller : dict
+        Diffrax stepsize controller as {name: kwargs}, overrides the
+        PID settings below
     solver_name : str
     save_at : jax.Array | list
+        Times at which the solution is stored (interpolated from the
+        solver steps), defaults to the system time vector
+    dense : bool
+        Keep the dense interpolation in the solution (sol.evaluate(t))
     max_steps : int
+    rtol : float
+        Relative tolerance of the PID controller; adaptive stepping is
+        only used when set
+    atol : float
+        Absolute tolerance of the PID controller
+    pcoeff : float
+    icoeff : float
+    dcoeff : float
+        Proportional, integral and derivative coefficients of the PID
+    dtmin : float
+    dtmax : float
+        Bounds on the step size
+    jump_ts : jax.Array | list
+        Times of discontinuities the controller steps onto (the gust
+        entry/exit times are added when gust_jumps)
+    gust_jumps : bool
+        Add the gust jump_times of the aero settings to jump_ts
 
     """
 
@@ -942,7 +1061,17 @@ class DdiffraxOde(Dlibrary):
     stepsize_controller: dict = dfield("", default=None)
     solver_name: str = dfield("", default="Dopri5")
     save_at: jnp.ndarray | list[float] = dfield("", default=None)
+    dense: bool = dfield("", default=False)
     max_steps: int = dfield("", default=20000)
+    rtol: float = dfield("", default=None)
+    atol: float = dfield("", default=1e-8)
+    pcoeff: float = dfield("", default=0.0)
+    icoeff: float = dfield("", default=1.0)
+    dcoeff: float = dfield("", default=0.0)
+    dtmin: float = dfield("", default=None)
+    dtmax: float = dfield("", default=None)
+    jump_ts: jnp.ndarray | list[float] = dfield("", default=None)
+    gust_jumps: bool = dfield("", default=True)
 
     def __post_init__(self, **kwargs):
         object.__setattr__(self, "function", "ode")
@@ -956,9 +1085,78 @@ class Drunge_kuttaOde(Dlibrary):
     Parameters
     ----------
     solver_name : str
+        Fixed-step scheme options=["rk4", "rk2", "dopri5", "tsit5"]
+    save_stride : int
+        Store the solution every save_stride time steps (dt), the last
+        step is always stored
+    save_at : list
+        Times at which the solution is stored, overriding save_stride;
+        the system is integrated in between with sub-steps no larger
+        than dt
+    """
+
+    solver_name: str = dfield(
+        "", default="rk4", options=["rk4", "rk2", "dopri5", "tsit5"]
+    )
+    save_stride: int = dfield("", default=1)
+    save_at: list = dfield("", default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "function", "ode")
+        self._initialize_attributes()
+
+
+@Ddataclass
+class DexponentialOde(Dlibrary):
+    """Solution settings for the exponential integrators
+
+    The linear part of the system (Jacobian at the zero state) is
+    integrated exactly and the rest explicitly, with constant step dt
+
+    Parameters
+    ----------
+    solver_name : str
+        Scheme options=["etdrk4", "lawson4", "etd1"]
+    save_stride : int
+        Store the solution every save_stride time steps (dt), the last
+        step is always stored
+    save_at : list
+        Times at which the solution is stored, overriding save_stride;
+        rounded to the nearest time step
     """
 
-    solver_name: str = dfield("", default="rk4")
+    solver_name: str = dfield("", default="etdrk4", options=["etdrk4", "lawson4", "etd1"])
+    save_stride: int = dfield("", default=1)
+    save_at: list = dfield("", default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "function", "ode")
+        self._initialize_attributes()
+
+
+@Ddataclass
+class DimexOde(Dlibrary):
+    """Solution settings for the IMEX and Rosenbrock integrators
+
+    The linear part of the system (Jacobian at the zero state), with the
+    stiff aerodynamic lags, is integrated implicitly with one LU
+    factorisation per run, the rest explicitly, with constant step dt
+
+    Parameters
+    ----------
+    solver_name : str
+        Scheme options=["ars222", "ars443", "ros2"]
+    save_stride : int
+        Store the solution every save_stride time steps (dt), the last
+        step is always stored
+    save_at : list
+        Times at which the solution is stored, overriding save_stride;
+        rounded to the nearest time step
+    """
+
+    solver_name: str = dfield("", default="ars443", options=["ars222", "ars443", "ros2"])
+    save_stride: int = dfield("", default=1)
+    save_at: list = dfield("", default=None)
 
     def __post_init__(self):
         object.__setattr__(self, "function", "ode")
@@ -990,6 +1188,46 @@ class DdiffraxNewton(Dlibrary):
         self._initialize_attributes()
 
 
+@Ddataclass
+class DnewtonStatic(Dlibrary):
+    """Settings for the Newton static solvers reusing the Jacobian
+
+    Parameters
+    ----------
+    method : str
+        modified (Jacobian LU reused across iterations and load steps),
+        broyden (rank-one updates of the inverse Jacobian) or chord
+        (Jacobian LU only rebuilt when the Newton step grows)
+    rtol : float
+        Relative tolerance on the Newton step and on the residual, the
+        latter relative to the residual at the start of the load step
+    atol : float
+    max_steps : int
+        Maximum number of iterations per load step
+    norm : str
+    contraction : float
+        The Jacobian is rebuilt when the norm of the Newton step is not
+        reduced by this factor from one iteration to the next (modified
+        and broyden)
+    analytic_jac : bool
+        Use the analytic Jacobian of the system (jac_<label> in
+        dq_static) if available, forward AD otherwise
+
+    """
+
+    method: str = dfield("", default="modified", options=["modified", "broyden", "chord"])
+    rtol: float = dfield("", default=1e-7)
+    atol: float = dfield("", default=1e-7)
+    max_steps: int = dfield("", default=100)
+    norm: str = dfield("", default="linalg_norm")
+    contraction: float = dfield("", default=0.5)
+    analytic_jac: bool = dfield("", default=True)
+
+    def __post_init__(self):
+        object.__setattr__(self, "function", "static")
+        self._initialize_attributes()
+
+
 @Ddataclass
 class DobjectiveArgs(Dlibrary):
     """Settings for the objective function in the AD
@@ -1048,6 +1286,20 @@ class DtoAD(Dlibrary):
     _numtime : int
     _numcomponents : int
     label : str
+    adjoint : str
+        Reverse-mode strategy through the time integration:
+        recursive_checkpoint (recursive checkpointing of the scans in
+        the in-house solvers, diffrax RecursiveCheckpointAdjoint),
+        direct (store everything, also valid for jacfwd with diffrax)
+        or backsolve (diffrax BacksolveAdjoint); the library default if
+        None
+    checkpoints : int
+        Number of checkpoints of recursive_checkpoint (per recursion
+        level in the in-house solvers); if None, ceil(sqrt(n)) for a
+        scan of n steps in the in-house solvers and the diffrax default
+    profile : bool
+        Compile ahead of time and record the compile and run times and
+        the XLA memory analysis in the ad_stats of the solution
 
     """
 
@@ -1069,6 +1321,11 @@ class DtoAD(Dlibrary):
     _numtime: int = dfield("", default=None, yaml_save=False)
     _numcomponents: int = dfield("", default=6, yaml_save=False)
     label: str = dfield("", default=None, init=False)
+    adjoint: str = dfield(
+        "", default=None, options=["recursive_checkpoint", "direct", "backsolve"]
+    )
+    checkpoints: int = dfield("", default=None)
+    profile: bool = dfield("", default=False)
 
     def __post_init__(self):
         label = ADinputType[self.input_type.upper()].value
@@ -1136,6 +1393,7 @@ class DShard_steadyalpha(DataContainer):
     rho_inf: jnp.ndarray = dfield("", default=None)
     u_inf: jnp.ndarray = dfield("", default=None)
     aeromatrix: list[int] = dfield("", default=None)
+    mach: jnp.ndarray = dfield("", default=None)
     def __post_init__(self):
         
         self._initialize_attributes()
@@ -1152,6 +1410,7 @@ class DShard_gust1(DataContainer):
     u_inf: jnp.ndarray = dfield("", default=None)
     length: jnp.ndarray = dfield("", default=None)
     intensity: jnp.ndarray = dfield("", default=None)
+    mach: jnp.ndarray = dfield("", default=None)
     def __post_init__(self):
         
         self._initialize_attributes()
@@ -1195,6 +1454,168 @@ class DShard(DataContainer):
         )
         self._initialize_attributes()
 
+@Ddataclass
+class DBatch(DataContainer):
+    """Batched multi-case settings
+
+    The cases are solved in one compiled call, vectorised over the
+    leading axis of the inputs; inputs not given are shared by all the
+    cases
+
+    Parameters
+    ----------
+    q0 : str | jax.Array
+        Initial states, (Nc, num_states)
+    eta0 : str | jax.Array
+        Constant modal forces, (Nc, Nm)
+    load_scaling : str | jax.Array
+        Factors on the point forces and gust loads, (Nc,)
+
+    Attributes
+    ----------
+    num_cases : int
+        Number of cases, Nc
+
+    """
+
+    q0: str | jnp.ndarray = dfield("", default=None)
+    eta0: str | jnp.ndarray = dfield("", default=None)
+    load_scaling: str | jnp.ndarray = dfield("", default=None)
+    num_cases: int = dfield("", init=False)
+
+    def __post_init__(self):
+        lengths = dict()
+        for k in ("q0", "eta0", "load_scaling"):
+            if (v := getattr(self, k)) is not None:
+                if isinstance(v, (str, pathlib.Path)):
+                    v = jnp.load(v)
+                v = jnp.array(v)
+                object.__setattr__(self, k, v)
+                lengths[k] = len(v) if v.ndim > 0 else "scalar"
+        if not lengths:
+            raise ValueError("no batched fields in batch, give q0, eta0 or load_scaling")
+        if "scalar" in lengths.values() or len(set(lengths.values())) > 1:
+            raise ValueError(
+                "inconsistent number of cases in batch, length of each batched field: "
+                + ", ".join(f"{k}={v}" for k, v in lengths.items())
+            )
+        object.__setattr__(self, "num_cases", lengths.popitem()[1])
+        self._initialize_attributes()
+
+
+@Ddataclass
+class DEvents(DataContainer):
+    """Events terminating the integration of dynamic systems
+
+    An event fires when its function changes sign between two saved
+    points; the integration stops there and the outputs are trimmed on
+    the host after the solve. Not available in batched or segmented
+    solutions, whose cases and segments would be trimmed differently
+
+    Parameters
+    ----------
+    energy : float
+        Stop when the modal energy, 0.5 (q1.q1 + q2.q2), falls below it
+    energy_time : float
+        Time from which the energy event is active, by default when the
+        gust leaves the last panel (t0 without gust)
+    X2 : list
+        [[node, component, value], ...], stop when the internal force
+        component at the node crosses the value
+    functions : list
+        Scalar functions of the time and states, g(t, q), stopping the
+        integration when they change sign
+
+    """
+
+    energy: float = dfield("", default=None)
+    energy_time: float = dfield("", default=None)
+    X2: list[list] = dfield("", default=None)
+    functions: list[callable] = dfield("", default=None, yaml_save=False)
+
+    def __post_init__(self):
+        if self.X2 is not None:
+            object.__setattr__(self, "X2", [tuple(x2i) for x2i in self.X2])
+        self._initialize_attributes()
+
+
+@Ddataclass
+class DContinuation(DataContainer):
+    """Adaptive continuation settings of static systems
+
+    The load parameter (t) is advanced from start in increments resized
+    by the Newton iterations of the previous one; the states at the
+    requested loads, Dsystem.t, are interpolated from the converged ones.
+    The correctors are full Newton iterations that refactorise the dense
+    Jacobian in every iteration; solver_library and solver_settings of
+    the system are not used, only the tolerances below.
+
+    Parameters
+    ----------
+    method : str
+        load (load control) or arclength (Riks, normal-plane
+        constraint), which follows the path past limit points
+    predictor : str
+        secant (extrapolation from the last two converged states) or
+        constant, in load control
+    start : float
+        Load parameter of the initial state
+    initial_step : float
+        First load increment, a tenth of the load range if None
+    min_step : float
+        Smallest load increment (or its arc-length equivalent) before
+        failing, 1e-6 of the load range if None
+    max_step : float
+        Largest load increment, the load range if None
+    target_iterations : int
+        Newton iterations per increment the step control aims at
+    max_iterations : int
+        Newton iterations before an increment is rejected and halved
+    max_increments : int
+        Accepted increments before failing to reach the last load
+    psi : float
+        Scaling of the load parameter in the arc length
+    rtol : float
+    atol : float
+    correct : bool
+        Newton correction of the interpolated states at the exact loads;
+        an error is raised if it does not converge
+
+    """
+
+    method: str = dfield("", default="load", options=["load", "arclength"])
+    predictor: str = dfield("", default="secant", options=["secant", "constant"])
+    start: float = dfield("", default=0.0)
+    initial_step: float = dfield("", default=None)
+    min_step: float = dfield("", default=None)
+    max_step: float = dfield("", default=None)
+    target_iterations: int = dfield("", default=4)
+    max_iterations: int = dfield("", default=12)
+    max_increments: int = dfield("", default=500)
+    psi: float = dfield("", default=1.0)
+    rtol: float = dfield("", default=1e-7)
+    atol: float = dfield("", default=1e-7)
+    correct: bool = dfield("", default=True)
+
+    def __post_init__(self):
+        for k in ("initial_step", "min_step", "max_step"):
+            if (v := getattr(self, k)) is not None and v <= 0:
+                raise ValueError(f"continuation {k} must be positive, got {v}")
+        if (
+            self.min_step is not None
+            and self.max_step is not None
+            and self.min_step > self.max_step
+        ):
+            raise ValueError(
+                f"continuation min_step ({self.min_step}) larger than max_step ({self.max_step})"
+            )
+        if self.max_increments <= 0:
+            raise ValueError(
+                f"continuation max_increments must be positive, got {self.max_increments}"
+            )
+        self._initialize_attributes()
+
+
 @Ddataclass
 class Dsystem(DataContainer):
     """System settings for the corresponding equations to be solved
@@ -1229,6 +1650,21 @@ class Dsystem(DataContainer):
     init_states : dict
     init_mapper : dict
     ad : DtoAD
+    shard : DShard
+    batch : DBatch
+    segment_time : float
+        Integrate in segments of this length, carrying the final state
+        into the next one; the fields of each segment are appended to
+        the container on disk (sol_path), bounding the memory to one
+        segment
+    checkpoint_steps : int
+        Number of time (or load) steps between checkpoints of the states
+        written to sol_path
+    restart_from : str | pathlib.Path
+        sol_path of an interrupted run, the solution resumes from its
+        last checkpoint
+    events : DEvents
+    continuation : DContinuation
 
     """
 
@@ -1306,6 +1742,20 @@ class Dsystem(DataContainer):
     )
     ad: dict | DtoAD = dfield("""Dictionary for AD""", default=None)
     shard: dict | DShard = dfield("""Dictionary for parallelisation""", default=None)
+    batch: dict | DBatch = dfield("""Dictionary for batched multi-case runs""", default=None)
+    segment_time: float = dfield(
+        """Length of the time segments streamed to disk""", default=None
+    )
+    checkpoint_steps: int = dfield(
+        """Number of steps between checkpoints written to sol_path""", default=None
+    )
+    restart_from: str | pathlib.Path = dfield(
+        """sol_path with the checkpoint to restart from""", default=None
+    )
+    events: dict | DEvents = dfield("""Events stopping the integration""", default=None)
+    continuation: dict | DContinuation = dfield(
+        """Adaptive continuation of static systems""", default=None
+    )
 
     def __post_init__(self):
         if self.t is not None:
@@ -1338,6 +1788,10 @@ class Dsystem(DataContainer):
             "solver_settings",
             initialise_Dclass(self.solver_settings, libsettings_class),
         )
+        if getattr(self.solver_settings, "gust_jumps", False) and (
+            self.aero is not None and self.aero.gust is not None
+        ):
+            self._add_gustjumps()
         if self.ad is not None:
 
             if isinstance(self.ad, dict):
@@ -1371,10 +1825,33 @@ class Dsystem(DataContainer):
                     ),
                 )
                 
+        if self.batch is not None:
+            object.__setattr__(self, "batch", initialise_Dclass(self.batch, DBatch))
+        if self.continuation is not None:
+            object.__setattr__(
+                self, "continuation", initialise_Dclass(self.continuation, DContinuation)
+            )
+        if self.events is not None:
+            object.__setattr__(self, "events", initialise_Dclass(self.events, DEvents))
+            if self.events.energy is not None and self.events.energy_time is None:
+                energy_time = self.t0
+                if self.aero is not None and self.aero.gust is not None:
+                    energy_time = float(self.aero.gust.jump_times[-1])
+                object.__setattr__(self.events, "energy_time", energy_time)
         if self.label is None:
             self.build_label()
         self._initialize_attributes()
 
+    def _add_gustjumps(self):
+        """Adds the gust entry/exit times within (t0, t1) to the solver jump_ts"""
+
+        jump_ts = self.aero.gust.jump_times
+        if self.solver_settings.jump_ts is not None:
+            jump_ts = jnp.hstack([jnp.array(self.solver_settings.jump_ts), jump_ts])
+        jump_ts = jnp.sort(jump_ts)
+        jump_ts = jump_ts[(jump_ts > self.t0) & (jump_ts < self.t1)]
+        object.__setattr__(self.solver_settings, "jump_ts", jump_ts)
+
     def build_states(self, num_modes: int, num_nodes: int):
         tracker = StateTrack()
         # TODO: keep upgrading/ add residualise
@@ -1386,6 +1863,8 @@ class Dsystem(DataContainer):
             tracker.update(q1=num_modes, q2=num_modes)
             if self.label_map["aero_sol"] and self.aero.approx.lower() == "roger":
                 tracker.update(ql=self.aero.num_poles * num_modes)
+            elif self.label_map["aero_sol"] and self.aero.approx.lower() == "karpel":
+                tracker.update(ql=self.aero.num_poles)
             if self.q0treatment == 1:
                 tracker.update(q0=num_modes)
             if self.bc1.lower() != "clamped":
@@ -1416,6 +1895,8 @@ class Dsystem(DataContainer):
                 lmap["aero_sol"] = 1
             elif self.aero.approx.lower() == "loewner":
                 lmap["aero_sol"] = 2
+            elif self.aero.approx.lower() == "karpel":
+                lmap["aero_sol"] = 3
             if self.aero.qalpha is None and self.aero.qx is None:
                 lmap["aero_steady"] = 0
             elif self.aero.qalpha is not None and self.aero.qx is None:
@@ -25,6 +25,8 @@ class Couplings:
     alpha2: jnp.ndarray
     gamma1: jnp.ndarray
     gamma2: jnp.ndarray
+    gamma1c: tuple = None  # compressed gamma1 used in the RHS
+    gamma2c: tuple = None
 
 
 @dataclass(slots=True)
@@ -38,6 +40,7 @@ class DynamicSystem:
     t: jnp.ndarray = None
     jac: dict = None
     f_ad: dict = None
+    ad_stats: dict = None
 
 
 @dataclass(slots=True)
@@ -50,13 +53,18 @@ class StaticSystem:
     t: dict = None
     jac: dict[str,jnp.ndarray] = None
     f_ad: dict = None
+    ad_stats: dict = None
+    solver_stats: dict = None
 
 @dataclass(slots=True)
 class PointForces:
     force_follower: jnp.ndarray = None
     force_dead: jnp.ndarray = None
     force_gravity: jnp.ndarray = None
-    x: jnp.ndarray = None    
+    x: jnp.ndarray = None
+    # loaded nodes of sparse follower/dead forces (then only at those nodes)
+    follower_index: jnp.ndarray = None
+    dead_index: jnp.ndarray = None
 
 @dataclass(slots=True)
 class ModalAeroRoger:
@@ -90,6 +98,29 @@ class ModalAeroRoger:
     C0hat: jnp.ndarray = None
 
 
+@dataclass(slots=True)
+class ModalAeroKarpel:
+    poles: jnp.ndarray = None
+    A0: jnp.ndarray = None
+    A1: jnp.ndarray = None
+    A2: jnp.ndarray = None
+    D0: jnp.ndarray = None
+    D1: jnp.ndarray = None
+    D2: jnp.ndarray = None
+    lags_D: jnp.ndarray = None  # NmxNl
+    lags_E: jnp.ndarray = None  # NlxNm
+    lags_Egust: jnp.ndarray = None  # NlxNb
+    A0hat: jnp.ndarray = None
+    A1hat: jnp.ndarray = None
+    A2hat: jnp.ndarray = None
+    A2hatinv: jnp.ndarray = None
+    D0hat: jnp.ndarray = None
+    D1hat: jnp.ndarray = None
+    D2hat: jnp.ndarray = None
+    D3hat: jnp.ndarray = None  # 1xNlxNb
+    lags_Dhat: jnp.ndarray = None  # NmxNl
+
+
 @dataclass(slots=True)
 class GustRoger:
     w: jnp.ndarray = None
@@ -0,0 +1,162 @@
+"""Content-addressed on-disk cache of the pre-simulation (Modes and Couplings)"""
+
+import hashlib
+import os
+import pathlib
+import shutil
+import tempfile
+
+import jax
+import numpy as np
+import scipy.sparse
+
+CONTAINERS = ("Modes", "Couplings")
+
+
+def _update_array(h, A):
+    """Adds an array (dense or scipy.sparse) to the hash object h"""
+
+    if A is None:
+        h.update(b"None")
+    elif scipy.sparse.issparse(A):
+        A = scipy.sparse.csr_array(A)
+        A.sort_indices()
+        for Ai in (A.data, A.indices, A.indptr):
+            _update_array(h, Ai)
+        h.update(str(A.shape).encode())
+    else:
+        A = np.ascontiguousarray(np.asarray(A))
+        h.update(f"{A.dtype}{A.shape}".encode())
+        h.update(A.tobytes())
+
+
+def hash_fem(fem) -> str:
+    """Key of the Modes/Couplings computed for a given FE model
+
+    Parameters
+    ----------
+    fem : intrinsicmodal.Dfem
+        FE model settings; Ka, Ma, the grid, num_modes, eig_type,
+        connectivity, the clamped nodes and DoF (from fe_order,
+        fe_order_start and dof_vect) and the settings modifying the
+        modes go into the hash, as does the jax x64 flag setting the
+        precision of the stored arrays. When the eigen-solution is an
+        input, so is the data.
+
+    Returns
+    -------
+    str
+        sha256 hexadecimal digest
+
+    """
+
+    h = hashlib.sha256()
+    for Ai in (fem.Ka, fem.Ma, fem.X, fem.fe_order):
+        _update_array(h, Ai)
+    settings = (
+        fem.num_modes,
+        fem.eig_type,
+        fem.eig_cutoff,
+        fem.eig_sigma,
+        fem.Cab_xtol,
+        fem.connectivity,
+        list(fem.component_vect),
+        fem.fe_order_start,
+        list(fem.dof_vect),
+        fem.clamped_nodes,
+        fem.freeDoF,
+        fem.clampedDoF,
+        fem.phi2_recovery,
+        jax.config.jax_enable_x64,
+    )
+    h.update(repr(settings).encode())
+    if fem.eig_type == "inputs":
+        for name in fem.eig_names:
+            _update_array(h, np.load(pathlib.Path(fem.folder) / name))
+    elif fem.eig_type == "input_memory":
+        _update_array(h, fem.eigenvals)
+        _update_array(h, fem.eigenvecs)
+    return h.hexdigest()
+
+
+def _folder_size(path: pathlib.Path) -> int:
+    return sum(fi.stat().st_size for fi in path.rglob("*") if fi.is_file())
+
+
+class FemCache:
+    """Shared folder with the Modes and Couplings of previous runs
+
+    Each entry is a folder named after hash_fem, containing the
+    containers as saved by the solution object. Entries are written to
+    a temporary folder first and renamed so that concurrent runs
+    sharing the cache do not see partial data. Least recently used
+    entries are removed when the cache grows beyond maxsize.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        Cache folder
+    maxsize : float
+        Maximum size of the cache in MB (None for no limit)
+
+    """
+
+    def __init__(self, path: str | pathlib.Path, maxsize: float = None):
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+
+    def load(self, key: str, sol) -> bool:
+        """Loads the containers under key into sol, False if not cached"""
+
+        entry = self.path / key
+        if not all((entry / ci).is_dir() for ci in CONTAINERS):
+            return False
+        for ci in CONTAINERS:
+            sol.load_container(ci, path=entry / ci)
+        os.utime(entry)  # LRU tracked through the folder modification time
+        return True
+
+    def save(self, key: str, sol):
+        """Stores the containers in sol under key and evicts old entries"""
+
+        entry = self.path / key
+        if entry.is_dir():
+            os.utime(entry)
+            return
+        tmp = pathlib.Path(tempfile.mkdtemp(dir=self.path, prefix=".tmp"))
+        for ci in CONTAINERS:
+            sol.save_container(ci, path=tmp / ci)
+        try:
+            os.rename(tmp, entry)
+        except OSError:  # stored meanwhile by another run
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+
+    def evict(self, keep: str = None):
+        """Removes least recently used entries until below maxsize"""
+
+        if self.maxsize is None:
+            return
+        entries = [
+            ei
+            for ei in self.path.iterdir()
+            if ei.is_dir() and not ei.name.startswith(".")
+        ]
+        entries.sort(key=lambda ei: ei.stat().st_mtime)
+        sizes = {ei.name: _folder_size(ei) for ei in entries}
+        total = sum(sizes.values())
+        for ei in entries:
+            if total <= self.maxsize * 1e6:
+                break
+            if ei.name == keep:
+                continue
+            shutil.rmtree(ei, ignore_errors=True)
+            total -= sizes[ei.name]
+
+    def clear(self):
+        """Removes all the entries in the cache"""
+
+        for ei in self.path.iterdir():
+            if ei.is_dir():
+                shutil.rmtree(ei, ignore_errors=True)
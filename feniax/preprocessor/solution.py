@@ -30,7 +30,7 @@ class Solution(ABC):
         setattr(self.data, name.lower() + label, Container(*args, **kwargs))
         self.containers.append(name + label)
 
-    def load_container(self, name: str, label=""):
+    def load_container(self, name: str, label="", path=None):
         try:
             Container = getattr(self.sol_container, name)
         except AttributeError:
@@ -38,7 +38,10 @@ class Solution(ABC):
                 f"Container {name} is not a valid name \
             in {self.sol_container.__file__}"
             )
-        pathc = self.path / (name + label)
+        if path is None:
+            pathc = self.path / (name + label)
+        else:
+            pathc = pathlib.Path(path)
         solcontainer = load_container(pathc, Container)
         setattr(self.data, name.lower() + label, solcontainer)
         self.containers.append(name + label)
@@ -49,10 +52,13 @@ class Solution(ABC):
         delattr(self.data, name.lower() + label)
         self.containers.remove(name + label)
 
-    def save_container(self, name: str, label="", del_obj: bool = False):
+    def save_container(self, name: str, label="", del_obj: bool = False, path=None):
         assert (name + label) in self.containers, f"{name} is not a container in \
         the current solution object"
-        pathc = self.path / (name + label)
+        if path is None:
+            pathc = self.path / (name + label)
+        else:
+            pathc = pathlib.Path(path)
         pathc.mkdir(parents=True, exist_ok=True)
         container = getattr(self.data, name.lower() + label)
         save_container(pathc, container)
@@ -72,6 +78,38 @@ class IntrinsicSolution(Solution):
 
         self.sol_container = feniax.preprocessor.containers.intrinsicsol
 
+    def extend_couplings(self, couplings0, block_size: int = None):
+        """Adds the Couplings container extending those at fewer modes
+
+        Only the new slices of alpha1, alpha2, gamma1 and gamma2 are
+        computed from the Modes container in the solution.
+
+        Parameters
+        ----------
+        couplings0 : intrinsicsol.Couplings
+            Couplings computed with the leading modes of the current ones
+        block_size : int
+            Block size in the gamma computations
+
+        """
+        import feniax.intrinsic.couplings as couplings
+
+        modes = self.data.modes
+        alpha1, alpha2, gamma1, gamma2 = couplings.extend_couplings(
+            couplings0.alpha1,
+            couplings0.alpha2,
+            couplings0.gamma1,
+            couplings0.gamma2,
+            modes.phi1,
+            modes.psi1,
+            modes.phi1ml,
+            modes.phi2l,
+            modes.psi2l,
+            modes.X_xdelta,
+            block_size=block_size,
+        )
+        self.add_container("Couplings", alpha1, alpha2, gamma1, gamma2)
+
 
 def save_container(path, container):
     for attr_name in container.__slots__:
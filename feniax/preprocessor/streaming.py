@@ -0,0 +1,195 @@
+"""Appendable .npy arrays to stream solution containers and checkpoints to disk"""
+
+import os
+import pathlib
+import struct
+
+import numpy as np
+
+# fixed header size so the shape can be rewritten in place after each
+# append (multiple of 64 as numpy writes them)
+HEADER_LEN = 192
+
+
+class NpyAppender:
+    """A .npy file growing along its first axis
+
+    The header is rewritten with the new number of rows after every
+    append, so the file can be read with numpy.load (or memory-mapped)
+    at any time while it is being written.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        File path, the .npy suffix is added
+    dtype : numpy.dtype
+        Data type of the array
+    row_shape : tuple
+        Shape of one row (the array shape without the first axis)
+    num_rows : int
+        If given, an existing file is reopened and truncated to its
+        first num_rows rows instead of being overwritten
+
+    """
+
+    def __init__(
+        self, path: str | pathlib.Path, dtype, row_shape: tuple, num_rows: int = None
+    ):
+        self.path = pathlib.Path(path).with_suffix(".npy")
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        if num_rows is None:
+            self.num_rows = 0
+            with open(self.path, "wb") as fp:
+                fp.write(self._header())
+        else:
+            self.num_rows = num_rows
+            row_size = self.dtype.itemsize * int(np.prod(self.row_shape))
+            with open(self.path, "r+b") as fp:
+                fp.truncate(HEADER_LEN + num_rows * row_size)
+                fp.write(self._header())
+
+    def _header(self) -> bytes:
+        shape = (self.num_rows,) + self.row_shape
+        header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (
+            np.lib.format.dtype_to_descr(self.dtype),
+            shape,
+        )
+        # magic string (6), version (2) and header length (2)
+        header = header.ljust(HEADER_LEN - 10 - 1) + "\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+    def append(self, rows):
+        """Appends rows, an array of shape (n,) + row_shape"""
+
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        assert rows.shape[1:] == self.row_shape, (
+            f"wrong row shape {rows.shape[1:]} in {self.path}, expected {self.row_shape}"
+        )
+        with open(self.path, "r+b") as fp:
+            fp.seek(0, 2)
+            fp.write(rows.tobytes())
+            self.num_rows += len(rows)
+            fp.seek(0)
+            fp.write(self._header())
+
+
+class ContainerStream:
+    """Solution container written to disk by chunks of its time axis
+
+    The attributes are stored one per .npy file as save_container does,
+    so the folder can be read back with load_container.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        Container folder
+    num_rows : int
+        Resumes the arrays already in the folder from their first
+        num_rows rows (see NpyAppender)
+
+    """
+
+    def __init__(self, path: str | pathlib.Path, num_rows: int = None):
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.num_rows = num_rows
+        self.arrays = dict()
+
+    def append(self, **kwargs):
+        """Appends a chunk of each attribute given as keyword argument"""
+
+        for k, v in kwargs.items():
+            v = np.asarray(v)
+            if k not in self.arrays:
+                if self.num_rows is not None and not (self.path / f"{k}.npy").is_file():
+                    raise ValueError(f"No {k}.npy to resume in {self.path}")
+                self.arrays[k] = NpyAppender(
+                    self.path / k, v.dtype, v.shape[1:], self.num_rows
+                )
+            self.arrays[k].append(v)
+
+    def load(self, mmap_mode: str = "r") -> dict:
+        """Memory-mapped arrays written so far"""
+
+        return {
+            k: np.load(v.path, mmap_mode=mmap_mode) for k, v in self.arrays.items()
+        }
+
+
+def copy_container(source: str | pathlib.Path, path: str | pathlib.Path, num_rows: int,
+                   chunk_rows: int = 1000):
+    """Copies the first num_rows rows of the arrays in a container folder
+
+    The rows are read from the memory-mapped source chunk_rows at a
+    time, such that a streamed container can be resumed in a new folder.
+
+    Parameters
+    ----------
+    source : str | pathlib.Path
+        Container folder to copy from
+    path : str | pathlib.Path
+        Container folder to copy to, the arrays in it are overwritten
+    num_rows : int
+        Number of rows to copy
+    chunk_rows : int
+        Number of rows read at once
+
+    """
+
+    source = pathlib.Path(source)
+    files = sorted(source.glob("*.npy"))
+    if len(files) == 0:
+        raise ValueError(f"No container to resume in {source}")
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for fi in files:
+        x = np.load(fi, mmap_mode="r")
+        if len(x) < num_rows:
+            raise ValueError(f"{fi} has {len(x)} rows, {num_rows} needed to resume")
+        array = NpyAppender(path / fi.stem, x.dtype, x.shape[1:])
+        for i in range(0, num_rows, chunk_rows):
+            array.append(x[i : min(i + chunk_rows, num_rows)])
+
+
+class Checkpoint:
+    """Restart point of a system solved by steps
+
+    The converged states are appended to q.npy and, after them, the
+    index of the last stored step together with any other variable
+    needed to carry on the solution is written to state.npz (by a rename
+    so a kill while writing leaves the previous checkpoint intact).
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        Checkpoint folder
+
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.stream = None
+
+    def save(self, qs, index: int, **kwargs):
+        """Appends the states qs and sets the restart point at step index"""
+
+        if self.stream is None:
+            self.stream = ContainerStream(self.path)
+        self.stream.append(q=qs)
+        assert self.stream.arrays["q"].num_rows == index + 1, "wrong checkpoint index"
+        file_tmp = self.path / "state_tmp.npz"
+        np.savez(file_tmp, index=index, **kwargs)
+        os.replace(file_tmp, self.path / "state.npz")
+
+    def load(self) -> tuple[np.ndarray, dict]:
+        """States up to the restart point and the stored variables
+
+        Writing continues after the restart point in subsequent saves.
+        """
+
+        state = dict(np.load(self.path / "state.npz"))
+        index = int(state.pop("index"))
+        qs = np.array(np.load(self.path / "q.npy", mmap_mode="r")[: index + 1])
+        self.stream = ContainerStream(self.path, num_rows=index + 1)
+        return qs, state
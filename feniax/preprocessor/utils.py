@@ -2,6 +2,7 @@ from dataclasses import field
 from typing import Sequence, Any
 import pandas as pd
 import numpy as np
+import scipy.sparse
 import jax.numpy as jnp
 from feniax.utils import flatten_list
 from ruamel.yaml import YAML
@@ -97,7 +98,11 @@ def load_jnp(path):
     if not isinstance(path, pathlib.Path):
         path = pathlib.Path(path)
     assert path.is_file(), f"{str(path)} is not a file"
-    A = jnp.load(path)
+    if path.suffix == ".npz":
+        # scipy.sparse matrices saved with scipy.sparse.save_npz
+        A = scipy.sparse.load_npz(path)
+    else:
+        A = jnp.load(path)
     return A
 
 
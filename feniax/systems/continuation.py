@@ -0,0 +1,224 @@
+"""Adaptive load stepping and arc-length continuation of static systems
+
+The static residual F(q, args + (lambda,)) is followed along the load
+parameter lambda (the time t of the static systems) with increments
+sized by the number of Newton iterations of the previous one, starting
+from secant predictors. In arc-length mode (Riks) lambda is an unknown
+too and the increments are taken along the equilibrium path with a
+normal-plane constraint, so limit points can be passed. The states at
+the requested load levels are interpolated from the converged ones (and
+optionally corrected by Newton at the exact load).
+
+The correctors are full Newton iterations on the dense Jacobian, which
+is refactorised in every iteration; an iteration converges when both
+the step and the residual are within tolerance, as in newton.static.
+"""
+
+from typing import NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+
+class Correction(NamedTuple):
+    q: jnp.ndarray
+    lam: jnp.ndarray
+    num_iterations: jnp.ndarray
+    converged: jnp.ndarray
+
+
+def build_correctors(F, jac, args, sett):
+    """Compiled Newton correctors at fixed load and on the Riks plane"""
+
+    if jac is None:
+        jac = jax.jacfwd(F)
+
+    def residual(q, lam):
+        return F(q, args + (lam,))
+
+    def jacobian(q, lam):
+        return jac(q, args + (lam,))
+
+    def converged(dz, z, r, r0):
+        # the Newton step and the residual within tolerance, as in newton.static
+        return (jnp.linalg.norm(dz) <= sett.atol + sett.rtol * jnp.linalg.norm(z)) & (
+            jnp.linalg.norm(r) <= sett.atol + sett.rtol * jnp.linalg.norm(r0)
+        )
+
+    @jax.jit
+    def load_corrector(q0, lam) -> Correction:
+        def cond(carry):
+            q, r, i, done = carry
+            return (~done) & (i < sett.max_iterations)
+
+        def body(carry):
+            q, r, i, done = carry
+            dq = -jnp.linalg.solve(jacobian(q, lam), r)
+            q = q + dq
+            r1 = residual(q, lam)
+            return q, r1, i + 1, converged(dq, q, r1, r0) & jnp.all(jnp.isfinite(q))
+
+        r0 = residual(q0, lam)
+        q, r, i, done = jax.lax.while_loop(
+            cond, body, (q0, r0, jnp.array(0), jnp.array(False))
+        )
+        return Correction(q, lam, i, done)
+
+    @jax.jit
+    def arclength_corrector(q0, lam0, tq, tl) -> Correction:
+        # iterations on the plane normal to the tangent (tq, tl) at the predictor
+        psi2 = sett.psi**2
+
+        def augmented_residual(q, lam):
+            g = tq @ (q - q0) + psi2 * tl * (lam - lam0)
+            return jnp.hstack([residual(q, lam), g])
+
+        def cond(carry):
+            q, lam, r, i, done = carry
+            return (~done) & (i < sett.max_iterations)
+
+        def body(carry):
+            q, lam, r, i, done = carry
+            J = jacobian(q, lam)
+            F_lam = jax.jacfwd(residual, argnums=1)(q, lam)
+            Ja = jnp.block([[J, F_lam[:, None]], [tq[None, :], psi2 * tl[None, None]]])
+            dz = -jnp.linalg.solve(Ja, r)
+            q = q + dz[:-1]
+            lam = lam + dz[-1]
+            r1 = augmented_residual(q, lam)
+            done = converged(dz, jnp.hstack([q, lam]), r1, r0) & jnp.all(jnp.isfinite(q))
+            return q, lam, r1, i + 1, done
+
+        r0 = augmented_residual(q0, lam0)
+        q, lam, r, i, done = jax.lax.while_loop(
+            cond, body, (q0, lam0, r0, jnp.array(0), jnp.array(False))
+        )
+        return Correction(q, lam, i, done)
+
+    @jax.jit
+    def load_tangent(q, lam):
+        F_lam = jax.jacfwd(residual, argnums=1)(q, lam)
+        return -jnp.linalg.solve(jacobian(q, lam), F_lam)
+
+    return load_corrector, arclength_corrector, load_tangent
+
+
+def _step_factor(num_iterations: int, sett) -> float:
+    """Increment growth from the Newton iterations of the last increment"""
+
+    factor = np.sqrt(sett.target_iterations / max(num_iterations, 1))
+    return float(np.clip(factor, 0.5, 2.0))
+
+
+def solve(F, jac, args, q0, lam_start: float, loads, sett):
+    """Follows the equilibrium from (q0, lam_start) up to max(loads)
+
+    Parameters
+    ----------
+    F : callable
+        Static residual, F(q, args + (lambda,))
+    jac : callable
+        Analytic Jacobian with the same signature, forward AD if None
+    args : tuple
+        Arguments of F without the load parameter
+    q0 : jax.Array
+        Equilibrium state at lam_start
+    lam_start : float
+        Load parameter of q0
+    loads : jax.Array
+        Requested load levels
+    sett : DContinuation
+        Continuation settings
+
+    Returns
+    -------
+    tuple
+        States at the loads (len(loads) x num_states) and a dict with the
+        number of increments, rejected increments and Newton iterations
+
+    """
+
+    load_corrector, arclength_corrector, load_tangent = build_correctors(
+        F, jac, args, sett
+    )
+    loads = np.asarray(loads, dtype=float)
+    lam_end = float(loads.max())
+    load_range = lam_end - lam_start
+    h = sett.initial_step if sett.initial_step is not None else 0.1 * load_range
+    max_step = sett.max_step if sett.max_step is not None else load_range
+    min_step = sett.min_step if sett.min_step is not None else 1e-6 * load_range
+    stats = dict(num_increments=0, num_rejected=0, num_iterations=0)
+    path_lam = [lam_start]
+    path_q = [jnp.asarray(q0)]
+    if sett.method == "arclength":
+        tq = load_tangent(path_q[0], lam_start)
+        tl = 1.0
+        norm = np.sqrt(float(tq @ tq) + sett.psi**2)
+        tq, tl = tq / norm, tl / norm
+        ds = h * norm  # lambda increment of the first step is h
+        max_ds = max_step * norm
+        min_ds = min_step * norm
+    while path_lam[-1] < lam_end - 1e-12 * abs(load_range):
+        if stats["num_increments"] >= sett.max_increments:
+            raise ValueError(f"continuation did not reach the load {lam_end}")
+        q, lam = path_q[-1], path_lam[-1]
+        if sett.method == "arclength":
+            q_pred = q + ds * tq
+            lam_pred = lam + ds * tl
+            sol = arclength_corrector(q_pred, jnp.asarray(lam_pred), tq, jnp.asarray(tl))
+        else:
+            h = min(h, lam_end - lam)
+            q_pred = q
+            if sett.predictor == "secant" and len(path_q) > 1:
+                q_pred = q + (q - path_q[-2]) * h / (lam - path_lam[-2])
+            sol = load_corrector(q_pred, jnp.asarray(lam + h))
+        num_iterations = int(sol.num_iterations)
+        stats["num_iterations"] += num_iterations
+        if not bool(sol.converged):
+            stats["num_rejected"] += 1
+            if sett.method == "arclength":
+                ds *= 0.5
+                too_small = ds < min_ds
+            else:
+                h *= 0.5
+                too_small = h < min_step
+            if too_small:
+                raise ValueError(f"continuation failed at load {lam}, increment too small")
+            continue
+        stats["num_increments"] += 1
+        path_q.append(sol.q)
+        path_lam.append(float(sol.lam))
+        factor = _step_factor(num_iterations, sett)
+        if sett.method == "arclength":
+            # secant tangent, keeping the direction along the path
+            dq = sol.q - q
+            dlam = path_lam[-1] - lam
+            norm = np.sqrt(float(dq @ dq) + sett.psi**2 * dlam**2)
+            tq, tl = dq / norm, dlam / norm
+            ds = min(ds * factor, max_ds)
+        else:
+            h = min(h * factor, max_step)
+    qs = []
+    for load in loads:
+        qs.append(_interpolate(path_lam, path_q, load))
+        if sett.correct:
+            sol = load_corrector(qs[-1], jnp.asarray(load))
+            stats["num_iterations"] += int(sol.num_iterations)
+            if not bool(sol.converged):
+                raise ValueError(f"continuation correction at load {load} did not converge")
+            qs[-1] = sol.q
+    return jnp.stack(qs), stats
+
+
+def _interpolate(path_lam, path_q, load):
+    """Linear interpolation at the first path segment crossing the load"""
+
+    for i in range(len(path_lam) - 1):
+        lam_a, lam_b = path_lam[i], path_lam[i + 1]
+        if (lam_a - load) * (lam_b - load) <= 0 and lam_a != lam_b:
+            w = (load - lam_a) / (lam_b - lam_a)
+            return path_q[i] + w * (path_q[i + 1] - path_q[i])
+    if load == path_lam[0]:
+        return path_q[0]
+    raise ValueError(f"load {load} not reached in the continuation")
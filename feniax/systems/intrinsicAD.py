@@ -9,6 +9,7 @@ import feniax.intrinsic.initcond as initcond
 import feniax.intrinsic.args as libargs
 import feniax.intrinsic.objectives as objectives
 from functools import partial
+import time
 import jax
 import jax.numpy as jnp
 
@@ -72,24 +73,51 @@ class IntrinsicADSystem(System, cls_name="AD_intrinsic"):
 
     def solve(self):
         fprime = self.eqsolver(self.dFq, has_aux=True)  # call to jax.grad..etc
+        static_args = dict(
+            config=self.config,
+            f_obj=self.f_obj,
+            obj_args=self.settings.ad.objective_args,
+        )
+        self.ad_stats = None
+        if self.settings.ad.profile:
+            out = self._solve_profile(fprime, static_args)
+        else:
+            out = fprime(self.settings.ad.inputs, q0=self.q0, **static_args)
         if self.settings.ad.grad_type == "value_grad":
-            ((val, fout), jac) = fprime(
-                self.settings.ad.inputs,
-                q0=self.q0,
-                config=self.config,
-                f_obj=self.f_obj,
-                obj_args=self.settings.ad.objective_args,
-            )
+            ((val, fout), jac) = out
         else:
-            jac, fout = fprime(
-                self.settings.ad.inputs,
-                q0=self.q0,
-                config=self.config,
-                f_obj=self.f_obj,
-                obj_args=self.settings.ad.objective_args,
-            )
+            jac, fout = out
         self.build_solution(jac, *fout)
 
+    def _solve_profile(self, fprime, static_args):
+        """Compiled ahead of time to record the times and memory in ad_stats"""
+
+        time0 = time.perf_counter()
+        compiled = (
+            jax.jit(fprime, static_argnames=list(static_args.keys()))
+            .lower(self.settings.ad.inputs, q0=self.q0, **static_args)
+            .compile()
+        )
+        time1 = time.perf_counter()
+        out = compiled(self.settings.ad.inputs, q0=self.q0)
+        jax.block_until_ready(out)
+        time2 = time.perf_counter()
+        self.ad_stats = dict(
+            adjoint=self.settings.ad.adjoint,
+            checkpoints=self.settings.ad.checkpoints,
+            compile_time=time1 - time0,
+            run_time=time2 - time1,
+        )
+        memory = compiled.memory_analysis()
+        if memory is not None:
+            self.ad_stats.update(
+                temp_size=memory.temp_size_in_bytes,
+                argument_size=memory.argument_size_in_bytes,
+                output_size=memory.output_size_in_bytes,
+            )
+        print(f"***** AD statistics: {self.ad_stats} *****")
+        return out
+
     def save(self):
         pass
 
@@ -122,6 +150,7 @@ class StaticADIntrinsic(IntrinsicADSystem, cls_name="staticAD_intrinsic"):
             Cab=Cab,
             ra=ra,
             f_ad=objective,
+            ad_stats=self.ad_stats,
         )
         if self.settings.save:
             self.sol.save_container("StaticSystem", label="_" + self.name)
@@ -150,6 +179,7 @@ class DynamicADIntrinsic(IntrinsicADSystem, cls_name="dynamicAD_intrinsic"):
             Cab=Cab,
             ra=ra,
             f_ad=objective,
+            ad_stats=self.ad_stats,
         )
         if self.settings.save:
             self.sol.save_container("DynamicSystem", label="_" + self.name)
@@ -1,3 +1,4 @@
+import pathlib
 from functools import partial
 
 import feniax.intrinsic.args as libargs
@@ -7,11 +8,14 @@ import feniax.intrinsic.initcond as initcond
 import feniax.intrinsic.postprocess as postprocess
 import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
 import feniax.preprocessor.solution as solution
+import feniax.preprocessor.streaming as streaming
+import feniax.systems.continuation as continuation
 import feniax.systems.sollibs as sollibs
 import feniax.intrinsic.xloads as xloads
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 from feniax.systems.system import System
 
 
@@ -26,6 +30,27 @@ def _staticSolve(eqsolver, dq, t_loads, q0, dq_args, sett):
     return qs
 
 
+def _staticSolveState(
+    eqsolver, dq, t_loads, q0, dq_args, sett, jac=None, solver_state=None
+):
+    """Load stepping carrying the solver state (e.g. a factorised Jacobian)
+
+    Returns the states at the load steps and the final solver state.
+    """
+
+    def _iter(carry, t):
+        qim1, state = carry
+        args = dq_args + (t,)
+        sol = eqsolver(dq, qim1, args, sett, jac=jac, state=state)
+        qi = jnp.array(sol.value)
+        if state is not None:
+            state = sol.state
+        return (qi, state), qi
+
+    (qcarry, state), qs = jax.lax.scan(_iter, (q0, solver_state), jnp.array(t_loads))
+    return qs, state
+
+
 @partial(jax.jit, static_argnames=["config", "tn"])
 def recover_fields(q1, q2, tn, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config):
     ra0 = jnp.broadcast_to(X[0], (tn, 3))
@@ -38,7 +63,7 @@ def recover_fields(q1, q2, tn, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config):
 
     return X1, X2, X3, ra, Cab
 
-@partial(jax.jit, static_argnames=["config", "tn", "dt"])
+@partial(jax.jit, static_argnames=["config", "tn"])
 def recover_fieldsRB(q1, q2, tn, dt, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config):
     ra_n0 = X[0]
     Rab_n0 = jnp.eye(3)
@@ -60,6 +85,24 @@ def recover_fieldsRB(q1, q2, tn, dt, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, con
     )
     return X1, X2, X3, ra, Cab
 
+@partial(jax.jit, static_argnames=["config", "tn"])
+def recover_fields_batch(q1, q2, tn, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config):
+    """recover_fields of a batch of cases (leading axis of q1 and q2)"""
+
+    return jax.vmap(recover_fields, in_axes=(0, 0) + (None,) * 8)(
+        q1, q2, tn, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config
+    )
+
+
+@partial(jax.jit, static_argnames=["config", "tn"])
+def recover_fieldsRB_batch(q1, q2, tn, dt, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config):
+    """recover_fieldsRB of a batch of cases (leading axis of q1 and q2)"""
+
+    return jax.vmap(recover_fieldsRB, in_axes=(0, 0) + (None,) * 9)(
+        q1, q2, tn, dt, X, phi1l, phi2l, psi2l, X_xdelta, C0ab, config
+    )
+
+
 @partial(jax.jit, static_argnames=["config", "tn"])
 def recover_staticfields(q2, tn, X, phi2l, psi2l, X_xdelta, C0ab, config):
     ra0 = jnp.broadcast_to(X[0], (tn, 3))
@@ -79,6 +122,15 @@ def recover_staticfields(q2, tn, X, phi2l, psi2l, X_xdelta, C0ab, config):
     return X2, X3, ra, Cab
 
 
+@partial(jax.jit, static_argnames=["config", "tn"])
+def recover_staticfields_batch(q2, tn, X, phi2l, psi2l, X_xdelta, C0ab, config):
+    """recover_staticfields of a batch of cases (leading axis of q2)"""
+
+    return jax.vmap(recover_staticfields, in_axes=(0,) + (None,) * 7)(
+        q2, tn, X, phi2l, psi2l, X_xdelta, C0ab, config
+    )
+
+
 class IntrinsicSystem(System, cls_name="intrinsic"):
     def __init__(
         self,
@@ -148,27 +200,110 @@ class IntrinsicSystem(System, cls_name="intrinsic"):
         else:
             self.q0 = q0
 
+    def batch_inputs(self):
+        """Stacked per-case q0, eta0 and load scaling of the batch settings"""
+
+        batch = self.settings.batch
+        num_cases = batch.num_cases
+        q0 = batch.q0
+        if q0 is None:
+            q0 = jnp.broadcast_to(self.q0, (num_cases, len(self.q0)))
+        eta0 = batch.eta0
+        if eta0 is None:
+            eta0 = jnp.broadcast_to(self.eta0, (num_cases, len(self.eta0)))
+        load_scaling = batch.load_scaling
+        if load_scaling is None:
+            load_scaling = jnp.ones(num_cases)
+        return q0, eta0, load_scaling
+
+    def batch_args(self):
+        """Flattened args1 and a function rebuilding them for one case
+
+        eta_0 and the external loads (point forces and gust loads,
+        libargs.LOAD_ARGS) are located by their field names in the
+        libargs.Args_<label> of the label. Only the forces of the sparse
+        point loads and the amplitude of the analytic gust are scaled.
+
+        Returns
+        -------
+        leaves : list
+            Leaves of args1
+        build_args : callable
+            build_args(leaves, eta0, load_scaling) -> args of the case
+        """
+
+        leaves_path, treedef = jax.tree_util.tree_flatten_with_path(self.args1)
+        if self.settings.solver_library == "scipy":  # args wrapped in a tuple
+            leaves_path = [(path[1:], li) for path, li in leaves_path]
+        kind = []
+        for path, li in leaves_path:
+            name = path[0].name  # field of the Args_<label> tuple
+            if name == "eta_0":
+                kind.append("eta0")
+            elif name in libargs.LOAD_ARGS and (
+                len(path) == 1 or getattr(path[-1], "name", None) in ("force", "amplitude")
+            ):
+                kind.append("load")
+            else:
+                kind.append(None)
+        batch = self.settings.batch
+        if batch.eta0 is not None and "eta0" not in kind:
+            raise ValueError(f"eta_0 is not an argument of system label {self.settings.label}")
+        if batch.load_scaling is not None and "load" not in kind:
+            raise ValueError(
+                f"no external loads ({', '.join(libargs.LOAD_ARGS)}) in the arguments "
+                f"of system label {self.settings.label} to apply load_scaling"
+            )
+        leaves = [li for path, li in leaves_path]
+
+        def build_args(leaves, eta0, load_scaling):
+            leaves_case = []
+            for k, li in zip(kind, leaves):
+                if k == "eta0":
+                    leaves_case.append(eta0)
+                elif k == "load":
+                    leaves_case.append(load_scaling * li)
+                else:
+                    leaves_case.append(li)
+            return jax.tree_util.tree_unflatten(treedef, leaves_case)
+
+        return leaves, build_args
+
     def set_xloading(self, compute_follower=True, compute_dead=True, compute_gravity=True):
 
         force_follower = None
         force_dead = None
         force_gravity = None
+        follower_index = None
+        dead_index = None
         if self.settings.xloads.follower_forces and compute_follower:
-           # self.settings.xloads.build_point_follower(
-           #     self.fem.num_nodes, self.sol.data.modes.C06ab
-           # )           
-           force_follower = xloads.build_point_follower(self.settings.xloads.x,
-                                                         self.settings.xloads.follower_points,
-                                                         self.settings.xloads.follower_interpolation,
-                                                         self.fem.num_nodes,
-                                                         self.sol.data.modes.C06ab
-                                                         )
+            if self.settings.xloads.sparse:
+                follower_index, force_follower = xloads.sparse_point_forces(
+                    self.settings.xloads.x,
+                    self.settings.xloads.follower_points,
+                    self.settings.xloads.follower_interpolation,
+                    self.sol.data.modes.C06ab
+                )
+            else:
+                force_follower = xloads.build_point_follower(self.settings.xloads.x,
+                                                             self.settings.xloads.follower_points,
+                                                             self.settings.xloads.follower_interpolation,
+                                                             self.fem.num_nodes,
+                                                             self.sol.data.modes.C06ab
+                                                             )
         if self.settings.xloads.dead_forces and compute_dead:
-            force_dead = xloads.build_point_dead(self.settings.xloads.x,
-                                                 self.settings.xloads.dead_points,
-                                                 self.settings.xloads.dead_interpolation,
-                                                 self.fem.num_nodes,
-                                                 )
+            if self.settings.xloads.sparse:
+                dead_index, force_dead = xloads.sparse_point_forces(
+                    self.settings.xloads.x,
+                    self.settings.xloads.dead_points,
+                    self.settings.xloads.dead_interpolation
+                )
+            else:
+                force_dead = xloads.build_point_dead(self.settings.xloads.x,
+                                                     self.settings.xloads.dead_points,
+                                                     self.settings.xloads.dead_interpolation,
+                                                     self.fem.num_nodes,
+                                                     )
         if self.settings.xloads.gravity_forces and compute_gravity:
             if self.fem.constrainedDoF:
                 force_gravity = xloads.build_gravity(self.settings.xloads.x,
@@ -187,7 +322,9 @@ class IntrinsicSystem(System, cls_name="intrinsic"):
             force_follower=force_follower,
             force_dead=force_dead,
             force_gravity=force_gravity,
-            x=self.settings.xloads.x
+            x=self.settings.xloads.x,
+            follower_index=follower_index,
+            dead_index=dead_index
         )
 
     def set_states(self):
@@ -220,6 +357,25 @@ class IntrinsicSystem(System, cls_name="intrinsic"):
     def save(self):
         pass
 
+    def _restart(self, checkpoint: streaming.Checkpoint = None):
+        """States, index and variables stored at the checkpoint in restart_from
+
+        The states are carried to checkpoint (if any) so that the current
+        run can be restarted too.
+        """
+
+        path = pathlib.Path(self.settings.restart_from) / f"Checkpoint_{self.name}"
+        if checkpoint is not None and checkpoint.path.resolve() == path.resolve():
+            checkpoint_r = checkpoint
+        else:
+            checkpoint_r = streaming.Checkpoint(path)
+        qs, state = checkpoint_r.load()
+        i_start = len(qs) - 1
+        print(f"***** Restarting system {self.name} from t={state['t']} *****")
+        if checkpoint is not None and checkpoint is not checkpoint_r:
+            checkpoint.save(qs, i_start, **state)
+        return [jnp.array(qs)], i_start, state
+
 
 class StaticIntrinsic(IntrinsicSystem, cls_name="static_intrinsic"):
     # def set_ic(self, q0):
@@ -244,22 +400,169 @@ class StaticIntrinsic(IntrinsicSystem, cls_name="static_intrinsic"):
         label = f"dq_{self.settings.label}"
         print(f"***** Setting intrinsinc static system with label {label}")
         self.dFq = getattr(dq_static, label)
+        self.jac = getattr(dq_static, f"jac_{self.settings.label}", None)
+        self.solver_stats = None
+
+    def _solve_loads(self, t_loads, q0, args1, solver_state=None):
+        """States at t_loads and the solver state carried after them"""
+
+        if solver_state is None:
+            solver_state = sollibs.init_state(self.settings.solver_library, q0)
+        # only the newton library takes the analytic Jacobian
+        jac = self.jac if self.settings.solver_library == "newton" else None
+        qs, solver_state = _staticSolveState(
+            self.eqsolver,
+            self.dFq,
+            t_loads,
+            q0,
+            args1,
+            self.settings.solver_settings,
+            jac=jac,
+            solver_state=solver_state,
+        )
+        return qs, solver_state
+
+    def _set_solver_stats(self, solver_state):
+        if (num_factorisations := getattr(solver_state, "num_factorisations", None)) is None:
+            return
+        self.solver_stats = dict(
+            num_factorisations=num_factorisations.tolist(),
+            num_iterations=solver_state.num_iterations.tolist(),
+        )
+        print(
+            f"***** Static solution with {self.solver_stats['num_factorisations']} "
+            f"Jacobian factorisations, {self.solver_stats['num_iterations']} iterations"
+        )
 
     def solve(self):
         # label = self.settings.label.split("_")[-1]
         # solver_args = getattr(libargs, f"arg_{label}")
         # args1 = solver_args(self.sol, self.settings, self.fem, eta_0=self.eta0)
+        if self.settings.batch is not None:
+            self.solve_batch()
+            return
+        if self.settings.continuation is not None:
+            self.solve_continuation()
+            return
+        if (
+            self.settings.checkpoint_steps is not None
+            or self.settings.restart_from is not None
+        ):
+            self.solve_checkpoints()
+            return
+        self.qs, solver_state = self._solve_loads(self.settings.t, self.q0, self.args1)
+        self._set_solver_stats(solver_state)
+        self.build_solution()
 
-        self.qs = _staticSolve(
-            self.eqsolver,
+    def solve_continuation(self):
+        """Adaptive load stepping or arc-length continuation up to settings.t"""
+
+        self.qs, stats = continuation.solve(
             self.dFq,
-            self.settings.t,
-            self.q0,
+            self.jac,
             self.args1,
-            self.settings.solver_settings,
+            self.q0,
+            self.settings.continuation.start,
+            self.settings.t,
+            self.settings.continuation,
+        )
+        self.solver_stats = stats
+        print(
+            f"***** Continuation with {stats['num_increments']} increments "
+            f"({stats['num_rejected']} rejected), {stats['num_iterations']} Newton iterations"
         )
         self.build_solution()
 
+    def solve_checkpoints(self):
+        """Load stepping with the converged states checkpointed to sol_path
+
+        Every checkpoint_steps load steps the states are saved to the
+        Checkpoint folder, together with the solver state carried across
+        load steps (e.g. the factorised Jacobian of the newton library),
+        such that a run resumed with restart_from after the last
+        converged load step stored there takes the same iterations as an
+        uninterrupted one.
+        """
+
+        sett = self.settings
+        if getattr(self.sol, "path", None) is None:
+            raise ValueError(f"Checkpointing of system {self.name} requires a sol_path")
+        t = np.asarray(sett.t)
+        steps = sett.checkpoint_steps or len(t)
+        checkpoint = None
+        if sett.checkpoint_steps is not None:
+            checkpoint = streaming.Checkpoint(self.sol.path / f"Checkpoint_{self.name}")
+        i_start = 0
+        q0 = self.q0
+        qs_list = []
+        solver_state = None
+        if sett.restart_from is not None:
+            qs_list, i_last, state = self._restart(checkpoint)
+            i_start = i_last + 1
+            q0 = qs_list[0][-1]
+            solver_state = sollibs.init_state(sett.solver_library, q0)
+            if solver_state is not None:
+                solver_state = solver_state._replace(
+                    **{k: jnp.asarray(state[f"solver_{k}"]) for k in solver_state._fields}
+                )
+        for i0 in range(i_start, len(t), steps):
+            i1 = min(i0 + steps, len(t))
+            qs, solver_state = self._solve_loads(t[i0:i1], q0, self.args1, solver_state)
+            qs_list.append(qs)
+            if checkpoint is not None:
+                solver_vars = dict()
+                if solver_state is not None:
+                    solver_vars = {f"solver_{k}": v for k, v in solver_state._asdict().items()}
+                checkpoint.save(qs, i1 - 1, t=t[i1 - 1], **solver_vars)
+                print(f"***** Checkpoint at t={t[i1 - 1]} saved to {checkpoint.path} *****")
+            q0 = qs[-1]
+        self.qs = jnp.vstack(qs_list)
+        self._set_solver_stats(solver_state)
+        self.build_solution()
+
+    def solve_batch(self):
+        """Solves all the cases in settings.batch in one compiled call"""
+
+        q0, eta0, load_scaling = self.batch_inputs()
+        leaves, build_args = self.batch_args()
+
+        def _solve(q0, eta0, load_scaling, leaves):
+            return self._solve_loads(
+                self.settings.t, q0, build_args(leaves, eta0, load_scaling)
+            )
+
+        self.qs, solver_state = jax.jit(jax.vmap(_solve, in_axes=(0, 0, 0, None)))(
+            q0, eta0, load_scaling, leaves
+        )
+        self._set_solver_stats(solver_state)
+        self.build_solution_batch()
+
+    def build_solution_batch(self):
+        q2 = self.qs[:, :, self.settings.states["q2"]]
+        X2, X3, ra, Cab = recover_staticfields_batch(
+            q2,
+            self.qs.shape[1],
+            self.fem.X,
+            self.sol.data.modes.phi2l,
+            self.sol.data.modes.psi2l,
+            self.sol.data.modes.X_xdelta,
+            self.sol.data.modes.C0ab,
+            self.config,
+        )
+        self.sol.add_container(
+            "StaticSystem",
+            label="_" + self.name,
+            q=self.qs,
+            X2=X2,
+            X3=X3,
+            Cab=Cab,
+            ra=ra,
+            t=self.settings.t,
+            solver_stats=self.solver_stats,
+        )
+        if self.settings.save:
+            self.sol.save_container("StaticSystem", label="_" + self.name)
+
     def solve_forloop(self):
         label = self.settings.label.split("_")[-1]
         solver_args = getattr(libargs, f"arg_{label}")
@@ -296,6 +599,7 @@ class StaticIntrinsic(IntrinsicSystem, cls_name="static_intrinsic"):
             X3=X3,
             Cab=Cab,
             ra=ra,
+            solver_stats=self.solver_stats,
         )
         if self.settings.save:
             self.sol.save_container("StaticSystem", label="_" + self.name)
@@ -361,11 +665,25 @@ class DynamicIntrinsic(IntrinsicSystem, cls_name="dynamic_intrinsic"):
         label = f"dq_{self.settings.label}"
         print(f"***** Setting intrinsinc Dynamic system with label {label}")
         self.dFq = getattr(dq_dynamic, label)
+        self.jac = getattr(dq_dynamic, f"jac_{self.settings.label}", None)
 
     def solve(self):
         # label = self.settings.label.split("_")[-1]
         # solver_args = getattr(libargs, f"arg_{label}")
         # args1 = solver_args(self.sol, self.settings, self.fem, eta_0=self.eta0)
+        if self.settings.batch is not None:
+            self.solve_batch()
+            return
+        if (
+            self.settings.segment_time is not None
+            or self.settings.checkpoint_steps is not None
+            or self.settings.restart_from is not None
+        ):
+            self.solve_segments()
+            return
+        solver_kwargs = dict()
+        if self.settings.events is not None:
+            solver_kwargs["events"] = self.build_events()
         sol = self.eqsolver(
             self.dFq,
             self.args1,
@@ -376,10 +694,108 @@ class DynamicIntrinsic(IntrinsicSystem, cls_name="dynamic_intrinsic"):
             tn=self.settings.tn,
             dt=self.settings.dt,
             t=self.settings.t,
+            jac=self.jac,
+            **solver_kwargs,
         )
         self.qs = self.states_puller(sol)
+        self.ts = sol.ts
+        if self.settings.events is not None:
+            self.ts, self.qs = sollibs.trim_events(self.ts, self.qs)
         self.build_solution()
 
+    def build_events(self) -> tuple[callable]:
+        """Scalar event functions g(t, q) from settings.events"""
+
+        if self.settings.solver_library not in ("diffrax", "runge_kutta"):
+            raise ValueError(
+                f"events not available in {self.settings.solver_library} solver library"
+            )
+        events = self.settings.events
+        q1_index = self.settings.states["q1"]
+        q2_index = self.settings.states["q2"]
+        functions = []
+        if events.energy is not None:
+
+            def energy(t, q):
+                q1 = q[q1_index]
+                q2 = q[q2_index]
+                e = 0.5 * (q1.dot(q1) + q2.dot(q2))
+                return jnp.where(t >= events.energy_time, e - events.energy, 1.0)
+
+            functions.append(energy)
+        for node, component, value in events.X2 or []:
+            phi2l_i = self.sol.data.modes.phi2l[:, component, node]
+
+            def X2(t, q, phi2l_i=phi2l_i, value=value):
+                return phi2l_i.dot(q[q2_index]) - value
+
+            functions.append(X2)
+        functions += list(events.functions or [])
+        return tuple(functions)
+
+    def solve_batch(self):
+        """Solves all the cases in settings.batch in one compiled call"""
+
+        if self.settings.events is not None:
+            raise ValueError(f"events not supported in batched solution of {self.name}")
+        q0, eta0, load_scaling = self.batch_inputs()
+        leaves, build_args = self.batch_args()
+
+        def _solve(q0, eta0, load_scaling, leaves):
+            sol = self.eqsolver(
+                self.dFq,
+                build_args(leaves, eta0, load_scaling),
+                self.settings.solver_settings,
+                q0=q0,
+                t0=self.settings.t0,
+                t1=self.settings.t1,
+                tn=self.settings.tn,
+                dt=self.settings.dt,
+                t=self.settings.t,
+                jac=self.jac,
+            )
+            return self.states_puller(sol), sol.ts
+
+        self.qs, ts = jax.jit(jax.vmap(_solve, in_axes=(0, 0, 0, None)))(
+            q0, eta0, load_scaling, leaves
+        )
+        self.ts = ts[0]
+        self.build_solution_batch()
+
+    def build_solution_batch(self):
+        q1 = self.qs[:, :, self.settings.states["q1"]]
+        q2 = self.qs[:, :, self.settings.states["q2"]]
+        modes = self.sol.data.modes
+        field_args = (
+            self.fem.X,
+            modes.phi1l,
+            modes.phi2l,
+            modes.psi2l,
+            modes.X_xdelta,
+            modes.C0ab,
+            self.config,
+        )
+        tn = self.qs.shape[1]
+        if self.settings.bc1.lower() == "clamped":
+            X1, X2, X3, ra, Cab = recover_fields_batch(q1, q2, tn, *field_args)
+        else:
+            # per-interval steps, save times need not be uniform
+            dt = jnp.diff(self.ts)
+            X1, X2, X3, ra, Cab = recover_fieldsRB_batch(q1, q2, tn, dt, *field_args)
+        self.sol.add_container(
+            "DynamicSystem",
+            label="_" + self.name,
+            q=self.qs,
+            X1=X1,
+            X2=X2,
+            X3=X3,
+            Cab=Cab,
+            ra=ra,
+            t=self.ts,
+        )
+        if self.settings.save:
+            self.sol.save_container("DynamicSystem", label="_" + self.name)
+
     def build_solution_loop(self):
         # return
         # q1 = qs[self.settings.q1_index, :]
@@ -413,45 +829,33 @@ class DynamicIntrinsic(IntrinsicSystem, cls_name="dynamic_intrinsic"):
         if self.settings.save:
             self.sol.save_container("DynamicSystem", label="_" + self.name)
 
-    def build_solution(self):
-        # q1_index = self.settings.states['q1']
-        # q2_index = self.settings.states['q2']
-        # q1 = self.qs[:, q1_index]
-        # q2 = self.qs[:, q2_index]
-        # tn = len(self.qs)
-        # X1, X2, X3, ra, Cab = recover_fields(q1,
-        #                                      q2,
-        #                                      tn,
-        #                                      self.fem.X,
-        #                                      self.sol.data.modes.phi1l,
-        #                                      self.sol.data.modes.phi2l,
-        #                                      self.sol.data.modes.psi2l,
-        #                                      self.sol.data.modes.X_xdelta,
-        #                                      self.sol.data.modes.C0ab,
-        #                                      self.config
-        #                                      )
+    def recover_fields(self, qs, ts, ra_n0=None, Rab_n0=None):
+        """Velocities, internal forces, strains and positions from the states
+
+        ra_n0 and Rab_n0 are the position and orientation of the first
+        node at ts[0] in free-flying systems, the reference ones if None
+        """
 
-        # q1 = qs[self.settings.q1_index, :]
-        # q2 = qs[self.settings.q2_index, :]
         X1 = postprocess.compute_velocities(
-            self.sol.data.modes.phi1l, self.qs[:, self.settings.states["q1"]]
+            self.sol.data.modes.phi1l, qs[:, self.settings.states["q1"]]
         )
         X2 = postprocess.compute_internalforces(
-            self.sol.data.modes.phi2l, self.qs[:, self.settings.states["q2"]]
+            self.sol.data.modes.phi2l, qs[:, self.settings.states["q2"]]
         )
         X3 = postprocess.compute_strains(
-            self.sol.data.modes.psi2l, self.qs[:, self.settings.states["q2"]]
+            self.sol.data.modes.psi2l, qs[:, self.settings.states["q2"]]
         )
         if self.settings.bc1.lower() == "clamped":
-            tn = len(self.qs)
+            tn = len(qs)
             ra0 = jnp.broadcast_to(self.fem.X[0], (tn, 3))
             Cab0 = jnp.broadcast_to(jnp.eye(3), (tn, 3, 3))
         else:
             if self.settings.rb_treatment == 1:
-                ra_n0 = self.fem.X[0]
-                Rab_n0 = jnp.eye(3)
+                if ra_n0 is None:
+                    ra_n0 = self.fem.X[0]
+                    Rab_n0 = jnp.eye(3)
                 Cab0, ra0 = postprocess.integrate_node0(
-                    X1[:, :, 0], self.settings.dt, ra_n0, Rab_n0
+                    X1[:, :, 0], jnp.diff(ts), ra_n0, Rab_n0
                 )
         Cab, ra = postprocess.integrate_strains_t(
             ra0,
@@ -461,6 +865,114 @@ class DynamicIntrinsic(IntrinsicSystem, cls_name="dynamic_intrinsic"):
             self.sol.data.modes.C0ab,
             self.config,
         )
+        return X1, X2, X3, Cab, ra
+
+    def solve_segments(self):
+        """Integrates by segments streaming the fields and/or checkpointing
+
+        Segments are settings.segment_time long, or checkpoint_steps time
+        steps otherwise, and the final state of each one is the initial
+        state of the next. With segment_time the states and fields are
+        appended to the DynamicSystem folder in sol_path after every
+        segment and memory-mapped at the end; with checkpoint_steps the
+        states are saved to the Checkpoint folder, from which a later run
+        with restart_from resumes.
+        """
+
+        sett = self.settings
+        if getattr(self.sol, "path", None) is None:
+            raise ValueError(f"Segmented solution of system {self.name} requires a sol_path")
+        if sett.events is not None:
+            raise ValueError(f"events not supported in segmented solution of {self.name}")
+        if (
+            getattr(sett.solver_settings, "save_at", None) is not None
+            or getattr(sett.solver_settings, "save_stride", 1) != 1
+        ):
+            raise ValueError(
+                f"save_at and save_stride not supported in segmented solution of {self.name}"
+            )
+        if sett.segment_time is not None:
+            segment_steps = max(1, round(sett.segment_time / sett.dt))
+        elif sett.checkpoint_steps is not None:
+            segment_steps = sett.checkpoint_steps
+        else:
+            segment_steps = sett.tn - 1
+        t = np.asarray(sett.t)
+        checkpoint = None
+        if sett.checkpoint_steps is not None:
+            checkpoint = streaming.Checkpoint(self.sol.path / f"Checkpoint_{self.name}")
+        i_start = 0
+        q0 = self.q0
+        ra_n0, Rab_n0 = None, None
+        qs_list = []
+        if sett.restart_from is not None:
+            qs_list, i_start, state = self._restart(checkpoint)
+            q0 = qs_list[0][-1]
+            ra_n0, Rab_n0 = state.get("ra_n0"), state.get("Rab_n0")
+        stream = None
+        if sett.segment_time is not None:
+            stream_path = self.sol.path / f"DynamicSystem_{self.name}"
+            if i_start > 0:
+                source = pathlib.Path(sett.restart_from) / f"DynamicSystem_{self.name}"
+                if source.resolve() != stream_path.resolve():
+                    # restarting in a new sol_path, carry the streamed fields
+                    streaming.copy_container(source, stream_path, i_start + 1)
+            stream = streaming.ContainerStream(
+                stream_path,
+                num_rows=None if i_start == 0 else i_start + 1,
+            )
+        for i0 in range(i_start, sett.tn - 1, segment_steps):
+            i1 = min(i0 + segment_steps, sett.tn - 1)
+            sol = self.eqsolver(
+                self.dFq,
+                self.args1,
+                sett.solver_settings,
+                q0=q0,
+                t0=t[i0],
+                t1=t[i1],
+                tn=i1 - i0 + 1,
+                dt=sett.dt,
+                t=t[i0 : i1 + 1],
+                jac=self.jac,
+            )
+            qs = self.states_puller(sol)
+            first = 0 if i0 == 0 else 1  # initial state already stored
+            if stream is None:
+                qs_list.append(qs[first:])
+            else:
+                ts = sol.ts
+                X1, X2, X3, Cab, ra = self.recover_fields(qs, ts, ra_n0, Rab_n0)
+                stream.append(
+                    q=qs[first:],
+                    X1=X1[first:],
+                    X2=X2[first:],
+                    X3=X3[first:],
+                    Cab=Cab[first:],
+                    ra=ra[first:],
+                    t=ts[first:],
+                )
+                print(f"***** Segment up to t={t[i1]} streamed to {stream.path} *****")
+                ra_n0, Rab_n0 = ra[-1, :, 0], Cab[-1, :, :, 0]
+            if checkpoint is not None:
+                node0 = dict() if ra_n0 is None else dict(ra_n0=ra_n0, Rab_n0=Rab_n0)
+                checkpoint.save(qs[first:], i1, t=t[i1], **node0)
+                print(f"***** Checkpoint at t={t[i1]} saved to {checkpoint.path} *****")
+            q0 = qs[-1]
+        if stream is None:
+            self.qs = jnp.vstack(qs_list)
+            self.ts = jnp.array(t)
+            self.build_solution()
+        else:
+            fields = stream.load()
+            self.qs = fields.pop("q")
+            self.ts = fields.pop("t")
+            self.sol.add_container(
+                "DynamicSystem", label="_" + self.name, q=self.qs, t=self.ts, **fields
+            )
+            # the container is already on disk, no save_container
+
+    def build_solution(self):
+        X1, X2, X3, Cab, ra = self.recover_fields(self.qs, self.ts)
         self.sol.add_container(
             "DynamicSystem",
             label="_" + self.name,
@@ -470,7 +982,7 @@ class DynamicIntrinsic(IntrinsicSystem, cls_name="dynamic_intrinsic"):
             X3=X3,
             Cab=Cab,
             ra=ra,
-            t=self.settings.t,
+            t=self.ts,
         )
         if self.settings.save:
             self.sol.save_container("DynamicSystem", label="_" + self.name)
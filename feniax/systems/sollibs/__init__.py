@@ -1,8 +1,30 @@
 import importlib
 
+import numpy as np
+
 
 def factory(module: str, name: str):
     library = importlib.import_module(f".{module}", __name__)
     function = getattr(library, name)
     states_puller = getattr(library, "pull_" + name)
     return states_puller, function
+
+
+def init_state(module: str, *args):
+    """Solver state carried across calls (e.g. load steps), None if not used"""
+
+    library = importlib.import_module(f".{module}", __name__)
+    if (init := getattr(library, "init_state", None)) is None:
+        return None
+    return init(*args)
+
+
+def trim_events(ts, qs):
+    """Removes the points after an event, where the times are inf
+
+    Host-side counterpart of the events in the solvers, which keep the
+    full output buffer so they can be traced.
+    """
+
+    saved = np.isfinite(np.asarray(ts))
+    return ts[saved], qs[saved]
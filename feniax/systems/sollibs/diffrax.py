@@ -6,6 +6,48 @@ import jax
 dict_norm = dict(linalg_norm=jnp.linalg.norm)
 
 
+def build_controller(sett):
+    """Stepsize controller from the settings
+
+    Either the explicit sett.stepsize_controller {name: kwargs}, or a
+    PIDController when sett.rtol is given, stepping onto sett.jump_ts.
+    None for constant steps of size dt.
+    """
+
+    if (stepsize := sett.stepsize_controller) is not None:
+        _stepsize_controller = getattr(diffrax, list(stepsize.keys())[0])
+        return _stepsize_controller(**list(stepsize.values())[0])
+    elif sett.rtol is not None:
+        jump_ts = None
+        if sett.jump_ts is not None and len(sett.jump_ts) > 0:
+            jump_ts = jnp.asarray(sett.jump_ts)
+        return diffrax.PIDController(
+            rtol=sett.rtol,
+            atol=sett.atol,
+            pcoeff=sett.pcoeff,
+            icoeff=sett.icoeff,
+            dcoeff=sett.dcoeff,
+            dtmin=sett.dtmin,
+            dtmax=sett.dtmax,
+            jump_ts=jump_ts,
+        )
+    return None
+
+
+def build_adjoint(adjoint):
+    """Diffrax adjoint from the AD settings (DtoAD), None for the default"""
+
+    if adjoint is None or adjoint.adjoint is None:
+        return None
+    elif adjoint.adjoint == "recursive_checkpoint":
+        return diffrax.RecursiveCheckpointAdjoint(checkpoints=adjoint.checkpoints)
+    elif adjoint.adjoint == "direct":
+        return diffrax.DirectAdjoint()
+    elif adjoint.adjoint == "backsolve":
+        return diffrax.BacksolveAdjoint()
+    raise ValueError(f"Unknown adjoint {adjoint.adjoint}")
+
+
 def ode(
     F: callable,
     args,
@@ -17,17 +59,18 @@ def ode(
     tn,
     dt,
     # save_at=None,
+    adjoint=None,
+    events=None,
     **kwargs,
 ) -> diffrax.Solution:
     solver_sett = dict()
     diffeqsolve_sett = dict()
     term = diffrax.ODETerm(F)
     if sett.save_at is None:
-        saveat = diffrax.SaveAt(
-            ts=jnp.linspace(t0, t1, tn)
-        )  # diffrax.SaveAt(steps=True) #
+        save_ts = jnp.linspace(t0, t1, tn)
     else:
-        saveat = sett.save_at
+        save_ts = jnp.asarray(sett.save_at)
+    saveat = diffrax.SaveAt(ts=save_ts, dense=sett.dense)
     _solver = getattr(diffrax, sett.solver_name)
     if (root := sett.root_finder) is not None:
         _root_finder = getattr(optx, list(root.keys())[0])
@@ -35,10 +78,14 @@ def ode(
         solver_sett["root_finder"] = root_finder
     solver = _solver(**solver_sett)
 
-    if (stepsize := sett.stepsize_controller) is not None:
-        _stepsize_controller = getattr(optx, list(stepsize.keys())[0])
-        stepsize_controller = _stepsize_controller(**list(stepsize.values())[0])
+    if (stepsize_controller := build_controller(sett)) is not None:
         diffeqsolve_sett["stepsize_controller"] = stepsize_controller
+    if (_adjoint := build_adjoint(adjoint)) is not None:
+        diffeqsolve_sett["adjoint"] = _adjoint
+    if events is not None:
+        diffeqsolve_sett["event"] = diffrax.Event(
+            [lambda t, y, args, g=g, **kw: g(t, y) for g in events]
+        )
 
     sol = diffrax.diffeqsolve(
         term,
@@ -53,6 +100,8 @@ def ode(
         saveat=saveat,
         **diffeqsolve_sett,
     )
+    # with events, the points after the event are not saved (inf) and
+    # are trimmed on the host (see trim_events)
     return sol
 
 
@@ -81,7 +130,14 @@ def ode2(
     return sol
 
 
-def newton(F, q0, args, sett, jac=None, **kwargs):
+def newton(F, q0, args, sett, **kwargs):
+    """optimistix Newton root find of F(q, args) from q0
+
+    optimistix builds the Jacobian by forward AD, it has no hook for a
+    user Jacobian; the analytic ones (jac_<label>) are only used by the
+    newton solver library.
+    """
+
     solver = optx.Newton(
         rtol=sett.rtol, atol=sett.atol, kappa=sett.kappa, norm=dict_norm[sett.norm]
     )
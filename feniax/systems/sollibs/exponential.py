@@ -0,0 +1,183 @@
+"""Exponential integrators treating the linear part of the system exactly
+
+The right-hand side is split as F(t, q) = L q + N(t, q), with L the
+Jacobian of F at q=0 (structural omega terms, aerodynamic stiffness and
+damping, Roger lag decay) and N the remainder (gamma couplings, gust and
+external loads), which is integrated explicitly. The matrix exponentials
+and phi-functions of L are computed once per run, so the step is limited
+by the bandwidth of N and not by the highest frequency of L.
+"""
+
+
+import equinox as eqx
+import jax
+import jax.numpy as jnp
+import jax.scipy.linalg
+import numpy as np
+
+from feniax.systems.sollibs.runge_kutta import (
+    Solution,
+    checkpointed_scan,
+    chunk_intervals,
+    save_times,
+    scan_checkpoints,
+)
+
+
+def linear_operator(f, args, t0, num_states, jac=None):
+    """Jacobian of f at the zero state, L
+
+    From the analytic Jacobian, jac(t, q, args), if given.
+    """
+
+    if jac is not None:
+        return jac(t0, jnp.zeros(num_states), args)
+    return jax.jacfwd(lambda q: f(t0, q, args))(jnp.zeros(num_states))
+
+
+def phi_functions(A, p):
+    """phi_0(A)=expm(A), phi_1(A), ..., phi_p(A)
+
+    From the exponential of the augmented block matrix
+    [[A, I, 0..], [0, 0, I..], ..., [0, 0, ..0]], whose first block row
+    holds phi_k(A) in the k-th column.
+    """
+
+    n = A.shape[0]
+    M = jnp.zeros(((p + 1) * n, (p + 1) * n), dtype=A.dtype)
+    M = M.at[:n, :n].set(A)
+    M = M.at[: p * n, n:].add(jnp.eye(p * n, dtype=A.dtype))
+    expM = jax.scipy.linalg.expm(M)
+    return [expM[:n, k * n : (k + 1) * n] for k in range(p + 1)]
+
+
+def operators(L, h, solver_name):
+    """Precomputed matrices of the scheme for a step h"""
+
+    if solver_name == "lawson4":
+        E2 = jax.scipy.linalg.expm(0.5 * h * L)
+        return dict(E=E2 @ E2, E2=E2)
+    elif solver_name == "etdrk4":
+        E, phi1, phi2, phi3 = phi_functions(h * L, 3)
+        E2, phi1_2 = phi_functions(0.5 * h * L, 1)
+        return dict(
+            E=E,
+            E2=E2,
+            P2=0.5 * h * phi1_2,
+            f1=h * (phi1 - 3 * phi2 + 4 * phi3),
+            f2=h * 2 * (phi2 - 2 * phi3),
+            f3=h * (4 * phi3 - phi2),
+        )
+    elif solver_name == "etd1":
+        E, phi1 = phi_functions(h * L, 1)
+        return dict(E=E, P=h * phi1)
+
+
+def lawson4_step(N, t, y, h, args, ops):
+    """Lawson (integrating factor) classical Runge-Kutta step"""
+
+    E, E2 = ops["E"], ops["E2"]
+    k1 = N(t, y, args)
+    k2 = N(t + 0.5 * h, E2 @ (y + 0.5 * h * k1), args)
+    k3 = N(t + 0.5 * h, E2 @ y + 0.5 * h * k2, args)
+    k4 = N(t + h, E @ y + h * (E2 @ k3), args)
+    return E @ y + h / 6 * (E @ k1 + 2 * (E2 @ (k2 + k3)) + k4)
+
+
+def etdrk4_step(N, t, y, h, args, ops):
+    """Cox-Matthews exponential time differencing RK4 step"""
+
+    Ny = N(t, y, args)
+    a = ops["E2"] @ y + ops["P2"] @ Ny
+    Na = N(t + 0.5 * h, a, args)
+    b = ops["E2"] @ y + ops["P2"] @ Na
+    Nb = N(t + 0.5 * h, b, args)
+    c = ops["E2"] @ a + ops["P2"] @ (2 * Nb - Ny)
+    Nc = N(t + h, c, args)
+    return ops["E"] @ y + ops["f1"] @ Ny + ops["f2"] @ (Na + Nb) + ops["f3"] @ Nc
+
+
+def etd1_step(N, t, y, h, args, ops):
+    """Exponential Euler step"""
+
+    return ops["E"] @ y + ops["P"] @ N(t, y, args)
+
+
+STEPS = dict(lawson4=lawson4_step, etdrk4=etdrk4_step, etd1=etd1_step)
+
+
+@eqx.filter_jit
+def integrate(
+    f, args, q0, L, t_start, h, steps, num_substeps, solver_name, checkpoints=None
+):
+    """Integrates steps[i] (<= num_substeps) steps of size h from each t_start[i]
+
+    Only the states at the end of each chunk of steps are kept.
+    """
+
+    ops = operators(L, h, solver_name)
+    step = STEPS[solver_name]
+
+    def N(t, q, args):
+        return f(t, q, args) - L @ q
+
+    def interval(y, x):
+        ti, ni = x
+
+        def substep(yj, j):
+            yj1 = step(N, ti + j * h, yj, h, args, ops)
+            return jnp.where(j < ni, yj1, yj), None
+
+        y, _ = jax.lax.scan(substep, y, jnp.arange(num_substeps))
+        return y, y
+
+    _, ys = checkpointed_scan(interval, q0, (t_start, steps), checkpoints)
+    return jnp.vstack([q0, ys])
+
+
+def ode(
+    F: callable,
+    args,
+    sett,
+    q0,
+    t0,
+    dt,
+    tn,
+    adjoint=None,
+    jac=None,
+    **kwargs,
+) -> Solution:
+    """Exponential integration with a constant step dt
+
+    Saved times not on the time grid t0 + dt * i are moved to the
+    nearest grid point. The linear operator is taken from the analytic
+    Jacobian jac(t, q, args) when given.
+    """
+
+    ts = save_times(sett, t0, dt, tn)
+    ts = t0 + dt * np.round((ts - t0) / dt)
+    grid = ts if ts[0] == t0 else np.hstack([t0, ts])
+    steps = np.round(np.diff(grid) / dt).astype(int)
+    chunk_size, interval, first, valid, last = chunk_intervals(steps)
+    L = linear_operator(F, args, t0, len(q0), jac)
+    ys = integrate(
+        F,
+        args,
+        q0,
+        L,
+        jnp.array(grid[:-1][interval] + first * dt),
+        dt,
+        jnp.array(valid),
+        chunk_size,
+        sett.solver_name,
+        scan_checkpoints(adjoint, len(valid)),
+    )
+    # states at the end of the last chunk of each interval
+    ys = ys[np.hstack([0, last + 1])]
+    if len(grid) > len(ts):
+        ys = ys[1:]
+    return Solution(ts=jnp.array(ts), ys=ys)
+
+
+def pull_ode(sol):
+    return sol.ys
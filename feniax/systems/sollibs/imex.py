@@ -0,0 +1,172 @@
+"""Implicit-explicit and Rosenbrock integrators for stiff systems
+
+As in the exponential module, the RHS is split as F(t, q) = L q + N(t, q)
+with L the Jacobian at the zero state, which holds the structural omega
+terms and the aerodynamic stiffness, damping and lag decay. L is
+integrated implicitly and N (gamma couplings, gust and external loads)
+explicitly. All the schemes have a constant diagonal, so (I - gamma h L)
+is LU-factorised once per run and only back-substitutions are done in
+the steps.
+"""
+
+import math
+
+import equinox as eqx
+import jax
+import jax.numpy as jnp
+import jax.scipy.linalg
+import numpy as np
+
+from feniax.systems.sollibs.exponential import linear_operator
+from feniax.systems.sollibs.runge_kutta import (
+    Solution,
+    checkpointed_scan,
+    chunk_intervals,
+    save_times,
+    scan_checkpoints,
+)
+
+_g2 = 1.0 - 1.0 / math.sqrt(2.0)
+_d2 = 1.0 - 1.0 / (2.0 * _g2)
+# Ascher-Ruuth-Spiteri stiffly accurate schemes (implicit a, explicit a,
+# c, gamma); the solution is the last stage
+TABLEAUS = dict(
+    ars222=(
+        ((_g2,), (1.0 - _g2, _g2)),
+        ((_g2,), (_d2, 1.0 - _d2)),
+        (0.0, _g2, 1.0),
+        _g2,
+    ),
+    ars443=(
+        (
+            (0.5,),
+            (1 / 6, 0.5),
+            (-0.5, 0.5, 0.5),
+            (1.5, -1.5, 0.5, 0.5),
+        ),
+        (
+            (0.5,),
+            (11 / 18, 1 / 18),
+            (5 / 6, -5 / 6, 0.5),
+            (0.25, 1.75, 0.75, -1.75),
+        ),
+        (0.0, 0.5, 2 / 3, 0.5, 1.0),
+        0.5,
+    ),
+)
+# gamma of the second order Rosenbrock-W scheme ROS2
+GAMMA_ROS2 = 1.0 + 1.0 / math.sqrt(2.0)
+
+
+def ars_step(F, N, t, y, h, args, L, lu, tableau):
+    """IMEX additive Runge-Kutta step
+
+    Stage i solves (I - gamma h L) Y_i = y + h sum_j<i (aE_ij N_j + aI_ij L Y_j),
+    with aI given without the diagonal, which is the common gamma.
+    """
+
+    a_imp, a_exp, c, gamma = tableau
+    Ys = [y]
+    Ns = [N(t, y, args)]
+    LYs = [None]
+    for i in range(1, len(c)):
+        rhs = y + h * sum(aij * Ns[j] for j, aij in enumerate(a_exp[i - 1]) if aij != 0.0)
+        # implicit coefficients of previous stages, the first stage is explicit
+        for j, aij in enumerate(a_imp[i - 1][:-1]):
+            if aij != 0.0:
+                rhs += h * aij * LYs[j + 1]
+        Yi = jax.scipy.linalg.lu_solve(lu, rhs)
+        Ys.append(Yi)
+        LYs.append(L @ Yi)
+        if i < len(c) - 1:
+            Ns.append(N(t + c[i] * h, Yi, args))
+    return Ys[-1]
+
+
+def ros2_step(F, N, t, y, h, args, L, lu, tableau):
+    """Rosenbrock-W step with the fixed operator L"""
+
+    k1 = jax.scipy.linalg.lu_solve(lu, F(t, y, args))
+    k2 = jax.scipy.linalg.lu_solve(lu, F(t + h, y + h * k1, args) - 2 * k1)
+    return y + h * (1.5 * k1 + 0.5 * k2)
+
+
+@eqx.filter_jit
+def integrate(
+    f, args, q0, L, t_start, h, steps, num_substeps, solver_name, checkpoints=None
+):
+    """Integrates steps[i] (<= num_substeps) steps of size h from each t_start[i]
+
+    Only the states at the end of each chunk of steps are kept.
+    """
+
+    if solver_name == "ros2":
+        step, tableau, gamma = ros2_step, None, GAMMA_ROS2
+    else:
+        step, tableau = ars_step, TABLEAUS[solver_name]
+        gamma = tableau[-1]
+    lu = jax.scipy.linalg.lu_factor(jnp.eye(len(q0)) - gamma * h * L)
+
+    def N(t, q, args):
+        return f(t, q, args) - L @ q
+
+    def interval(y, x):
+        ti, ni = x
+
+        def substep(yj, j):
+            yj1 = step(f, N, ti + j * h, yj, h, args, L, lu, tableau)
+            return jnp.where(j < ni, yj1, yj), None
+
+        y, _ = jax.lax.scan(substep, y, jnp.arange(num_substeps))
+        return y, y
+
+    _, ys = checkpointed_scan(interval, q0, (t_start, steps), checkpoints)
+    return jnp.vstack([q0, ys])
+
+
+def ode(
+    F: callable,
+    args,
+    sett,
+    q0,
+    t0,
+    dt,
+    tn,
+    adjoint=None,
+    jac=None,
+    **kwargs,
+) -> Solution:
+    """IMEX/Rosenbrock integration with a constant step dt
+
+    Saved times not on the time grid t0 + dt * i are moved to the
+    nearest grid point. The linear operator is taken from the analytic
+    Jacobian jac(t, q, args) when given.
+    """
+
+    ts = save_times(sett, t0, dt, tn)
+    ts = t0 + dt * np.round((ts - t0) / dt)
+    grid = ts if ts[0] == t0 else np.hstack([t0, ts])
+    steps = np.round(np.diff(grid) / dt).astype(int)
+    chunk_size, interval, first, valid, last = chunk_intervals(steps)
+    L = linear_operator(F, args, t0, len(q0), jac)
+    ys = integrate(
+        F,
+        args,
+        q0,
+        L,
+        jnp.array(grid[:-1][interval] + first * dt),
+        dt,
+        jnp.array(valid),
+        chunk_size,
+        sett.solver_name,
+        scan_checkpoints(adjoint, len(valid)),
+    )
+    # states at the end of the last chunk of each interval
+    ys = ys[np.hstack([0, last + 1])]
+    if len(grid) > len(ts):
+        ys = ys[1:]
+    return Solution(ts=jnp.array(ts), ys=ys)
+
+
+def pull_ode(sol):
+    return sol.ys
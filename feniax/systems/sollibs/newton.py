@@ -0,0 +1,156 @@
+"""Newton-type static solvers reusing the Jacobian across load steps
+
+The static systems, F(q) = omega q - gamma2 q q + eta(q, t), have
+a Jacobian that changes slowly from one load increment to the next, so
+the state carried between calls (see init_state) holds a factorised
+Jacobian that is only rebuilt when the convergence rate degrades:
+
+- modified: LU factorisation of the Jacobian (analytic or by AD), reused
+  while the norm of the Newton step contracts by at least sett.contraction
+- broyden: inverse Jacobian approximation from one factorisation, updated
+  with Broyden's (good) rank-one formula in every iteration
+- chord: LU factorisation of the Jacobian, reused across iterations and
+  load steps and only rebuilt when the Newton step grows
+
+A load step converges when both the Newton step and the residual are
+within tolerance: ||dq|| <= atol + rtol ||q|| and
+||F(q)|| <= atol + rtol ||F(q0)||.
+"""
+
+from typing import NamedTuple
+
+import equinox as eqx
+import jax
+import jax.numpy as jnp
+import jax.scipy.linalg
+
+dict_norm = dict(linalg_norm=jnp.linalg.norm)
+
+
+class State(NamedTuple):
+    """Solver state carried across load steps
+
+    jac_factor is the LU factorisation of the Jacobian (modified, chord)
+    or the inverse Jacobian approximation (broyden).
+    """
+
+    jac_factor: jnp.ndarray
+    pivots: jnp.ndarray
+    refresh: jnp.ndarray
+    num_factorisations: jnp.ndarray
+    num_iterations: jnp.ndarray
+
+
+class Solution(NamedTuple):
+    value: jnp.ndarray
+    state: State
+
+
+def init_state(q0) -> State:
+    """Empty state, the Jacobian is built in the first iteration"""
+
+    n = len(q0)
+    return State(
+        jac_factor=jnp.zeros((n, n)),
+        pivots=jnp.zeros(n, dtype=jnp.int32),
+        refresh=jnp.array(True),
+        num_factorisations=jnp.array(0),
+        num_iterations=jnp.array(0),
+    )
+
+
+def _factorise(F, jac, q, args, state, method):
+    J = jac(q, args)
+    if method == "broyden":
+        n = len(q)
+        jac_factor = jax.scipy.linalg.lu_solve(jax.scipy.linalg.lu_factor(J), jnp.eye(n))
+        pivots = state.pivots
+    else:
+        jac_factor, pivots = jax.scipy.linalg.lu_factor(J)
+    return state._replace(
+        jac_factor=jac_factor,
+        pivots=pivots,
+        refresh=jnp.array(False),
+        num_factorisations=state.num_factorisations + 1,
+    )
+
+
+def static(F, q0, args, sett, jac=None, state: State = None, **kwargs) -> Solution:
+    """Solves F(q, args) = 0 from q0 carrying the Jacobian in state
+
+    Parameters
+    ----------
+    F : callable
+        Residual, F(q, args)
+    q0 : jax.Array
+        Initial guess, the solution of the previous load step
+    args : tuple
+        Arguments of F
+    sett : DnewtonStatic
+        Solver settings
+    jac : callable
+        Analytic Jacobian, jac(q, args); by forward AD of F if None or
+        if not sett.analytic_jac
+    state : State
+        Jacobian from previous calls, init_state(q0) if None
+
+    """
+
+    if state is None:
+        state = init_state(q0)
+    if jac is None or not sett.analytic_jac:
+        jac = jax.jacfwd(F)
+    norm = dict_norm[sett.norm]
+
+    def newton_step(q, r, state):
+        if sett.method == "broyden":
+            return -state.jac_factor @ r
+        return -jax.scipy.linalg.lu_solve((state.jac_factor, state.pivots), r)
+
+    def cond(carry):
+        q, r, dq_norm, state, i, converged = carry
+        return (~converged) & (i < sett.max_steps)
+
+    def body(carry):
+        q, r, dq_norm, state, i, converged = carry
+        state = jax.lax.cond(
+            state.refresh,
+            lambda: _factorise(F, jac, q, args, state, sett.method),
+            lambda: state,
+        )
+        dq = newton_step(q, r, state)
+        q1 = q + dq
+        r1 = F(q1, args)
+        dq1_norm = norm(dq)
+        if sett.method == "broyden":
+            # Sherman-Morrison update of the inverse Jacobian
+            Hdr = state.jac_factor @ (r1 - r)
+            dqH = dq @ state.jac_factor
+            denominator = dq @ Hdr
+            safe = jnp.abs(denominator) > jnp.finfo(q.dtype).tiny
+            H = state.jac_factor + jnp.where(
+                safe, jnp.outer(dq - Hdr, dqH) / jnp.where(safe, denominator, 1.0), 0.0
+            )
+            state = state._replace(jac_factor=H)
+        # slow (or no) contraction: new Jacobian in the next iteration
+        contraction = 1.0 if sett.method == "chord" else sett.contraction
+        refresh = dq1_norm > contraction * dq_norm
+        converged = (dq1_norm <= sett.atol + sett.rtol * norm(q1)) & (
+            norm(r1) <= sett.atol + sett.rtol * r0_norm
+        )
+        state = state._replace(
+            refresh=refresh & ~converged, num_iterations=state.num_iterations + 1
+        )
+        return q1, r1, dq1_norm, state, i + 1, converged
+
+    r0 = F(q0, args)
+    r0_norm = norm(r0)
+    q, r, dq_norm, state, i, converged = jax.lax.while_loop(
+        cond, body, (q0, r0, jnp.array(jnp.inf), state, jnp.array(0), jnp.array(False))
+    )
+    q = eqx.error_if(q, ~converged, "Newton static solver did not converge")
+    return Solution(value=q, state=state)
+
+
+def pull_static(sol):
+    return sol.value
@@ -1,45 +1,278 @@
-import jax.numpy as jnp
-from functools import partial
+import math
+from typing import NamedTuple
+
+import equinox as eqx
 import jax
+import jax.numpy as jnp
+import numpy as np
 
+# Butcher tableaus (a, b, c) of the explicit fixed-step schemes; the
+# embedded error estimators of dopri5 and tsit5 are not used, so their
+# last (FSAL) stage with b=0 is dropped.
+TABLEAUS = dict(
+    # forward Euler, kept under this name as in the original implementation
+    rk2=((), (1.0,), (0.0,)),
+    rk4=(
+        ((0.5,), (0.0, 0.5), (0.0, 0.0, 1.0)),
+        (1.0 / 6, 1.0 / 3, 1.0 / 3, 1.0 / 6),
+        (0.0, 0.5, 0.5, 1.0),
+    ),
+    dopri5=(
+        (
+            (1 / 5,),
+            (3 / 40, 9 / 40),
+            (44 / 45, -56 / 15, 32 / 9),
+            (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+            (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+        ),
+        (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+        (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0),
+    ),
+    tsit5=(
+        (
+            (0.161,),
+            (-0.008480655492356989, 0.335480655492357),
+            (2.897153057105493, -6.359448489975075, 4.3622954328695815),
+            (
+                5.325864828439257,
+                -11.748883564062828,
+                7.4955393428898365,
+                -0.09249506636175525,
+            ),
+            (
+                5.86145544294642,
+                -12.92096931784711,
+                8.159367898576159,
+                -0.071584973281401,
+                -0.028269050394068383,
+            ),
+        ),
+        (
+            0.09646076681806523,
+            0.01,
+            0.4798896504144996,
+            1.379008574103742,
+            -3.290069515436081,
+            2.324710524099774,
+        ),
+        (0.0, 0.161, 0.327, 0.9, 0.9800255409045097, 1.0),
+    ),
+)
 
-# @partial(jax.jit, static_argnames=['f'])
-def rk4(ys, dt, N, f, args):
-    @jax.jit
-    def step(i, ys):
-        h = dt
-        t = dt * i
-        ys0 = ys[i - 1]
-        k1 = f(t, ys0, args)
-        # jax.debug.print("k1: {}", k1)
-        k2 = f(t + 0.5 * h, ys0 + 0.5 * k1 * h, args)
-        # jax.debug.print("k2: {}", k2)
-        k3 = f(t + 0.5 * h, ys0 + 0.5 * k2 * h, args)
-        # jax.debug.print("k3: {}", k3)
-        k4 = f(t + h, ys0 + k3 * h, args)
-        # jax.debug.print("k4: {}", k4)
-        ysi = ys0 + 1.0 / 6 * (k1 + 2 * k2 + 2 * k3 + k4) * h
-        ys = ys.at[i].set(ysi)
-        # jax.debug.breakpoint()
-        return ys
 
-    return jax.lax.fori_loop(1, N, step, ys)
+class Solution(NamedTuple):
+    ts: jnp.ndarray
+    ys: jnp.ndarray
+
+
+def rk_step(f, t, y, h, args, tableau):
+    """One step of the explicit Runge-Kutta scheme given by tableau"""
+
+    a, b, c = tableau
+    ks = []
+    for i, ci in enumerate(c):
+        yi = y
+        if i > 0:
+            yi = y + h * sum(aij * ks[j] for j, aij in enumerate(a[i - 1]) if aij != 0.0)
+        ks.append(f(t + ci * h, yi, args))
+    return y + h * sum(bi * ki for bi, ki in zip(b, ks) if bi != 0.0)
+
+
+def save_times(sett, t0: float, dt: float, tn: int) -> np.ndarray:
+    """Times at which the solution is stored
+
+    Either the explicit sett.save_at or every sett.save_stride steps of
+    the time grid t0 + dt * range(tn), always including the last one.
+    """
+
+    if sett.save_at is not None:
+        ts = np.asarray(sett.save_at, dtype=float)
+        if ts[0] < t0:
+            raise ValueError(f"save_at time {ts[0]} is before the initial time {t0}")
+        if np.any(np.diff(ts) < 0):
+            raise ValueError(f"save_at times are not sorted: {sett.save_at}")
+        return ts
+    index = np.arange(0, tn, sett.save_stride)
+    if index[-1] != tn - 1:
+        index = np.append(index, tn - 1)
+    return t0 + dt * index
+
+
+def chunk_intervals(steps: np.ndarray) -> tuple:
+    """Splits intervals of steps[i] time steps into chunks of equal length
+
+    The chunk length is the average number of steps per interval, so
+    with non-uniform saved times the masked steps that fill the last
+    chunk of each interval at most double the total number of steps
+    (instead of every interval taking the steps of the largest one).
+
+    Returns
+    -------
+    chunk_size : int
+        Maximum number of steps per chunk
+    interval : np.ndarray
+        Interval of each chunk
+    first : np.ndarray
+        Index, within its interval, of the first step of each chunk
+    valid : np.ndarray
+        Number of steps actually taken in each chunk
+    last : np.ndarray
+        Index of the last chunk of each interval
+
+    """
+
+    steps = np.asarray(steps, dtype=int)
+    chunk_size = max(1, math.ceil(steps.sum() / len(steps)))
+    num_chunks = np.maximum(1, -(-steps // chunk_size))
+    last = np.cumsum(num_chunks) - 1
+    interval = np.repeat(np.arange(len(steps)), num_chunks)
+    first = (np.arange(num_chunks.sum()) - (last - num_chunks + 1)[interval]) * chunk_size
+    valid = np.clip(steps[interval] - first, 0, chunk_size)
+    return chunk_size, interval, first, valid, last
+
+
+def checkpointed_scan(f, init, xs, checkpoints=None):
+    """lax.scan with recursive checkpointing for reverse-mode AD
+
+    The sequence is split into at most checkpoints segments, each one
+    split again recursively and the segments rematerialised in the
+    backward pass. With n iterations, only ~checkpoints * log_c(n)
+    carries are stored instead of the residuals of every iteration, at
+    the cost of log_c(n) extra forward passes. The sequence is padded
+    with masked iterations to fill the segments.
+
+    Parameters
+    ----------
+    f : callable
+        Scan body, (carry, x) -> (carry, y)
+    init : PyTree
+        Initial carry
+    xs : PyTree
+        Scanned inputs
+    checkpoints : int
+        Maximum number of segments per level, a plain scan if None
+
+    """
+
+    if checkpoints is None:
+        return jax.lax.scan(f, init, xs)
+    n = len(jax.tree_util.tree_leaves(xs)[0])
+    if n <= checkpoints:
+        return jax.lax.scan(jax.checkpoint(f), init, xs)
+    m = math.ceil(n / checkpoints)
+    num_segments = math.ceil(n / m)
+    pad = num_segments * m - n
+
+    def _pad(x):
+        return jnp.concatenate([x, jnp.repeat(x[-1:], pad, axis=0)])
 
+    def _masked(carry, x):
+        xi, valid = x
+        carry1, y = f(carry, xi)
+        carry1 = jax.tree_util.tree_map(
+            lambda c1, c: jnp.where(valid, c1, c), carry1, carry
+        )
+        return carry1, y
 
-@partial(jax.jit, static_argnames=["f"])
-def rk2(ys, dt, N, f, args):
-    @jax.jit
-    def step(i, ys):
-        h = dt
-        t = dt * i
-        ys0 = ys[i - 1]
-        k1 = f(t, ys0, args)
-        ysi = ys0 + k1 * h
-        ys = ys.at[i].set(ysi)
-        # jax.debug.breakpoint()
+    xs_padded = (jax.tree_util.tree_map(_pad, xs), jnp.arange(n + pad) < n)
+    xs_segments = jax.tree_util.tree_map(
+        lambda x: x.reshape((num_segments, m) + x.shape[1:]), xs_padded
+    )
+
+    @jax.checkpoint
+    def segment(carry, xs_i):
+        return checkpointed_scan(_masked, carry, xs_i, checkpoints)
+
+    carry, ys = jax.lax.scan(segment, init, xs_segments)
+    ys = jax.tree_util.tree_map(
+        lambda y: y.reshape((num_segments * m,) + y.shape[2:])[:n], ys
+    )
+    return carry, ys
+
+
+def scan_checkpoints(adjoint, num_steps: int) -> int:
+    """Number of checkpoints of the time-stepping scans from the AD settings
+
+    With recursive_checkpoint and no checkpoints given, ceil(sqrt(n))
+    for a scan of n steps (one level of recursion).
+    """
+
+    if adjoint is None or adjoint.adjoint in (None, "direct"):
+        return None
+    elif adjoint.adjoint == "recursive_checkpoint":
+        if adjoint.checkpoints is None:
+            return math.ceil(math.sqrt(num_steps))
+        return adjoint.checkpoints
+    raise ValueError(f"{adjoint.adjoint} adjoint only available with diffrax")
+
+
+def event_fired(events, t0, y0, t1, y1):
+    """Whether any of the event functions g(t, y) changes sign in [t0, t1]"""
+
+    g0 = jnp.array([g(t0, y0) for g in events])
+    g1 = jnp.array([g(t1, y1) for g in events])
+    return jnp.any((g0 > 0) != (g1 > 0))
+
+
+# filter_jit as in diffrax: the non-array entries of args (e.g. num_nodes)
+# stay static for the system functions
+@eqx.filter_jit
+def integrate(
+    f,
+    args,
+    q0,
+    t_start,
+    h,
+    steps,
+    chunk_size,
+    solver_name,
+    checkpoints=None,
+    events=None,
+    first=None,
+):
+    """Integrates steps[i] (<= chunk_size) steps of size h[i] from each t_start[i]
+
+    Only the states at the end of each chunk are kept, so memory goes
+    with the number of chunks. With events, first[i] marks the first
+    chunk of each saved interval: the intervals after the one where an
+    event fires are skipped (keeping the state), and whether an event
+    has fired by the end of each chunk is also returned.
+    """
+
+    tableau = TABLEAUS[solver_name]
+
+    def advance(y, ti, hi, ni):
+        def substep(yj, j):
+            yj1 = rk_step(f, ti + j * hi, yj, hi, args, tableau)
+            return jnp.where(j < ni, yj1, yj), None
+
+        y, _ = jax.lax.scan(substep, y, jnp.arange(chunk_size))
+        return y
+
+    if events is None:
+
+        def chunk(y, x):
+            y = advance(y, *x)
+            return y, y
+
+        _, ys = checkpointed_scan(chunk, q0, (t_start, h, steps), checkpoints)
         return ys
 
-    return jax.lax.fori_loop(1, N, step, ys)
+    def chunk_events(carry, x):
+        y, stopped, fired = carry
+        ti, hi, ni, first_i = x
+        stopped = stopped | (fired & first_i)
+        y1 = jax.lax.cond(stopped, lambda: y, lambda: advance(y, ti, hi, ni))
+        fired = fired | event_fired(events, ti, y, ti + ni * hi, y1)
+        return (y1, stopped, fired), (y1, fired)
+
+    _, (ys, fired) = checkpointed_scan(
+        chunk_events,
+        (q0, jnp.array(False), jnp.array(False)),
+        (t_start, h, steps, first),
+        checkpoints,
+    )
+    return ys, fired
 
 
 def ode(
@@ -47,17 +280,59 @@ def ode(
     args,
     sett,
     q0,
+    t0,
     dt,
     tn,
     # solver_name: str,
+    adjoint=None,
+    events=None,
     **kwargs,
-) -> jnp.ndarray:
-    ys = jnp.zeros((tn, len(q0)))
-    ys = ys.at[0].set(q0)
-    _solver = globals()[sett.solver_name]
-    sol = _solver(ys, dt, tn, F, args)
-    return sol
+) -> Solution:
+    """Fixed-step explicit Runge-Kutta integration
+
+    events is a tuple of scalar functions g(t, q); the integration stops
+    at the first saved point after one of them changes sign. As in
+    diffrax, the times and states after it are inf, so the shapes do not
+    depend on the event and ode can be traced (jit, vmap); the outputs
+    are trimmed on the host (see trim_events).
+    """
+
+    ts = save_times(sett, t0, dt, tn)
+    grid = ts if ts[0] == t0 else np.hstack([t0, ts])
+    intervals = np.diff(grid)
+    # steps no larger than dt, the same within each interval
+    steps = np.maximum(1, np.ceil(intervals / dt - 1e-6)).astype(int)
+    h = intervals / steps
+    chunk_size, interval, first, valid, last = chunk_intervals(steps)
+    out = integrate(
+        F,
+        args,
+        q0,
+        jnp.array(grid[:-1][interval] + first * h[interval]),
+        jnp.array(h[interval]),
+        jnp.array(valid),
+        chunk_size,
+        sett.solver_name,
+        scan_checkpoints(adjoint, len(valid)),
+        events,
+        jnp.array(first == 0),
+    )
+    if events is None:
+        ys = jnp.vstack([q0, out[last]])
+    else:
+        ys, stops = out
+        ys, stops = jnp.vstack([q0, ys[last]]), stops[last]
+        index_stop = jnp.where(jnp.any(stops), jnp.argmax(stops), len(stops) - 1) + 1
+    t0_saved = len(grid) == len(ts)
+    grid = jnp.array(grid)
+    if events is not None:
+        saved = jnp.arange(len(grid)) <= index_stop
+        ys = jnp.where(saved[:, None], ys, jnp.inf)
+        grid = jnp.where(saved, grid, jnp.inf)
+    if not t0_saved:
+        grid, ys = grid[1:], ys[1:]
+    return Solution(ts=grid, ys=ys)
 
 
 def pull_ode(sol):
-    return sol
+    return sol.ys
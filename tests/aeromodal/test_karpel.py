@@ -0,0 +1,41 @@
+from feniax.aeromodal import karpel
+import jax
+import jax.numpy as jnp
+import pytest
+
+
+class TestKarpel:
+
+    num_modes = 5
+    num_panels = 3
+    num_lags = 2
+
+    @pytest.fixture(scope="class")
+    def model(self):
+        Nm, Nc = self.num_modes, self.num_modes + self.num_panels
+        keys = jax.random.split(jax.random.PRNGKey(0), 3)
+        matrices = jax.random.normal(keys[0], (3, Nm, Nc))
+        lags_D = jax.random.normal(keys[1], (Nm, self.num_lags))
+        lags_E = jax.random.normal(keys[2], (self.num_lags, Nc))
+        poles = jnp.array([0.1, 0.8])
+        redfreqs = jnp.hstack([0.0, jnp.linspace(0.01, 1.5, 15)])
+        Qk = karpel.Q_MS(redfreqs, matrices, lags_D, lags_E, poles)
+        return redfreqs, Qk, poles
+
+    def test_fit_linear(self, model):
+        # exact for the poles and D of the model
+        redfreqs, Qk, poles = model
+        keys = jax.random.split(jax.random.PRNGKey(0), 3)
+        lags_D = jax.random.normal(keys[1], (self.num_modes, self.num_lags))
+        matrices, lags_E, residual = karpel.fit_linear(poles, lags_D, Qk, redfreqs)
+        assert jnp.allclose(karpel.Q_MS(redfreqs, matrices, lags_D, lags_E, poles), Qk)
+        assert jnp.abs(residual).max() < 1e-6
+
+    def test_optimise(self, model):
+        redfreqs, Qk, poles = model
+        opt = karpel.OptimiseKarpel(redfreqs, Qk[:, :, :self.num_modes], self.num_lags,
+                                    Qk[:, :, self.num_modes:])
+        opt.set_optsettings(maxiter=200)
+        opt.run()
+        assert opt.error < 1e-4
+        assert jnp.allclose(jnp.sort(opt.poles), poles, rtol=1e-2)
@@ -0,0 +1,38 @@
+from feniax.aeromodal import roger
+import jax
+import jax.numpy as jnp
+import pytest
+
+
+class TestOptimisePoles:
+
+    num_modes = 4
+    poles = jnp.array([0.1, 0.4, 0.8])
+
+    @pytest.fixture(scope="class")
+    def gafs(self):
+        matrices = jax.random.normal(jax.random.PRNGKey(0),
+                                     (3 + len(self.poles), self.num_modes, self.num_modes))
+        redfreqs = jnp.hstack([0.0, jnp.linspace(0.01, 1.5, 20)])
+        return redfreqs, roger.Q_RFA(redfreqs, matrices, self.poles)
+
+    def optimise(self, gafs, **settings):
+        redfreqs, Qk = gafs
+        opt = roger.OptimisePoles(redfreqs, Qk, len(self.poles), 0.1, [0.1, 1.0],
+                                  rfa_method_=2)
+        opt.set_optsettings(**settings)
+        opt.run()
+        return opt
+
+    def test_chunked(self, gafs):
+        # 120 combinations in chunks of 7, the last one padded
+        full = self.optimise(gafs)
+        chunked = self.optimise(gafs, chunk_size=7)
+        assert jnp.allclose(chunked.poles, full.poles)
+        assert jnp.allclose(chunked.roger_matrices, full.roger_matrices)
+        assert jnp.allclose(chunked.error, full.error)
+
+    def test_lbfgs(self, gafs):
+        opt = self.optimise(gafs, method="lbfgs", num_starts=2, maxiter=100)
+        assert jnp.allclose(opt.poles, self.poles, rtol=1e-4)
+        assert opt.error < 1e-6
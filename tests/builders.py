@@ -0,0 +1,98 @@
+"""Inputs of the example models shared by the tests
+
+Each builder returns the Inputs of a single system, s1, for the tests to
+change only the settings they exercise before running them.
+"""
+
+import pathlib
+
+import feniax.feniax_main
+import feniax.preprocessor.configuration as configuration
+from feniax.preprocessor.inputs import Inputs
+
+examples_path = pathlib.Path(__file__).parent / "../examples"
+
+
+def sailplane(num_modes=50, sol_path=None, **sett) -> Inputs:
+    """Static SailPlane under two follower forces at the wing tips
+
+    sett overrides the settings of system s1.
+    """
+
+    inp = Inputs()
+    inp.engine = "intrinsicmodal"
+    inp.fem.eig_type = "inputs"
+    inp.fem.connectivity = dict(FuselageFront=['RWingInner', 'LWingInner'],
+                                FuselageBack=['BottomTail', 'Fin'],
+                                RWingInner=['RWingOuter'],
+                                RWingOuter=None,
+                                LWingInner=['LWingOuter'],
+                                LWingOuter=None,
+                                BottomTail=['LHorizontalStabilizer',
+                                            'RHorizontalStabilizer'],
+                                RHorizontalStabilizer=None,
+                                LHorizontalStabilizer=None,
+                                Fin=None
+                                )
+    inp.fem.folder = examples_path / "SailPlane/FEM/"
+    inp.fem.num_modes = num_modes
+    inp.driver.typeof = "intrinsic"
+    inp.driver.save_fem = False
+    inp.driver.sol_path = sol_path
+    inp.simulation.typeof = "single"
+    inp.systems.sett.s1.solution = "static"
+    inp.systems.sett.s1.save = False
+    inp.systems.sett.s1.solver_library = "diffrax"
+    inp.systems.sett.s1.solver_function = "newton"
+    inp.systems.sett.s1.solver_settings = dict(rtol=1e-6,
+                                               atol=1e-6,
+                                               max_steps=50,
+                                               norm="linalg_norm",
+                                               kappa=0.01)
+    inp.systems.sett.s1.xloads.follower_forces = True
+    inp.systems.sett.s1.xloads.follower_points = [[25, 2], [48, 2]]
+    inp.systems.sett.s1.xloads.x = [0, 1, 2]
+    inp.systems.sett.s1.xloads.follower_interpolation = [[0., 2e5, 5e5],
+                                                         [0., 2e5, 5e5]]
+    inp.systems.sett.s1.t = [1, 2]
+    for k, v in sett.items():
+        setattr(inp.systems.sett.s1, k, v)
+    return inp
+
+
+def rafabeam(num_modes=100, sol_path=None, **sett) -> Inputs:
+    """Free vibrations of the clamped RafaBeam from a parabolic velocity
+
+    sett overrides the settings of system s1.
+    """
+
+    inp = Inputs()
+    inp.engine = "intrinsicmodal"
+    inp.fem.connectivity = {'c1': None}
+    inp.fem.folder = examples_path / "RafaBeam/FEM/"
+    inp.fem.num_modes = num_modes
+    inp.fem.eig_type = "inputs"
+    inp.driver.typeof = "intrinsic"
+    inp.driver.save_fem = False
+    inp.driver.sol_path = sol_path
+    inp.simulation.typeof = "single"
+    inp.systems.sett.s1.solution = "dynamic"
+    inp.systems.sett.s1.save = False
+    inp.systems.sett.s1.t1 = 0.5
+    inp.systems.sett.s1.tn = 501
+    inp.systems.sett.s1.solver_library = "runge_kutta"
+    inp.systems.sett.s1.solver_function = "ode"
+    inp.systems.sett.s1.solver_settings = dict(solver_name="rk4")
+    inp.systems.sett.s1.init_states = dict(q1=["axial_parabolic",
+                                               ([0., 3., 3., 0., 0., 0], 20.)
+                                               ])
+    for k, v in sett.items():
+        setattr(inp.systems.sett.s1, k, v)
+    return inp
+
+
+def run(inp: Inputs, **kwargs):
+    """Solution of the case, or its driver with return_driver=True"""
+
+    config = configuration.Config(inp)
+    return feniax.feniax_main.main(input_obj=config, **kwargs)
@@ -1,5 +1,6 @@
 # content of conftest.py
 # https://docs.pytest.org/en/latest/example/simple.html#control-skipping-of-tests-according-to-command-line-option
+import jax
 import pytest
 
 
@@ -11,6 +12,8 @@ def pytest_addoption(parser):
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "slow: mark test as slow to run")
+    # as in feniax_main, whichever test modules are collected
+    jax.config.update("jax_enable_x64", True)
 
 
 def pytest_collection_modifyitems(config, items):
@@ -0,0 +1,103 @@
+import feniax.intrinsic.couplings as couplings
+import feniax.intrinsic.dq_common as common
+import jax
+import jax.numpy as jnp
+import pytest
+
+
+class TestGammaBlocks:
+
+    @pytest.fixture(scope="class")
+    def shapes(self):
+        keys = jax.random.split(jax.random.PRNGKey(0), 6)
+        num_modes, num_nodes = 7, 11
+        phi1, psi1, phi1m, phi2, psi2 = [
+            jax.random.normal(ki, (num_modes, 6, num_nodes)) for ki in keys[:5]
+        ]
+        delta_s = jax.random.uniform(keys[5], (num_nodes,))
+        return phi1, psi1, phi1m, phi2, psi2, delta_s
+
+    @pytest.mark.parametrize("block_size", [1, 3, 7])
+    def test_gamma1(self, shapes, block_size):
+        phi1, psi1, *_ = shapes
+        gamma1 = couplings.f_gamma1(phi1, psi1)
+        gamma1_blocks = couplings.f_gamma1(phi1, psi1, block_size=block_size)
+        assert jnp.allclose(gamma1_blocks, gamma1)
+
+    @pytest.mark.parametrize("block_size", [1, 3, 7])
+    def test_gamma2(self, shapes, block_size):
+        _, _, phi1m, phi2, psi2, delta_s = shapes
+        gamma2 = couplings.f_gamma2(phi1m, phi2, psi2, delta_s)
+        gamma2_blocks = couplings.f_gamma2(phi1m, phi2, psi2, delta_s,
+                                           block_size=block_size)
+        assert jnp.allclose(gamma2_blocks, gamma2)
+
+
+class TestGammaCompressed:
+
+    @pytest.fixture(scope="class")
+    def gammas(self):
+        keys = jax.random.split(jax.random.PRNGKey(1), 3)
+        num_modes = 8
+        gamma = jax.random.normal(keys[0], (num_modes, num_modes, num_modes))
+        # sparsity pattern with a few small entries
+        gamma = jnp.where(jnp.abs(gamma) < 0.5, 1e-12 * gamma, gamma)
+        q1 = jax.random.normal(keys[1], (num_modes,))
+        q2 = jax.random.normal(keys[2], (num_modes,))
+        return gamma, q1, q2
+
+    @pytest.mark.parametrize("method", ["sparse", "tucker"])
+    def test_contractions(self, gammas, method):
+        gamma, q1, q2 = gammas
+        gammac = couplings.compress(gamma, method, 1e-9)
+        assert jnp.allclose(common.contraction_gamma1(gammac, q1),
+                            common.contraction_gamma1(gamma, q1))
+        assert jnp.allclose(common.contraction_gamma2(gammac, q2),
+                            common.contraction_gamma2(gamma, q2))
+        assert jnp.allclose(common.contraction_gamma3(gammac, q1, q2),
+                            common.contraction_gamma3(gamma, q1, q2))
+
+    def test_sparse_threshold(self, gammas):
+        gamma, *_ = gammas
+        gammac = couplings.compress_sparse(gamma, 1e-9)
+        assert len(gammac.values) == int(jnp.sum(jnp.abs(gamma) >= 0.5))
+
+
+class TestExtendCouplings:
+
+    @pytest.mark.parametrize("block_size", [None, 2])
+    def test_extend(self, block_size):
+        keys = jax.random.split(jax.random.PRNGKey(2), 6)
+        num_modes0, num_modes1, num_nodes = 4, 7, 9
+        phi1, psi1, phi1m, phi2, psi2 = [
+            jax.random.normal(ki, (num_modes1, 6, num_nodes)) for ki in keys[:5]
+        ]
+        delta_s = jax.random.uniform(keys[5], (num_nodes,))
+        alpha1 = couplings.f_alpha1(phi1, psi1)
+        alpha2 = couplings.f_alpha2(phi2, psi2, delta_s)
+        gamma1 = couplings.f_gamma1(phi1, psi1)
+        gamma2 = couplings.f_gamma2(phi1m, phi2, psi2, delta_s)
+        n0 = num_modes0
+        extended = couplings.extend_couplings(alpha1[:n0, :n0],
+                                              alpha2[:n0, :n0],
+                                              gamma1[:n0, :n0, :n0],
+                                              gamma2[:n0, :n0, :n0],
+                                              phi1, psi1, phi1m, phi2, psi2,
+                                              delta_s,
+                                              block_size=block_size)
+        for ai, bi in zip(extended, (alpha1, alpha2, gamma1, gamma2)):
+            assert jnp.allclose(ai, bi)
+
+    def test_check_extension(self):
+        keys = jax.random.split(jax.random.PRNGKey(3), 2)
+        num_modes0, num_modes1, num_nodes = 4, 7, 9
+        phi1, psi1 = [
+            jax.random.normal(ki, (num_modes1, 6, num_nodes)) for ki in keys
+        ]
+        tolerance = dict(rtol=1e-4, atol=1e-4)
+        gamma1 = couplings.f_gamma1(phi1[:num_modes0], psi1[:num_modes0])
+        couplings.check_extension(gamma1, phi1, psi1, tolerance)
+        # leading mode with flipped sign in the current eigen-solution
+        sign = jnp.ones(num_modes1).at[1].set(-1.0)[:, None, None]
+        with pytest.raises(ValueError):
+            couplings.check_extension(gamma1, sign * phi1, sign * psi1, tolerance)
@@ -0,0 +1,79 @@
+import feniax.preprocessor.configuration as configuration
+from feniax.preprocessor import fem_cache
+import feniax.feniax_main
+import jax
+import jax.numpy as jnp
+import pytest
+import tests.builders as builders
+
+
+def run_sailplane(cache_path, num_modes=50, dof_vect=None, run=True):
+    inp = builders.sailplane(num_modes)
+    if dof_vect is not None:
+        inp.fem.dof_vect = dof_vect
+    inp.driver.fem_cache = cache_path
+    config = configuration.Config(inp)
+    if not run:
+        return config, None
+    obj_sol = feniax.feniax_main.main(input_obj=config)
+    return config, obj_sol
+
+
+class TestFemCache:
+
+    @pytest.fixture(scope="class")
+    def cache_path(self, tmp_path_factory):
+        return tmp_path_factory.mktemp("fem_cache")
+
+    @pytest.fixture(scope="class")
+    def sols(self, cache_path):
+        config1, sol1 = run_sailplane(cache_path)
+        config2, sol2 = run_sailplane(cache_path)
+        return config1, sol1, config2, sol2
+
+    def test_key(self, sols, cache_path):
+        config1, _, config2, _ = sols
+        key = fem_cache.hash_fem(config1.fem)
+        assert key == fem_cache.hash_fem(config2.fem)
+        assert (cache_path / key / "Modes").is_dir()
+        assert (cache_path / key / "Couplings").is_dir()
+
+    def test_reuse(self, sols):
+        _, sol1, _, sol2 = sols
+        assert jnp.allclose(sol1.modes.phi2l, sol2.modes.phi2l)
+        assert jnp.allclose(sol1.couplings.gamma2, sol2.couplings.gamma2)
+        assert jnp.allclose(sol1.staticsystem_s1.q, sol2.staticsystem_s1.q)
+
+    def test_evict(self, sols, cache_path):
+        config1, *_ = sols
+        config3, _ = run_sailplane(cache_path, num_modes=40)
+        key1 = fem_cache.hash_fem(config1.fem)
+        key3 = fem_cache.hash_fem(config3.fem)
+        assert key1 != key3
+        cache = fem_cache.FemCache(cache_path, maxsize=1e-6)
+        cache.evict(keep=key3)
+        assert not (cache_path / key1).exists()
+        assert (cache_path / key3).is_dir()
+
+    def test_dof_vect(self, sols, cache_path):
+        config1, sol1, *_ = sols
+        # first node (clamped) pinned instead, free rotations
+        dof_vect = ["345"] + list(config1.fem.dof_vect[1:])
+        config4, _ = run_sailplane(cache_path, dof_vect=dof_vect, run=False)
+        key1 = fem_cache.hash_fem(config1.fem)
+        key4 = fem_cache.hash_fem(config4.fem)
+        assert key1 != key4
+        cache = fem_cache.FemCache(cache_path)
+        assert not cache.load(key4, sol1)
+
+    def test_x64(self, sols):
+        # float32 Modes/Couplings not reused in x64 runs and vice versa
+        config1, *_ = sols
+        key1 = fem_cache.hash_fem(config1.fem)
+        jax.config.update("jax_enable_x64", False)
+        try:
+            key32 = fem_cache.hash_fem(config1.fem)
+        finally:
+            jax.config.update("jax_enable_x64", True)
+        assert key1 != key32
+        assert key1 == fem_cache.hash_fem(config1.fem)
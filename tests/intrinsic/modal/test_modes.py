@@ -0,0 +1,71 @@
+import feniax.preprocessor.configuration as configuration
+import feniax.intrinsic.geometry as geometry
+import feniax.intrinsic.modes as modes
+import jax
+import jax.numpy as jnp
+import numpy as np
+import scipy.sparse
+import pytest
+import tests.builders as builders
+
+
+class TestEigsSailPlane:
+
+    @pytest.fixture(scope="class")
+    def fem(self):
+        folder = builders.examples_path / "SailPlane/FEM"
+        Ka = np.load(folder / "Ka.npy")
+        Ma = np.load(folder / "Ma.npy")
+        return Ka, Ma
+
+    def test_sparse_eigenvals(self, fem):
+        Ka, Ma = fem
+        num_modes = 50
+        w_dense, _ = modes.compute_eigs_scipy(Ka, Ma, num_modes)
+        w_sparse, v_sparse = modes.compute_eigs_sparse(
+            scipy.sparse.csc_array(Ka), scipy.sparse.csc_array(Ma), num_modes
+        )
+        assert jnp.allclose(w_sparse, w_dense, rtol=1e-6, atol=1e-6)
+        # mass normalised as in the dense solver
+        assert jnp.allclose(v_sparse.T @ Ma @ v_sparse, jnp.eye(num_modes), atol=1e-6)
+
+
+def test_constrained_sparse():
+    keys = jax.random.split(jax.random.PRNGKey(1), 2)
+    Ka, Ma = [np.asarray(jax.random.normal(ki, (24, 24))) for ki in keys]
+    fe_order = np.array([2, 0, 3, 1, 4])
+    clamped_nodes = [1, 3]
+    clampedDoF = {1: [0, 2, 5], 3: [1, 2, 3]}
+    Ka0s, Ma0s = geometry.compute_Mconstrained(
+        jnp.array(Ka), jnp.array(Ma), fe_order, clamped_nodes, clampedDoF
+    )
+    Ka0s_sparse, Ma0s_sparse = geometry.compute_Mconstrained(
+        scipy.sparse.csr_array(Ka), scipy.sparse.csr_array(Ma), fe_order,
+        clamped_nodes, clampedDoF
+    )
+    assert scipy.sparse.issparse(Ka0s_sparse) and scipy.sparse.issparse(Ma0s_sparse)
+    assert np.allclose(Ka0s_sparse.toarray(), Ka0s)
+    assert np.allclose(Ma0s_sparse.toarray(), Ma0s)
+
+
+class TestInternalForcesSailPlane:
+
+    @pytest.fixture(scope="class")
+    def config(self):
+        return configuration.Config(builders.sailplane())
+
+    def test_loadpaths_dense(self, config):
+        fem = config.fem
+        nodal_force = jax.random.normal(jax.random.PRNGKey(0),
+                                        (fem.num_modes, 6, fem.num_nodes))
+        phi2_dense = modes.internalforces_dense(nodal_force,
+                                                fem.X.T,
+                                                fem.Xm,
+                                                fem.Mload_paths,
+                                                config.jax_np.precision)
+        phi2_loadpaths = modes.internalforces_loadpaths(nodal_force,
+                                                        fem.X.T,
+                                                        fem.Xm,
+                                                        fem.component_nodes,
+                                                        fem.component_chain)
+        assert jnp.allclose(phi2_loadpaths, phi2_dense)
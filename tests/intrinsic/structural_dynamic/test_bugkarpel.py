@@ -0,0 +1,116 @@
+import feniax.preprocessor.configuration as configuration  # import Config, dump_to_yaml
+from feniax.preprocessor.inputs import Inputs
+import feniax.feniax_main
+import jax.numpy as jnp
+import pytest
+import pathlib
+
+file_path = pathlib.Path(__file__).parent
+bug_path = file_path / "../../../examples/BUG"
+num_modes = 50
+num_poles = 5
+u_inf = 209.62786434059765
+rho_inf = 0.41275511341689247
+
+
+def run_bug(approx, sol="cao"):
+    """BUG under a 1-cos gust, clamped (cao) or free with gravity (eao),
+    with the Roger GAFs or the same GAFs written as a minimum-state model
+    with one lag per mode and pole"""
+
+    label_gaf = f"Dd1c7F3S{sol}-{num_modes}"
+
+    inp = Inputs()
+    inp.engine = "intrinsicmodal"
+    inp.fem.eig_type = "inputs"
+    inp.fem.connectivity = dict(FusBack=['FusTail', 'VTP'],
+                                FusFront=None,
+                                RWing=None,
+                                LWing=None,
+                                FusTail=None,
+                                VTP=['HTP', 'VTPTail'],
+                                HTP=['RHTP', 'LHTP'],
+                                VTPTail=None,
+                                RHTP=None,
+                                LHTP=None,
+                                )
+    inp.fem.grid = bug_path / f"FEM/structuralGrid_{sol[:-1]}"
+    inp.fem.Ka_name = bug_path / f"FEM/Ka_{sol[:-1]}.npy"
+    inp.fem.Ma_name = bug_path / f"FEM/Ma_{sol[:-1]}.npy"
+    inp.fem.eig_names = [bug_path / f"FEM/eigenvals_{sol}{num_modes}.npy",
+                         bug_path / f"FEM/eigenvecs_{sol}{num_modes}.npy"]
+    inp.fem.num_modes = num_modes
+    inp.driver.typeof = "intrinsic"
+    inp.driver.save_fem = False
+    inp.driver.sol_path = None
+    inp.simulation.typeof = "single"
+    inp.system.name = "s1"
+    inp.system.solution = "dynamic"
+    if sol[0] == "e":  # free model, otherwise clamped
+        inp.system.bc1 = 'free'
+        inp.system.q0treatment = 1
+        inp.system.xloads.gravity_forces = True
+    inp.system.save = False
+    inp.system.t1 = 0.5
+    inp.system.tn = 1001
+    inp.system.solver_library = "runge_kutta"
+    inp.system.solver_function = "ode"
+    inp.system.solver_settings = dict(solver_name="rk4")
+    inp.system.xloads.modalaero_forces = True
+    inp.system.aero.c_ref = 3.0
+    inp.system.aero.u_inf = u_inf
+    inp.system.aero.rho_inf = rho_inf
+    poles = jnp.load(bug_path / f"AERO/Poles{label_gaf}p{num_poles}.npy")
+    A = jnp.load(bug_path / f"AERO/A{label_gaf}p{num_poles}.npy")
+    D = jnp.load(bug_path / f"AERO/D{label_gaf}p{num_poles}.npy")
+    if approx == "Roger":
+        inp.system.aero.poles = poles
+        inp.system.aero.A = A
+        inp.system.aero.D = D
+    else:
+        inp.system.aero.approx = "Karpel"
+        inp.system.aero.poles = jnp.repeat(poles, num_modes)
+        inp.system.aero.A = A[:3]
+        inp.system.aero.D = D[:3]
+        inp.system.aero.lags_D = jnp.tile(jnp.eye(num_modes), num_poles)
+        inp.system.aero.lags_E = jnp.vstack(A[3:])
+        inp.system.aero.lags_Egust = jnp.vstack(D[3:])
+    inp.system.aero.gust_profile = "mc"
+    inp.system.aero.gust.intensity = 20
+    inp.system.aero.gust.length = 150.
+    inp.system.aero.gust.step = 0.1
+    inp.system.aero.gust.shift = 0.
+    inp.system.aero.gust.panels_dihedral = bug_path / "AERO/Dihedral_d1c7.npy"
+    inp.system.aero.gust.collocation_points = bug_path / "AERO/Collocation_d1c7.npy"
+    config = configuration.Config(inp)
+    sol = feniax.feniax_main.main(input_obj=config)
+    return config, sol.dynamicsystem_sys1
+
+
+class TestBUGKarpel:
+
+    @pytest.fixture(scope="class", params=["cao", "eao"])
+    def sols(self, request):
+        return run_bug("Roger", request.param), run_bug("Karpel", request.param)
+
+    def test_label(self, sols):
+        (config_roger, roger), (config, karpel) = sols
+        label = config.system.label.split("_")[-1]
+        assert label == {"20g21": "20g189", "20G546": "20G4914"}[
+            config_roger.system.label.split("_")[-1]]
+        assert len(config.system.states["ql"]) == num_poles * num_modes
+
+    def test_qs(self, sols):
+        # same structural states, the Karpel lags are the Roger ones over q_inf
+        (config_roger, roger), (config, karpel) = sols
+        q_inf = 0.5 * rho_inf * u_inf**2
+        ql_roger = config_roger.system.states["ql"]
+        ql_karpel = config.system.states["ql"]
+        q_structure = jnp.hstack([config.system.states["q1"], config.system.states["q2"]])
+        assert jnp.abs(roger.q[:, q_structure]).max() > 1e-3
+        assert jnp.allclose(karpel.q[:, q_structure], roger.q[:, q_structure], atol=1e-8)
+        assert jnp.allclose(q_inf * karpel.q[:, ql_karpel], roger.q[:, ql_roger], atol=1e-6)
+
+    def test_ra(self, sols):
+        (config_roger, roger), (config, karpel) = sols
+        assert jnp.allclose(karpel.ra, roger.ra, atol=1e-8)
@@ -0,0 +1,93 @@
+import feniax.preprocessor.configuration as configuration  # import Config, dump_to_yaml
+from feniax.preprocessor.inputs import Inputs
+import feniax.feniax_main
+import jax.numpy as jnp
+import pytest
+import pathlib
+
+file_path = pathlib.Path(__file__).parent
+
+
+def run_wingsp(solver_library, adjoint=None, profile=False):
+    """Gradient of the wingSP tip response to the follower load scaling
+    (dynamicAD.main_20g11_1) with the given adjoint"""
+
+    inp = Inputs()
+    inp.engine = "intrinsicmodal"
+    inp.fem.connectivity = {'c1': None}
+    inp.fem.grid = "structuralGrid"
+    inp.fem.folder = file_path / "../../../examples/wingSP/FEM/"
+    inp.fem.num_modes = 15
+    inp.fem.eig_type = "inputs"
+    inp.driver.typeof = "intrinsic"
+    inp.driver.sol_path = None
+    inp.driver.save_fem = False
+    inp.simulation.typeof = "single"
+    inp.system.name = "s1"
+    inp.system.solution = "dynamic"
+    inp.system.t1 = 4.
+    inp.system.tn = 401
+    if solver_library == "diffrax":
+        inp.system.solver_library = "diffrax"
+        inp.system.solver_function = "ode"
+        inp.system.solver_settings = dict(solver_name="Dopri5")
+    else:
+        inp.system.solver_library = "runge_kutta"
+        inp.system.solver_function = "ode"
+        inp.system.solver_settings = dict(solver_name="rk4")
+    inp.system.xloads.follower_forces = True
+    inp.system.xloads.follower_points = [[23, 0],
+                                         [23, 2]]
+    inp.system.xloads.x = [0, 4, 4+1e-6, 20]
+    inp.system.xloads.follower_interpolation = [[0.05 * -2e5, 1 * -2e5, 0., 0.],
+                                                [0.05 * 6e5, 1 * 6e5,  0., 0.]
+                                                ]
+    inp.system.save = False
+    inp.system.ad = dict(inputs=dict(alpha=1.),
+                         input_type="point_forces",
+                         grad_type="jacrev",
+                         objective_fun="max",
+                         objective_var="X2",
+                         objective_args=dict(nodes=(1,), components=(2,)),
+                         adjoint=adjoint,
+                         profile=profile
+                         )
+    config = configuration.Config(inp)
+    obj_sol = feniax.feniax_main.main(input_obj=config)
+    return obj_sol.dynamicsystem_sys1
+
+
+class TestWingSPadjoint:
+
+    @pytest.fixture(scope="class")
+    def sol_diffrax(self):
+        # the recursive checkpointing run also profiled
+        return dict(recursive_checkpoint=run_wingsp("diffrax", "recursive_checkpoint",
+                                                    profile=True),
+                    direct=run_wingsp("diffrax", "direct"),
+                    backsolve=run_wingsp("diffrax", "backsolve"))
+
+    @pytest.fixture(scope="class")
+    def sol_rk(self):
+        return dict(recursive_checkpoint=run_wingsp("runge_kutta", "recursive_checkpoint"),
+                    direct=run_wingsp("runge_kutta", "direct"))
+
+    def test_diffrax(self, sol_diffrax):
+        jac = sol_diffrax["direct"].jac["alpha"]
+        assert jnp.abs(jac) > 1.
+        assert jnp.allclose(sol_diffrax["recursive_checkpoint"].jac["alpha"], jac,
+                            rtol=1e-8)
+        # integrated backwards in time with its own steps
+        assert jnp.allclose(sol_diffrax["backsolve"].jac["alpha"], jac, rtol=1e-3)
+
+    def test_runge_kutta(self, sol_rk):
+        jac = sol_rk["direct"].jac["alpha"]
+        assert jnp.abs(jac) > 1.
+        assert jnp.allclose(sol_rk["recursive_checkpoint"].jac["alpha"], jac, rtol=1e-8)
+
+    def test_ad_stats(self, sol_diffrax):
+        assert sol_diffrax["direct"].ad_stats is None
+        ad_stats = sol_diffrax["recursive_checkpoint"].ad_stats
+        assert ad_stats["adjoint"] == "recursive_checkpoint"
+        assert ad_stats["checkpoints"] is None
+        assert ad_stats["compile_time"] > 0 and ad_stats["run_time"] > 0
@@ -0,0 +1,92 @@
+import types
+
+import feniax.intrinsic.aero as aero
+import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
+import jax
+import jax.numpy as jnp
+import pytest
+
+
+class TestAeroDatabase:
+
+    num_modes = 4
+    num_poles = 2
+    num_panels = 5
+    c_ref = 3.0
+
+    @pytest.fixture(scope="class")
+    def database(self):
+        keys = jax.random.split(jax.random.PRNGKey(4), 2)
+        mach = jnp.array([0.5, 0.7, 0.8, 0.85])
+        A = jax.random.normal(keys[0], (len(mach), 3 + self.num_poles,
+                                        self.num_modes, self.num_modes))
+        D = jax.random.normal(keys[1], (len(mach), 3 + self.num_poles,
+                                        self.num_modes, self.num_panels))
+        return aero.AeroDatabase(
+            aero.RogerDatabase(mach, A, D, jnp.array([0.2, 0.9])), self.c_ref)
+
+    def test_interpolate(self, database):
+        tables = database.database
+        A, D = database.interpolate(0.7)
+        assert jnp.allclose(A, tables.A[1])
+        assert jnp.allclose(D, tables.D[1])
+        A, D = database.interpolate(0.825)
+        assert jnp.allclose(A, 0.5 * (tables.A[2] + tables.A[3]))
+        A, D = database.interpolate(0.9)  # clamped
+        assert jnp.allclose(D, tables.D[3])
+
+    def test_condition(self, database):
+        mach, rho_inf, u_inf = 0.6, 0.4, 200.0
+        hat = database.condition(mach, rho_inf, u_inf)
+        A, D = database.interpolate(mach)
+        q_inf = 0.5 * rho_inf * u_inf**2
+        A2hat = self.c_ref**2 * rho_inf / 8 * A[2]
+        assert jnp.allclose(hat.A0hat, q_inf * A[0])
+        assert jnp.allclose(hat.A1hat, self.c_ref * rho_inf * u_inf / 4 * A[1])
+        assert jnp.allclose(hat.A2hatinv, jnp.linalg.inv(jnp.eye(self.num_modes) - A2hat))
+        assert jnp.allclose(hat.D3hat, q_inf * D[3:])
+
+    def test_condition_grid(self, database):
+        mach = jnp.array([0.55, 0.75, 0.84])
+        rho_inf = jnp.array([0.3, 0.4, 0.5])
+        u_inf = jnp.array([150.0, 200.0, 250.0])
+        hats = database.condition_grid(mach, rho_inf, u_inf)
+        for i in range(len(mach)):
+            hat = database.condition(mach[i], rho_inf[i], u_inf[i])
+            assert jnp.allclose(hats.A3hat[i], hat.A3hat)
+            assert jnp.allclose(hats.D0hat[i], hat.D0hat)
+
+    def test_condition_traced(self, database):
+        mach, rho_inf, u_inf = 0.6, 0.4, 200.0
+        hat = database.condition(mach, rho_inf, u_inf)
+        hat_jit = jax.jit(database.condition)(mach, rho_inf, u_inf)
+        assert jnp.allclose(hat_jit.A3hat, hat.A3hat)
+        # derivative with respect to the Mach number, linear within a cell
+        dA0 = jax.grad(lambda m: database.condition(m, rho_inf, u_inf).A0hat[0, 0])(mach)
+        tables = database.database
+        q_inf = 0.5 * rho_inf * u_inf**2
+        slope = (tables.A[1, 0, 0, 0] - tables.A[0, 0, 0, 0]) / (tables.mach[1] - tables.mach[0])
+        assert jnp.allclose(dA0, q_inf * slope)
+
+
+def test_karpel_mach_grid():
+    keys = jax.random.split(jax.random.PRNGKey(5), 4)
+    num_modes, num_lags, num_panels = 4, 3, 5
+    mach_grid = jnp.array([0.5, 0.8])
+    A = jax.random.normal(keys[0], (2, 3, num_modes, num_modes))
+    D = jax.random.normal(keys[1], (2, 3, num_modes, num_panels))
+    lags_D = jax.random.normal(keys[2], (2, num_modes, num_lags))
+    lags_E = jax.random.normal(keys[3], (2, num_lags, num_modes))
+    settings = intrinsicmodal.Daero(approx="karpel", u_inf=200.0, rho_inf=0.4,
+                                    c_ref=3.0, mach=0.6, mach_grid=mach_grid,
+                                    A=A, D=D, lags_D=lags_D, lags_E=lags_E,
+                                    poles=jnp.array([0.2, 0.9, 1.5]))
+    system = types.SimpleNamespace(aero=settings, name="s1")
+    karpel = aero.AeroKarpel(system, None)
+    karpel.get_matrices()
+    w = 1.0 / 3  # 0.6 between 0.5 and 0.8
+    assert jnp.allclose(karpel.container["A1"], (1 - w) * A[0, 1] + w * A[1, 1])
+    assert jnp.allclose(karpel.container["D2"], (1 - w) * D[0, 2] + w * D[1, 2])
+    assert jnp.allclose(karpel.container["lags_E"], (1 - w) * lags_E[0] + w * lags_E[1])
+    assert jnp.allclose(karpel.container["lags_Dhat"],
+                        settings.q_inf * ((1 - w) * lags_D[0] + w * lags_D[1]))
@@ -0,0 +1,86 @@
+import feniax.intrinsic.couplings as couplings
+import feniax.intrinsic.dq_dynamic as dq_dynamic
+import jax
+import jax.numpy as jnp
+import pytest
+import tests.builders as builders
+
+
+def sailplane_system(loads):
+    inp = builders.sailplane(num_modes=30)
+    if loads == "gravity":
+        inp.systems.sett.s1.xloads.follower_forces = False
+        inp.systems.sett.s1.xloads.gravity_forces = True
+    driver = builders.run(inp, return_driver=True)
+    return driver.systems["s1"]
+
+
+@pytest.mark.parametrize("loads, label", [("follower", "10g11"),
+                                          ("gravity", "10G1")])
+def test_static(loads, label):
+    system = sailplane_system(loads)
+    assert system.settings.label == label
+    q = 1e-2 * jax.random.normal(jax.random.PRNGKey(0), (system.settings.num_states,))
+    args = system.args1 + (1.5,)
+    jac = system.jac(q, args)
+    jac_ad = jax.jacfwd(system.dFq)(q, args)
+    assert jnp.allclose(jac, jac_ad, rtol=1e-6, atol=1e-8 * jnp.abs(jac_ad).max())
+
+
+class TestDynamic:
+
+    num_modes = 6
+    num_poles = 3
+
+    @pytest.fixture(scope="class", params=["dense", "sparse", "tucker"])
+    def args(self, request):
+        Nm, Np = self.num_modes, self.num_poles
+        keys = jax.random.split(jax.random.PRNGKey(1), 12)
+        gamma1 = jax.random.normal(keys[0], (Nm, Nm, Nm))
+        gamma2 = jax.random.normal(keys[1], (Nm, Nm, Nm))
+        if request.param != "dense":
+            gamma1 = couplings.compress(gamma1, request.param, 1e-9)
+            gamma2 = couplings.compress(gamma2, request.param, 1e-9)
+        omega = jnp.linspace(1.0, 10.0, Nm)
+        states = dict(q1=jnp.arange(Nm), q2=jnp.arange(Nm, 2 * Nm),
+                      ql=jnp.arange(2 * Nm, (2 + Np) * Nm))
+        eta_0 = jax.random.normal(keys[2], (Nm,))
+        aero = [jax.random.normal(ki, (Nm, Nm)) for ki in keys[3:6]]
+        A3hat = jax.random.normal(keys[6], (Np, Nm, Nm))
+        poles = jnp.array([0.1, 0.5, 1.2])
+        xgust = jnp.linspace(0, 1, 11)
+        F1gust = jax.random.normal(keys[7], (Nm, 11))
+        Flgust = jax.random.normal(keys[8], (Np, Nm, 11))
+        phi1 = jax.random.normal(keys[9], (Nm, 6, 4))
+        x = jnp.array([0.0, 1.0])
+        force_follower = jax.random.normal(keys[10], (2, 6, 4))
+        q = jax.random.normal(keys[11], ((2 + Np) * Nm,))
+        return dict(
+            q=q,
+            **{"20g1": (eta_0, gamma1, gamma2, omega, states),
+               "20g11": (eta_0, gamma1, gamma2, omega, phi1, x, force_follower, states),
+               "20g21": (eta_0, gamma1, gamma2, omega, states, poles, Nm, Np, xgust,
+                         1.5, aero[0], aero[1], aero[2], A3hat, 20.0, F1gust, Flgust),
+               # Roger's lags as a minimum-state model with Np x Nm lag states
+               "20g189": (eta_0, gamma1, gamma2, omega, states, jnp.repeat(poles, Nm),
+                          xgust, 1.5, aero[0], aero[1], aero[2],
+                          jnp.tile(jnp.eye(Nm), Np), jnp.vstack(A3hat), 20.0, F1gust,
+                          Flgust.reshape((1, Np * Nm, 11)))})
+
+    def test_karpel_roger(self, args):
+        q = args["q"]
+        assert jnp.allclose(dq_dynamic.dq_20g189(0.3, q, args["20g189"]),
+                            dq_dynamic.dq_20g21(0.3, q, args["20g21"]))
+
+    @pytest.mark.parametrize("label", ["20g1", "20g11", "20g21", "20g189"])
+    def test_jac(self, args, label):
+        dq = getattr(dq_dynamic, f"dq_{label}")
+        jac = getattr(dq_dynamic, f"jac_{label}")
+        num_states = 2 * self.num_modes
+        if label in ("20g21", "20g189"):
+            num_states += self.num_modes * self.num_poles
+        q = args["q"][:num_states]
+        J = jac(0.3, q, args[label])
+        J_ad = jax.jacfwd(dq, argnums=1)(0.3, q, args[label])
+        assert J.shape == (num_states, num_states)
+        assert jnp.allclose(J, J_ad)
@@ -0,0 +1,219 @@
+import types
+
+import feniax.intrinsic.gust as gust
+import feniax.intrinsic.xloads as xloads
+import feniax.preprocessor.solution as solution
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+import scipy.sparse
+import tests.builders as builders
+
+
+def grid(uniform, n=200):
+    if uniform:
+        return jnp.linspace(0.0, 2.0, n)
+    rng = np.random.default_rng(1)
+    return jnp.array(np.sort(np.hstack([0.0, 2.0, rng.uniform(0.0, 2.0, n - 2)])))
+
+
+class TestInterpolation:
+
+    @pytest.mark.parametrize("uniform", [True, False])
+    def test_numpy(self, uniform):
+        x = grid(uniform)
+        data = jnp.sin(3 * x)
+        ts = jnp.hstack([x[::17], jnp.linspace(0.0, 2.0, 101)])
+        f = jax.vmap(lambda t: xloads.linear_interpolation(t, x, data))(ts)
+        assert jnp.allclose(f, np.interp(ts, x, data))
+
+    def test_clamped(self):
+        x = grid(True, 5)
+        f = jax.vmap(lambda t: xloads.linear_interpolation(t, x, x**2))(
+            jnp.array([-1.0, 3.0]))
+        assert jnp.allclose(f, jnp.array([0.0, 4.0]))
+
+    @pytest.mark.parametrize("uniform", [True, False])
+    def test_tables(self, uniform):
+        # gust tables of different layouts from one lookup
+        x = grid(uniform)
+        F1gust = jnp.outer(jnp.arange(1.0, 4.0), jnp.cos(x))
+        Flgust = jnp.stack([F1gust, 2 * F1gust])
+        t = 0.7312
+        eta, Fl = xloads.rogergust(t, x, F1gust, Flgust)
+        assert jnp.allclose(eta, xloads.eta_rogergust(t, x, F1gust))
+        assert jnp.allclose(Fl, xloads.lags_rogergust(t, x, Flgust))
+        assert jnp.allclose(Fl[3:], 2 * eta)
+
+    @pytest.mark.parametrize("t", [0.4, 0.45])
+    def test_derivative(self, t):
+        # slope of the segment starting at t, also on the grid points
+        x = grid(True, 11)
+        dfdt = jax.grad(lambda t: xloads.linear_interpolation(t, x, x**2))(t)
+        assert jnp.allclose(dfdt, 1.0)
+
+
+def sailplane_tip_loads(loads, sparse):
+    inp = builders.sailplane(num_modes=30, t=[1, 1.5, 2])
+    xloads_sett = inp.systems.sett.s1.xloads
+    xloads_sett.follower_forces = False
+    setattr(xloads_sett, f"{loads}_forces", True)
+    setattr(xloads_sett, f"{loads}_points", [[25, 2], [48, 2], [48, 4]])
+    setattr(xloads_sett, f"{loads}_interpolation", [[0., 2e5, 5e5],
+                                                    [0., 2e5, 5e5],
+                                                    [0., 1e4, 2e4]])
+    xloads_sett.sparse = sparse
+    return builders.run(inp, return_driver=True).sol
+
+
+class TestSparseLoads:
+
+    def test_eta_pointdead(self):
+        keys = jax.random.split(jax.random.PRNGKey(0), 4)
+        num_nodes = 12
+        phi1 = jax.random.normal(keys[0], (5, 6, num_nodes))
+        Rab = jax.random.normal(keys[1], (3, 3, num_nodes))
+        C06ab = jax.random.normal(keys[2], (6, 6, num_nodes))
+        x = jnp.array([0.0, 1.0])
+        points = [[7, 0], [3, 2], [7, 4]]
+        interpolation = [[0.0, 1.0], [0.0, 2.0], [0.0, 3.0]]
+        index, force = xloads.sparse_point_forces(x, points, interpolation)
+        assert jnp.array_equal(index, jnp.array([3, 7]))
+        assert force.shape == (2, 6, 2)
+        dead = xloads.point_loads(force, index, phi1)
+        force_dead = xloads.build_point_dead(x, points, interpolation, num_nodes)
+        assert jnp.allclose(xloads.eta_pointdead(0.3, phi1, x, dead, Rab),
+                            xloads.eta_pointdead(0.3, phi1, x, force_dead, Rab))
+        index, force = xloads.sparse_point_forces(x, points, interpolation, C06ab)
+        follower = xloads.point_loads(force, index, phi1)
+        force_follower = xloads.build_point_follower(x, points, interpolation,
+                                                     num_nodes, C06ab)
+        assert jnp.allclose(xloads.eta_pointfollower(0.3, phi1, x, follower),
+                            xloads.eta_pointfollower(0.3, phi1, x, force_follower))
+        assert xloads.point_loads(force_dead, None, phi1) is force_dead
+
+    @pytest.mark.parametrize("loads", ["follower", "dead"])
+    def test_sailplane(self, loads, tmp_path):
+        dense = sailplane_tip_loads(loads, False)
+        sparse = sailplane_tip_loads(loads, True)
+        assert jnp.allclose(sparse.data.staticsystem_s1.q, dense.data.staticsystem_s1.q)
+        assert jnp.allclose(sparse.data.staticsystem_s1.ra, dense.data.staticsystem_s1.ra)
+        # the sparse forces stored as arrays in the PointForces container
+        sparse.save_container("PointForces", label="_s1", path=tmp_path)
+        sol = solution.IntrinsicSolution(tmp_path)
+        sol.load_container("PointForces", label="_s1", path=tmp_path)
+        pointforces = sparse.data.pointforces_s1
+        for name in (f"force_{loads}", f"{loads}_index"):
+            assert jnp.array_equal(getattr(sol.data.pointforces_s1, name),
+                                   getattr(pointforces, name))
+
+
+def test_shard_gravity_sparse():
+    num_nodes = 5
+    rng = np.random.default_rng(3)
+    Ma = rng.uniform(size=(6 * num_nodes, 6 * num_nodes))
+    Ma = scipy.sparse.csr_array(np.where(Ma > 0.7, Ma, 0.0))
+    Mfe_order = jnp.eye(6 * num_nodes)[::-1]
+    gravity = jnp.array([9.81, 1.62])
+    gravity_vect = jnp.array([[0.0, 0.0, -1.0], [0.3, 0.0, -0.9]])
+    x = jnp.array([0.0, 0.5, 1.0])
+    forces = xloads.shard_gravity(x, gravity, gravity_vect, Ma, Mfe_order)
+    for i in range(len(gravity)):
+        force_i = xloads.build_gravity(x, gravity[i], gravity_vect[i],
+                                       Ma.toarray(), Mfe_order)
+        assert jnp.allclose(forces[i], force_i)
+
+
+class TestGustKernel:
+
+    u_inf = 10.0
+    length = 3.0
+    intensity = 2.0
+    num_modes = 4
+    num_poles = 3
+    num_panels = 40
+
+    @pytest.fixture(scope="class")
+    def inputs(self):
+        keys = jax.random.split(jax.random.PRNGKey(2), 6)
+        collocation_points = jnp.hstack(
+            [jax.random.uniform(keys[0], (self.num_panels, 1), maxval=20.0),
+             jax.random.uniform(keys[1], (self.num_panels, 2))])
+        normals = jax.random.uniform(keys[2], (self.num_panels,))
+        D = jax.random.normal(keys[3], (3 + self.num_poles, self.num_modes,
+                                        self.num_panels))
+        fshape_span = gust._get_spanshape("const")
+        return collocation_points, normals, fshape_span, D
+
+    def kernel(self, inputs, num_window=None):
+        collocation_points, normals, fshape_span, D = inputs
+        return gust.kernelRogerMc(self.u_inf, self.length, self.intensity, 0.5,
+                                  collocation_points, normals, fshape_span,
+                                  D[0], D[1], D[2], D[3:], num_window)
+
+    def test_tables(self, inputs):
+        # same forcing as the tables at their time samples
+        collocation_points, normals, fshape_span, D = inputs
+        time = jnp.linspace(0.0, 2.5, 251)
+        w, wdot, wddot = gust._downwashRogerMc(
+            self.u_inf, self.length, self.intensity, 0.5, collocation_points,
+            normals, time, self.length / self.u_inf, fshape_span)
+        *_, Q_wsum, Ql_wdot = gust._getGAFs(D[0], D[1], D[2], D[3:], w, wdot, wddot)
+        kernel = self.kernel(inputs)
+        eta, Fl = jax.vmap(lambda t: xloads.rogergust(t, None, kernel, None))(time)
+        assert jnp.allclose(eta, Q_wsum.T)
+        assert jnp.allclose(Fl, jax.vmap(jnp.hstack, in_axes=2)(Ql_wdot))
+
+    def test_window(self, inputs):
+        num_window = gust.num_panels_window(inputs[0], self.length)
+        assert num_window < self.num_panels
+        time = jnp.linspace(0.0, 2.5, 251)
+        full = jax.vmap(lambda t: xloads.eta_gustkernel(t, self.kernel(inputs)))(time)
+        window = jax.vmap(
+            lambda t: xloads.eta_gustkernel(t, self.kernel(inputs, num_window)))(time)
+        assert jnp.allclose(full[0], window[0])
+        assert jnp.allclose(full[1], window[1])
+
+    def test_gust_forces(self, inputs):
+        # the tables on settings.time, or the kernel, from the same settings
+        collocation_points, normals, fshape_span, D = inputs
+        time = jnp.linspace(0.0, 2.5, 251)
+        settings = types.SimpleNamespace(
+            analytic=False, shape="const", shift=0.5, time=time,
+            collocation_points=collocation_points, panels_dihedral=normals)
+        (Q_wsum, Ql_wdot), (w, *_) = gust.gust_forces(
+            settings, self.u_inf, self.length, self.intensity,
+            D[0], D[1], D[2], D[3:], full_output=True)
+        w_ref, *_ = gust._downwashRogerMc(
+            self.u_inf, self.length, self.intensity, 0.5, collocation_points,
+            normals, time, self.length / self.u_inf, fshape_span)
+        assert jnp.allclose(w, w_ref)
+        settings.analytic = True
+        kernel, Fl_kernel = gust.gust_forces(
+            settings, self.u_inf, self.length, self.intensity,
+            D[0], D[1], D[2], D[3:])
+        assert Fl_kernel is None
+        eta, Fl = jax.vmap(lambda t: xloads.rogergust(t, None, kernel, None))(time)
+        assert jnp.allclose(eta, Q_wsum.T)
+        assert jnp.allclose(Fl, jax.vmap(jnp.hstack, in_axes=2)(Ql_wdot))
+
+
+def test_rogerlags():
+    num_modes, num_poles = 5, 4
+    keys = jax.random.split(jax.random.PRNGKey(3), 5)
+    A3hat = jax.random.normal(keys[0], (num_poles, num_modes, num_modes))
+    A0hat, A1hat = jax.random.normal(keys[1], (2, num_modes, num_modes))
+    q0, q1 = jax.random.normal(keys[2], (2, num_modes))
+    ql = jax.random.normal(keys[3], (num_poles * num_modes,))
+    poles = jnp.linspace(0.1, 1.5, num_poles)
+    u_inf, c_ref = 200.0, 3.0
+    ql_dot = xloads.lags_rogerstructure(A3hat, q1, ql, u_inf, c_ref, poles,
+                                        num_modes, num_poles)
+    eta = xloads.eta_rogerstruct(q0, q1, ql, A0hat, A1hat, num_modes, num_poles)
+    for pi in range(num_poles):
+        qli = ql[pi * num_modes: (pi + 1) * num_modes]
+        assert jnp.allclose(ql_dot[pi * num_modes: (pi + 1) * num_modes],
+                            A3hat[pi] @ q1 - 2 * u_inf / c_ref * poles[pi] * qli)
+    assert jnp.allclose(eta, A0hat @ q0 + A1hat @ q1
+                        + ql.reshape((num_poles, num_modes)).sum(0))
@@ -0,0 +1,84 @@
+import types
+
+from feniax.preprocessor.containers.intrinsicmodal import DBatch
+import feniax.intrinsic.args as libargs
+import feniax.intrinsic.xloads as xloads
+import feniax.systems.intrinsic_system as intrinsic_system
+import jax.numpy as jnp
+import pytest
+import tests.builders as builders
+
+
+def run_sailplane(scale=1.0, batch=None):
+    inp = builders.sailplane(batch=batch)
+    inp.systems.sett.s1.xloads.follower_interpolation = [[0., 2e5 * scale, 5e5 * scale],
+                                                         [0., 2e5 * scale, 5e5 * scale]]
+    return builders.run(inp).staticsystem_s1
+
+
+def run_rafabeam(batch=None):
+    return builders.run(builders.rafabeam(batch=batch)).dynamicsystem_s1
+
+
+class TestBatchStatic:
+
+    def test_load_scaling(self):
+        sol = run_sailplane(scale=0.5)
+        sol_batch = run_sailplane(batch=dict(load_scaling=[1.0, 0.5]))
+        assert sol_batch.q.shape == (2,) + sol.q.shape
+        assert jnp.allclose(sol_batch.q[1], sol.q)
+        assert jnp.allclose(sol_batch.ra[1], sol.ra)
+
+
+    def test_load_scaling_noloads(self):
+        # free vibrations: no external loads to scale
+        with pytest.raises(ValueError, match="load_scaling"):
+            run_rafabeam(batch=dict(load_scaling=[1.0, 0.5]))
+
+
+def test_batch_lengths():
+    with pytest.raises(ValueError, match="eta0=3, load_scaling=2"):
+        DBatch(eta0=jnp.zeros((3, 10)), load_scaling=[1.0, 0.5])
+    with pytest.raises(ValueError, match="load_scaling=scalar"):
+        DBatch(load_scaling=1.0)
+    with pytest.raises(ValueError, match="no batched fields"):
+        DBatch()
+    assert DBatch(load_scaling=[1.0, 0.5]).num_cases == 2
+
+
+@pytest.mark.parametrize("solver_library", ["runge_kutta", "scipy"])
+def test_batch_args(solver_library):
+    # eta_0 and the loads located by field name, only the forces of the
+    # sparse point loads scaled
+    loads = xloads.PointLoads(index=jnp.array([2]), phi1=jnp.ones((3, 6, 1)),
+                              force=jnp.ones((2, 6, 1)))
+    args1 = libargs.Args_10g11(eta_0=jnp.zeros(3), gamma2=jnp.ones((3, 3, 3)),
+                               omega=jnp.ones(3), phi1=jnp.ones((3, 6, 4)),
+                               x=jnp.array([0.0, 1.0]), force_follower=loads)
+    settings = types.SimpleNamespace(
+        label="dynamic_10g11", solver_library=solver_library,
+        batch=DBatch(eta0=jnp.zeros((2, 3)), load_scaling=[1.0, 0.5]))
+    system = types.SimpleNamespace(
+        args1=getattr(libargs, f"_args_{solver_library}")(args1), settings=settings)
+    leaves, build_args = intrinsic_system.IntrinsicSystem.batch_args(system)
+    case = build_args(leaves, 2 * jnp.ones(3), 0.5)
+    if solver_library == "scipy":
+        (case,) = case
+    assert isinstance(case, libargs.Args_10g11)
+    assert jnp.allclose(case.eta_0, 2.0)
+    assert jnp.allclose(case.force_follower.force, 0.5)
+    assert jnp.allclose(case.force_follower.phi1, 1.0)
+    assert jnp.allclose(case.gamma2, 1.0)
+
+
+class TestBatchDynamic:
+
+    def test_q0(self):
+        sol = run_rafabeam()
+        q0 = sol.q[0]
+        sol_batch = run_rafabeam(batch=dict(q0=jnp.stack([q0, 0.5 * q0])))
+        assert sol_batch.q.shape == (2,) + sol.q.shape
+        assert jnp.allclose(sol_batch.q[0], sol.q)
+        assert jnp.allclose(sol_batch.X2[0], sol.X2)
+        assert jnp.allclose(sol_batch.ra[0], sol.ra)
+        assert not jnp.allclose(sol_batch.q[1], sol.q)
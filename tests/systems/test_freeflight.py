@@ -0,0 +1,52 @@
+import feniax.preprocessor.configuration as configuration  # import Config, dump_to_yaml
+from feniax.preprocessor.inputs import Inputs
+import feniax.feniax_main
+import jax.numpy as jnp
+import numpy as np
+import pathlib
+
+file_path = pathlib.Path(__file__).parent
+
+
+def run_spaguetti(**sett):
+    """Free-flying beam pushed by dead forces at its tip"""
+    inp = Inputs()
+    inp.engine = "intrinsicmodal"
+    inp.fem.connectivity = {'0': None}
+    inp.fem.folder = file_path / "../../examples/SimoFSpaguetti/FEMshell25/"
+    inp.fem.num_modes = 50
+    inp.fem.eig_type = "scipy"
+    inp.driver.typeof = "intrinsic"
+    inp.driver.save_fem = False
+    inp.driver.sol_path = None
+    inp.simulation.typeof = "single"
+    inp.systems.sett.s1.solution = "dynamic"
+    inp.systems.sett.s1.bc1 = "free"
+    inp.systems.sett.s1.save = False
+    inp.systems.sett.s1.t1 = 1.
+    inp.systems.sett.s1.tn = 1001
+    inp.systems.sett.s1.solver_library = "runge_kutta"
+    inp.systems.sett.s1.solver_function = "ode"
+    inp.systems.sett.s1.solver_settings = dict(solver_name="rk4")
+    inp.systems.sett.s1.xloads.dead_forces = True
+    inp.systems.sett.s1.xloads.dead_points = [[24, 0], [24, 5]]
+    inp.systems.sett.s1.xloads.x = [0., 2.5, 2.5 + 1e-6, 15.5]
+    inp.systems.sett.s1.xloads.dead_interpolation = [[8., 8., 0., 0.],
+                                                     [-80., -80., 0., 0.]]
+    for k, v in sett.items():
+        setattr(inp.systems.sett.s1, k, v)
+    config = configuration.Config(inp)
+    return feniax.feniax_main.main(input_obj=config).dynamicsystem_s1
+
+
+def test_nonuniform_save_at():
+    sol = run_spaguetti()
+    # the first node moves with the rigid body
+    assert jnp.abs(sol.ra[-1, :, 0] - sol.ra[0, :, 0]).max() > 0.3
+    index = np.hstack([np.arange(0, 500, 2), np.arange(500, 1001, 5)])
+    save_at = np.asarray(sol.t)[index].tolist()
+    sol_nonuniform = run_spaguetti(
+        solver_settings=dict(solver_name="rk4", save_at=save_at))
+    assert jnp.allclose(sol_nonuniform.q, sol.q[index])
+    assert jnp.allclose(sol_nonuniform.ra, sol.ra[index], atol=1e-3)
+    assert jnp.allclose(sol_nonuniform.Cab, sol.Cab[index], atol=1e-3)
@@ -0,0 +1,365 @@
+from functools import partial
+
+import feniax.preprocessor.containers.intrinsicmodal as intrinsicmodal
+from feniax.systems import sollibs
+from feniax.systems.sollibs import runge_kutta
+from feniax.systems.sollibs import diffrax as diffrax_lib
+from feniax.systems.sollibs import exponential
+from feniax.systems.sollibs import imex
+from feniax.systems.sollibs import newton
+import feniax.systems.continuation as continuation
+import feniax.systems.intrinsic_system as intrinsic_system
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+
+def dq_mathieu(t, q, args):
+    return jnp.array([q[1], -q[0] * (1 + 0.5 * jnp.sin(t))])
+
+
+def dq_pulse(t, q, args):
+    # oscillator forced by a rectangular pulse between 1 and 1.5
+    f = jnp.where((t >= 1.0) & (t < 1.5), 1.0, 0.0)
+    return jnp.array([q[1], -q[0] + f])
+
+
+def pulse_exact(t):
+    t = np.asarray(t)
+    u = np.where(t > 1.0, 1 - np.cos(t - 1.0), 0.0)
+    return u - np.where(t > 1.5, 1 - np.cos(t - 1.5), 0.0)
+
+
+omega_stiff = jnp.array([1.0, 300.0])
+
+
+def dq_stiff(t, q, args):
+    # two intrinsic-like modes, the second one far beyond the load bandwidth
+    q1, q2 = q[:2], q[2:]
+    F1 = omega_stiff * q2 + jnp.array([jnp.sin(t) - 0.1 * q1[0] ** 2, 0.1 * q1[0] ** 2])
+    F2 = -omega_stiff * q1
+    return jnp.hstack([F1, F2])
+
+
+omega_static = jnp.array([1.0, 2.0, 4.0])
+
+
+def dq_static(q, args):
+    # quadratic (gamma2-like) static system under an increasing load t
+    force, t = args
+    return omega_static * q - 0.1 * jnp.roll(q, 1) * q + t * force
+
+
+def jac_static(q, args):
+    return (jnp.diag(omega_static - 0.1 * jnp.roll(q, 1))
+            - 0.1 * jnp.diag(q) @ jnp.roll(jnp.eye(3), 1, axis=0))
+
+
+def dq_snap(q, args):
+    # softening-stiffening spring with limit points at loads 0.201 and 0.077
+    (t,) = args
+    a, b = q
+    return jnp.array([a - 1.5 * a**2 + 0.6 * a**3 - t, b - 0.5 * a - 0.1 * t])
+
+
+def dq_lag(t, q, args):
+    # oscillator with a fast-decaying aerodynamic-like lag state
+    x, v, l = q
+    return jnp.array([v, -x + l + jnp.sin(t), -2000.0 * l + 10 * v - 0.1 * x**2])
+
+
+class TestRungeKutta:
+
+    @pytest.fixture(scope="class")
+    def reference(self):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4")
+        sol = runge_kutta.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, dt=1e-3, tn=2001)
+        return sol
+
+    @pytest.mark.parametrize("solver_name, order", [("rk4", 4),
+                                                     ("dopri5", 5),
+                                                     ("tsit5", 5)])
+    def test_order(self, reference, solver_name, order):
+        errors = []
+        for tn in (21, 41):
+            sett = intrinsicmodal.Drunge_kuttaOde(solver_name=solver_name)
+            sol = runge_kutta.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                                  t0=0.0, dt=2.0 / (tn - 1), tn=tn)
+            errors.append(jnp.abs(sol.ys[-1] - reference.ys[-1]).max())
+        assert np.log2(errors[0] / errors[1]) > order - 0.3
+
+    def test_save_stride(self, reference):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4", save_stride=100)
+        sol = runge_kutta.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, dt=1e-3, tn=2001)
+        assert sol.ys.shape == (21, 2)
+        assert jnp.allclose(sol.ts, reference.ts[::100])
+        assert jnp.allclose(sol.ys, reference.ys[::100])
+
+    @pytest.mark.parametrize("checkpoints", [3, 7, 1000, None])
+    def test_checkpointed_grad(self, checkpoints):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4", save_stride=10)
+
+        def f_obj(q0, adjoint=None):
+            sol = runge_kutta.ode(dq_mathieu, None, sett, q0=q0, t0=0.0, dt=1e-2,
+                                  tn=201, adjoint=adjoint)
+            return jnp.sum(sol.ys[:, 0] ** 2)
+
+        adjoint = intrinsicmodal.DtoAD(input_type="point_forces",
+                                       adjoint="recursive_checkpoint",
+                                       checkpoints=checkpoints,
+                                       objective_args=dict(nodes=(0,), t=(0,)))
+        q0 = jnp.array([1.0, 0.2])
+        grad = jax.grad(f_obj)(q0)
+        grad_checkpointed = jax.grad(partial(f_obj, adjoint=adjoint))(q0)
+        assert jnp.allclose(grad, grad_checkpointed)
+        assert runge_kutta.scan_checkpoints(adjoint, 100) == (checkpoints or 10)
+
+    def test_save_at(self, reference):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4",
+                                              save_at=[0.5, 1.0, 2.0])
+        sol = runge_kutta.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, dt=1e-3, tn=2001)
+        assert jnp.allclose(sol.ys, reference.ys[jnp.array([500, 1000, 2000])])
+
+    def test_save_at_nonuniform(self):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4",
+                                              save_at=[0.01, 0.02, 0.03, 2.0])
+        sol = runge_kutta.ode(lambda t, q, args: -q, None, sett, q0=jnp.ones(1),
+                              t0=0.0, dt=1e-2, tn=201)
+        assert jnp.allclose(sol.ys[:, 0], jnp.exp(-sol.ts), rtol=1e-8)
+        # the short intervals do not take the steps of the long one
+        chunk_size, interval, first, valid, last = runge_kutta.chunk_intervals(
+            np.array([1, 1, 1, 197]))
+        assert valid.sum() == 200 and len(valid) * chunk_size <= 2 * 200
+
+    @pytest.mark.parametrize("save_at, match", [([-1.0, 1.0], "before the initial"),
+                                                 ([0.5, 0.2, 1.0], "not sorted")])
+    def test_save_at_invalid(self, save_at, match):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4", save_at=save_at)
+        with pytest.raises(ValueError, match=match):
+            runge_kutta.ode(lambda t, q, args: -q, None, sett, q0=jnp.ones(1),
+                            t0=0.0, dt=1e-2, tn=201)
+
+    def test_events(self, reference):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4")
+        sol = runge_kutta.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, dt=1e-3, tn=2001,
+                              events=(lambda t, q: q[0],))
+        # stopped at the first point past the zero crossing of q[0]
+        index = int(jnp.argmax(reference.ys[:, 0] < 0))
+        assert sol.ts.shape == reference.ts.shape
+        assert jnp.all(jnp.isinf(sol.ts[index + 1:]))
+        ts, ys = sollibs.trim_events(sol.ts, sol.ys)
+        assert len(ts) == index + 1
+        assert jnp.allclose(ys, reference.ys[: index + 1])
+
+    def test_events_traced(self, reference):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4")
+
+        @jax.jit
+        @jax.vmap
+        def solve(q0):
+            return runge_kutta.ode(dq_mathieu, None, sett, q0=q0,
+                                   t0=0.0, dt=1e-3, tn=2001,
+                                   events=(lambda t, q: q[0],))
+
+        sol = solve(jnp.array([[1.0, 0.0], [2.0, 0.0]]))
+        # linear in q0, same event time
+        index = int(jnp.argmax(reference.ys[:, 0] < 0))
+        assert jnp.allclose(sol.ys[1, : index + 1], 2 * reference.ys[: index + 1])
+        assert jnp.all(jnp.isinf(sol.ys[:, index + 1:]))
+
+
+class TestDiffrax:
+
+    def test_adaptive_jumps(self):
+        sett = intrinsicmodal.DdiffraxOde(rtol=1e-8, atol=1e-10,
+                                          jump_ts=[1.0, 1.5],
+                                          save_at=[0.3, 1.2, 1.7, 4.0])
+        sol = diffrax_lib.ode(dq_pulse, None, sett, q0=jnp.zeros(2),
+                              t0=0.0, t1=4.0, tn=None, dt=0.1)
+        assert jnp.allclose(sol.ts, jnp.array([0.3, 1.2, 1.7, 4.0]))
+        assert np.allclose(sol.ys[:, 0], pulse_exact(sol.ts), atol=1e-7)
+        # far fewer steps than the fixed dt
+        assert sol.stats["num_accepted_steps"] < 40
+
+    def test_dense(self):
+        sett = intrinsicmodal.DdiffraxOde(rtol=1e-8, atol=1e-10, dense=True)
+        sol = diffrax_lib.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, t1=2.0, tn=3, dt=0.1)
+        sett_ref = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4",
+                                                  save_at=[0.77])
+        ref = runge_kutta.ode(dq_mathieu, None, sett_ref, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, dt=1e-3, tn=2001)
+        assert jnp.allclose(sol.evaluate(0.77), ref.ys[0], atol=1e-6)
+
+    def test_events(self):
+        sett = intrinsicmodal.DdiffraxOde(solver_name="Tsit5")
+        sol = diffrax_lib.ode(dq_mathieu, None, sett, q0=jnp.array([1.0, 0.0]),
+                              t0=0.0, t1=2.0, tn=2001, dt=1e-3,
+                              events=(lambda t, q: q[0],))
+        ts, ys = sollibs.trim_events(sol.ts, sol.ys)
+        assert 1000 < len(ts) < 2001
+        assert jnp.all(jnp.isfinite(ys))
+        assert ys[-2, 0] > 0 and abs(ys[-1, 0]) < 2e-3
+
+
+class TestExponential:
+
+    @pytest.fixture(scope="class")
+    def reference(self):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4", save_stride=100)
+        return runge_kutta.ode(dq_stiff, None, sett, q0=jnp.array([1.0, 0.01, 0.0, 0.0]),
+                               t0=0.0, dt=2e-4, tn=10001)
+
+    # dt * omega_max = 6 and 3, beyond the stability limit of rk4
+    @pytest.mark.parametrize("solver_name, tn, atol", [("etdrk4", 101, 1e-5),
+                                                        ("lawson4", 201, 1e-4)])
+    def test_large_step(self, reference, solver_name, tn, atol):
+        sett = intrinsicmodal.DexponentialOde(solver_name=solver_name)
+        sol = exponential.ode(dq_stiff, None, sett, q0=jnp.array([1.0, 0.01, 0.0, 0.0]),
+                              t0=0.0, dt=2.0 / (tn - 1), tn=tn)
+        step = (tn - 1) // 100
+        assert jnp.allclose(sol.ts[::step], reference.ts)
+        assert jnp.allclose(sol.ys[::step], reference.ys, atol=atol)
+
+    def test_save_at(self, reference):
+        sett = intrinsicmodal.DexponentialOde(save_at=[0.4, 1.0, 2.0])
+        sol = exponential.ode(dq_stiff, None, sett, q0=jnp.array([1.0, 0.01, 0.0, 0.0]),
+                              t0=0.0, dt=0.02, tn=101)
+        assert jnp.allclose(sol.ys, reference.ys[jnp.array([20, 50, 100])], atol=1e-5)
+
+
+class TestImex:
+
+    @pytest.fixture(scope="class")
+    def reference(self):
+        sett = intrinsicmodal.Drunge_kuttaOde(solver_name="rk4", save_stride=200)
+        return runge_kutta.ode(dq_lag, None, sett, q0=jnp.array([1.0, 0.0, 0.0]),
+                               t0=0.0, dt=1e-4, tn=40001)
+
+    # dt * 2000 = 40, far beyond the stability limit of rk4
+    @pytest.mark.parametrize("solver_name, atol", [("ars222", 1e-3),
+                                                    ("ars443", 1e-5),
+                                                    ("ros2", 1e-3)])
+    def test_large_step(self, reference, solver_name, atol):
+        sett = intrinsicmodal.DimexOde(solver_name=solver_name)
+        sol = imex.ode(dq_lag, None, sett, q0=jnp.array([1.0, 0.0, 0.0]),
+                       t0=0.0, dt=0.02, tn=201)
+        assert jnp.allclose(sol.ts, reference.ts)
+        assert jnp.allclose(sol.ys[:, :2], reference.ys[:, :2], atol=atol)
+
+
+class TestNewton:
+
+    t_loads = jnp.linspace(0.1, 1.0, 10)
+    force = jnp.array([-1.0, 2.0, 1.0])
+
+    def solve(self, sett, jac=None):
+        state = newton.init_state(jnp.zeros(3))
+        return intrinsic_system._staticSolveState(
+            newton.static, dq_static, self.t_loads, jnp.zeros(3), (self.force,),
+            sett, jac=jac, solver_state=state)
+
+    @pytest.fixture(scope="class")
+    def reference(self):
+        sett = intrinsicmodal.DdiffraxNewton(rtol=1e-10, atol=1e-10)
+        return intrinsic_system._staticSolve(
+            diffrax_lib.newton, dq_static, self.t_loads, jnp.zeros(3), (self.force,),
+            sett)
+
+    def test_jac(self):
+        q = jnp.array([0.3, -1.2, 2.0])
+        assert jnp.allclose(jac_static(q, None), jax.jacfwd(dq_static)(q, (self.force, 1.0)))
+
+    @pytest.mark.parametrize("method", ["modified", "broyden", "chord"])
+    def test_methods(self, reference, method):
+        sett = intrinsicmodal.DnewtonStatic(method=method, rtol=1e-10, atol=1e-10)
+        qs, state = self.solve(sett)
+        assert jnp.allclose(qs, reference, atol=1e-8)
+        # the Jacobian is reused across the load steps
+        assert state.num_factorisations < len(self.t_loads)
+
+    @pytest.mark.parametrize("method", ["modified", "broyden", "chord"])
+    def test_residual_tolerance(self, method):
+        # stiff residual: small Newton steps with large residuals
+        def dq_stiff_static(q, args):
+            return 1e4 * dq_static(q, args)
+
+        sett = intrinsicmodal.DnewtonStatic(method=method, rtol=0.0, atol=1e-3)
+        state = newton.init_state(jnp.zeros(3))
+        qs, state = intrinsic_system._staticSolveState(
+            newton.static, dq_stiff_static, self.t_loads, jnp.zeros(3), (self.force,),
+            sett, solver_state=state)
+        residuals = jax.vmap(lambda q, t: dq_stiff_static(q, (self.force, t)))(
+            qs, self.t_loads)
+        assert jnp.linalg.norm(residuals, axis=1).max() <= 1e-3
+
+    def test_analytic_jac(self, reference):
+        sett = intrinsicmodal.DnewtonStatic(rtol=1e-10, atol=1e-10)
+        qs, state = self.solve(sett, jac=lambda q, args: jac_static(q, args))
+        assert jnp.allclose(qs, reference, atol=1e-8)
+
+
+class TestContinuation:
+
+    t_loads = jnp.linspace(0.1, 1.0, 10)
+    force = jnp.array([-1.0, 2.0, 1.0])
+
+    @pytest.fixture(scope="class")
+    def reference(self):
+        sett = intrinsicmodal.DdiffraxNewton(rtol=1e-10, atol=1e-10)
+        return intrinsic_system._staticSolve(
+            diffrax_lib.newton, dq_static, self.t_loads, jnp.zeros(3), (self.force,),
+            sett)
+
+    @pytest.mark.parametrize("method", ["load", "arclength"])
+    def test_load_levels(self, reference, method):
+        sett = intrinsicmodal.DContinuation(method=method, rtol=1e-10, atol=1e-10)
+        qs, stats = continuation.solve(dq_static, jac_static, (self.force,),
+                                       jnp.zeros(3), 0.0, self.t_loads, sett)
+        assert jnp.allclose(qs, reference, atol=1e-8)
+        # fewer increments than requested loads
+        assert stats["num_increments"] < len(self.t_loads)
+
+    @pytest.mark.parametrize("method", ["load", "arclength"])
+    def test_residual_tolerance(self, method):
+        # stiff residual: small Newton steps with large residuals
+        def dq_stiff_static(q, args):
+            return 1e6 * dq_static(q, args)
+
+        sett = intrinsicmodal.DContinuation(method=method, rtol=0.0, atol=1e-3)
+        qs, stats = continuation.solve(dq_stiff_static, None, (self.force,),
+                                       jnp.zeros(3), 0.0, self.t_loads, sett)
+        residuals = jax.vmap(lambda q, t: dq_stiff_static(q, (self.force, t)))(
+            qs, self.t_loads)
+        assert jnp.linalg.norm(residuals, axis=1).max() <= 1e-3
+
+    def test_no_correction(self, reference):
+        sett = intrinsicmodal.DContinuation(correct=False, max_step=0.05)
+        qs, stats = continuation.solve(dq_static, None, (self.force,),
+                                       jnp.zeros(3), 0.0, self.t_loads, sett)
+        assert jnp.allclose(qs, reference, atol=1e-3)
+
+    @pytest.mark.parametrize("settings, match", [
+        (dict(initial_step=0.0), "initial_step"),
+        (dict(min_step=-1e-3), "min_step"),
+        (dict(min_step=0.2, max_step=0.1), "larger than max_step"),
+        (dict(max_increments=0), "max_increments"),
+    ])
+    def test_settings(self, settings, match):
+        with pytest.raises(ValueError, match=match):
+            intrinsicmodal.DContinuation(**settings)
+
+    def test_limit_point(self):
+        loads = jnp.array([0.1, 0.15, 0.5])
+        sett = intrinsicmodal.DContinuation(method="arclength", initial_step=0.05)
+        qs, stats = continuation.solve(dq_snap, None, (), jnp.zeros(2), 0.0, loads,
+                                       sett)
+        residuals = jnp.array([dq_snap(q, (t,)) for q, t in zip(qs, loads)])
+        assert jnp.allclose(residuals, 0.0, atol=1e-6)
+        # past the snap-through, on the stiffening branch
+        assert qs[1, 0] < 0.46 and qs[2, 0] > 1.206
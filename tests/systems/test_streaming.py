@@ -0,0 +1,136 @@
+import feniax.preprocessor.solution as solution
+import feniax.preprocessor.streaming as streaming
+import jax.numpy as jnp
+import numpy as np
+import pytest
+import tests.builders as builders
+
+
+class Preempted(Exception):
+    pass
+
+
+def kill_after(monkeypatch, last_index):
+    """Interrupts the run after the checkpoint at last_index"""
+
+    save = streaming.Checkpoint.save
+
+    def save_and_kill(self, qs, index, **kwargs):
+        save(self, qs, index, **kwargs)
+        if index >= last_index:
+            raise Preempted
+
+    monkeypatch.setattr(streaming.Checkpoint, "save", save_and_kill)
+
+
+def run_sailplane(sol_path=None, **sett):
+    inp = builders.sailplane(sol_path=sol_path, t=[0.5, 1, 1.5, 2], **sett)
+    return builders.run(inp).staticsystem_s1
+
+
+def run_rafabeam(sol_path=None, **sett):
+    inp = builders.rafabeam(sol_path=sol_path, bc1="free", **sett)
+    return builders.run(inp)
+
+
+def test_npy_appender(tmp_path):
+    stream = streaming.ContainerStream(tmp_path / "container")
+    x = np.arange(24.).reshape((4, 2, 3))
+    stream.append(x=x[:3])
+    assert np.load(tmp_path / "container" / "x.npy").shape == (3, 2, 3)
+    stream.append(x=x[3:])
+    assert np.array_equal(np.load(tmp_path / "container" / "x.npy"), x)
+    assert np.array_equal(stream.load()["x"], x)
+
+
+def test_segments(tmp_path):
+    sol = run_rafabeam().dynamicsystem_s1
+    sol_stream = run_rafabeam(tmp_path, segment_time=0.12)
+    assert sol_stream.dynamicsystem_s1.q.shape == sol.q.shape
+    assert jnp.allclose(sol_stream.dynamicsystem_s1.t, sol.t)
+    assert jnp.allclose(sol_stream.dynamicsystem_s1.q, sol.q)
+    assert jnp.allclose(sol_stream.dynamicsystem_s1.X2, sol.X2)
+    assert jnp.allclose(sol_stream.dynamicsystem_s1.ra, sol.ra)
+    sol_disk = solution.IntrinsicSolution(tmp_path)
+    sol_disk.load_container("DynamicSystem", label="_s1")
+    assert np.allclose(sol_disk.data.dynamicsystem_s1.ra, sol.ra)
+
+
+def test_restart_dynamic(tmp_path, monkeypatch):
+    sol = run_rafabeam().dynamicsystem_s1
+    with monkeypatch.context() as m:
+        kill_after(m, 200)
+        with pytest.raises(Preempted):
+            run_rafabeam(tmp_path, checkpoint_steps=100)
+    sol_restart = run_rafabeam(tmp_path, checkpoint_steps=100,
+                               restart_from=tmp_path).dynamicsystem_s1
+    assert jnp.allclose(sol_restart.q, sol.q)
+    assert jnp.allclose(sol_restart.ra, sol.ra)
+
+
+def test_restart_streaming(tmp_path, monkeypatch):
+    sol = run_rafabeam().dynamicsystem_s1
+    with monkeypatch.context() as m:
+        kill_after(m, 240)
+        with pytest.raises(Preempted):
+            run_rafabeam(tmp_path, segment_time=0.12, checkpoint_steps=120)
+    sol_restart = run_rafabeam(tmp_path, segment_time=0.12, checkpoint_steps=120,
+                               restart_from=tmp_path).dynamicsystem_s1
+    assert jnp.allclose(sol_restart.q, sol.q)
+    assert jnp.allclose(sol_restart.ra, sol.ra)
+
+
+def test_restart_streaming_new_path(tmp_path, monkeypatch):
+    sol = run_rafabeam().dynamicsystem_s1
+    with monkeypatch.context() as m:
+        kill_after(m, 240)
+        with pytest.raises(Preempted):
+            run_rafabeam(tmp_path / "run1", segment_time=0.12, checkpoint_steps=120)
+    sol_restart = run_rafabeam(tmp_path / "run2", segment_time=0.12,
+                               checkpoint_steps=120,
+                               restart_from=tmp_path / "run1").dynamicsystem_s1
+    assert jnp.allclose(sol_restart.q, sol.q)
+    assert jnp.allclose(sol_restart.ra, sol.ra)
+    # the interrupted run is left as it was
+    assert np.load(tmp_path / "run1" / "DynamicSystem_s1" / "q.npy").shape[0] == 241
+
+
+def test_copy_container(tmp_path):
+    stream = streaming.ContainerStream(tmp_path / "container")
+    x = np.arange(24.).reshape((4, 2, 3))
+    stream.append(x=x)
+    streaming.copy_container(tmp_path / "container", tmp_path / "copy", 3,
+                             chunk_rows=2)
+    assert np.array_equal(np.load(tmp_path / "copy" / "x.npy"), x[:3])
+    with pytest.raises(ValueError):
+        streaming.copy_container(tmp_path / "container", tmp_path / "copy", 5)
+    with pytest.raises(ValueError):
+        streaming.copy_container(tmp_path / "empty", tmp_path / "copy", 3)
+
+
+def test_restart_static(tmp_path, monkeypatch):
+    sol = run_sailplane()
+    with monkeypatch.context() as m:
+        kill_after(m, 1)
+        with pytest.raises(Preempted):
+            run_sailplane(tmp_path, checkpoint_steps=1)
+    sol_restart = run_sailplane(tmp_path, checkpoint_steps=1, restart_from=tmp_path)
+    assert jnp.allclose(sol_restart.q, sol.q)
+    assert jnp.allclose(sol_restart.ra, sol.ra)
+
+
+@pytest.mark.parametrize("method", ["modified", "broyden"])
+def test_restart_static_newton(tmp_path, monkeypatch, method):
+    sett = dict(solver_library="newton",
+                solver_function="static",
+                solver_settings=dict(method=method, rtol=1e-6, atol=1e-6))
+    sol = run_sailplane(tmp_path / "run0", checkpoint_steps=1, **sett)
+    with monkeypatch.context() as m:
+        kill_after(m, 1)
+        with pytest.raises(Preempted):
+            run_sailplane(tmp_path / "run1", checkpoint_steps=1, **sett)
+    sol_restart = run_sailplane(tmp_path / "run2", checkpoint_steps=1,
+                                restart_from=tmp_path / "run1", **sett)
+    # same Jacobian and counters carried through the restart
+    assert sol_restart.solver_stats == sol.solver_stats
+    assert jnp.allclose(sol_restart.q, sol.q, rtol=1e-12, atol=1e-12)